@@ -1,11 +1,39 @@
 """Keeks Elote: Backtesting betting strategies with Elo-based ratings."""
 
+import importlib
 import logging
+from typing import TYPE_CHECKING, Any, List
 
-from keeks_elote.backtest import Backtest
+if TYPE_CHECKING:
+    from keeks_elote.backtest import Backtest
+    from keeks_elote.branching import ArenaBranch, branch_arena
+    from keeks_elote.simulation import SeasonSimulator, SimulationResult
 
 # Set up logger for the keeks_elote library
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())  # Default handler, does nothing unless configured
 
-__all__ = ["Backtest"]
+# Public names and the submodules defining them. They are imported on first access, so
+# `import keeks_elote` (and every process that only needs one submodule) stays cheap.
+_EXPORTS = {
+    "ArenaBranch": "keeks_elote.branching",
+    "Backtest": "keeks_elote.backtest",
+    "branch_arena": "keeks_elote.branching",
+    "SeasonSimulator": "keeks_elote.simulation",
+    "SimulationResult": "keeks_elote.simulation",
+}
+
+__all__ = ["ArenaBranch", "Backtest", "branch_arena", "SeasonSimulator", "SimulationResult"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+import sys
+
+from keeks_elote.cli import main
+
+sys.exit(main())
@@ -1,55 +1,102 @@
 import copy
+import itertools
 import logging
 import math
 import numbers
-from typing import Any, Dict, List, Optional, Tuple
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from keeks.bankroll import BankRoll
-from keeks.binary_strategies.base import BaseStrategy
-
-from keeks_elote.data_handling import prepare_data
+from keeks_elote.branching import branch_arena
+from keeks_elote.data_handling import period_fingerprint, prepare_data
+from keeks_elote.data_quality import (
+    INVALID_ODDS,
+    MISSING_LABELS,
+    NON_WINNING_SCORES,
+    UNPARSEABLE_SCORES,
+    DataQualityReport,
+)
 from keeks_elote.model_evaluation import calculate_probabilities
+from keeks_elote.observers import Settlement
+from keeks_elote.projections import Projection, ProjectionSink, write_batched
 from keeks_elote.rating_arena import RatingArena
+from keeks_elote.records import Bet, CompiledPeriod, GameRecord, to_records
+
+if TYPE_CHECKING:
+    from keeks.bankroll import BankRoll
+    from keeks.binary_strategies.base import BaseStrategy
+
+    from keeks_elote.dataset import CompiledDataset
+    from keeks_elote.observers import BacktestObserver
+    from keeks_elote.odds_history import OddsHistory
+    from keeks_elote.stopping import StopRule
 
 logger = logging.getLogger(__name__)
 
 
+def _note_issue(quality: Optional[DataQualityReport], category: str, example: Any) -> bool:
+    """Counts a data issue in ``quality`` and says whether it should also be logged on its own."""
+    if quality is None:
+        return True
+    quality.record(category, example)
+    return quality.log_events
+
+
 # Helper to convert American odds to decimal odds
-def _matchup_tuple(game: Dict[str, Any]) -> Tuple[Any, ...]:
-    """Build the arena matchup tuple for a settled game.
+def matchup_tuple(game: GameRecord, quality: Optional[DataQualityReport] = None) -> Tuple[Any, ...]:
+    """Builds the arena matchup tuple for a settled game.
 
     Rating systems that model margin of victory (Massey, Keener, Pythagorean) need the
     scores, not just who won. elote's ``tournament`` unpacks each tuple into ``matchup``,
     whose signature is ``(a, b, attributes, match_time, outcome, scores)``, so a game
     carrying ``winner_score`` and ``loser_score`` is forwarded with them and every other
     game keeps the plain two-element form the win/loss systems expect.
+
+    Scores that cannot be used are counted in ``quality``; without a report each one
+    is logged.
     """
-    winner, loser = game.get("winner"), game.get("loser")
-    winner_score, loser_score = game.get("winner_score"), game.get("loser_score")
+    winner, loser = game.winner, game.loser
+    winner_score, loser_score = game.winner_score, game.loser_score
     if winner_score is None or loser_score is None:
         return (winner, loser)
     try:
         scores = (float(winner_score), float(loser_score))
     except (TypeError, ValueError):
-        logger.warning(
-            "Ignoring unparseable scores %r/%r for %s over %s.",
-            winner_score,
-            loser_score,
-            winner,
-            loser,
-        )
+        if _note_issue(quality, UNPARSEABLE_SCORES, game):
+            logger.warning(
+                "Ignoring unparseable scores %r/%r for %s over %s.",
+                winner_score,
+                loser_score,
+                winner,
+                loser,
+            )
         return (winner, loser)
     if not scores[0] > scores[1]:
         # The row says this competitor won but the scores do not agree. A placeholder like
         # "0-0" for a score nobody recorded is the common case, and feeding it through as a
         # real margin would tell a margin-aware system the game was a tie. Rate it on the
         # recorded result alone rather than dropping the game or failing the run.
-        logger.warning(
-            "Scores %s do not show %s beating %s; rating this game on its result alone.",
-            scores,
-            winner,
-            loser,
-        )
+        if _note_issue(quality, NON_WINNING_SCORES, game):
+            logger.warning(
+                "Scores %s do not show %s beating %s; rating this game on its result alone.",
+                scores,
+                winner,
+                loser,
+            )
         return (winner, loser)
 
     # Outcome is from the first competitor's perspective, and the first competitor is the
@@ -88,16 +135,34 @@ def american_to_decimal(american_odds: Any) -> float:
         return (100.0 / abs(odds)) + 1.0
 
 
-def _decimal_odds_for_side(american_odds: Any, label: Any) -> Optional[float]:
-    """Converts one side's odds, warning and returning ``None`` when they are invalid."""
+def _decimal_odds_for_side(
+    american_odds: Any, label: Any, quality: Optional[DataQualityReport] = None
+) -> Optional[float]:
+    """Converts one side's odds, noting the issue and returning ``None`` when they are invalid."""
     try:
         return american_to_decimal(american_odds)
     except (TypeError, ValueError) as exc:
-        logger.warning(f"Skipping wager on {label} due to invalid odds {american_odds!r}: {exc}")
+        if _note_issue(quality, INVALID_ODDS, (label, american_odds)):
+            logger.warning("Skipping wager on %s due to invalid odds %r: %s", label, american_odds, exc)
         return None
 
 
-def _strategy_for_bet(strategy: BaseStrategy, payoff: float, price_bets_at_true_odds: bool) -> BaseStrategy:
+def strategy_for_bet(strategy: "BaseStrategy", payoff: float, price_bets_at_true_odds: bool) -> "BaseStrategy":
+    """The strategy to size one bet with.
+
+    Pricing at true odds sizes each bet on its own payoff: the result is a copy of
+    ``strategy`` with ``payoff`` and a loss of 1. Otherwise ``strategy`` itself is
+    returned, sizing on its configured payoff and loss.
+
+    :param strategy: The configured keeks strategy.
+    :type strategy: BaseStrategy
+    :param payoff: The bet's net payoff per unit staked, its decimal odds minus 1.
+    :type payoff: float
+    :param price_bets_at_true_odds: Size the bet on ``payoff``.
+    :type price_bets_at_true_odds: bool
+    :return: The strategy to call ``evaluate`` on.
+    :rtype: BaseStrategy
+    """
     if not price_bets_at_true_odds:
         return strategy
 
@@ -107,6 +172,103 @@ def _strategy_for_bet(strategy: BaseStrategy, payoff: float, price_bets_at_true_
     return bet_strategy
 
 
+def _strategy_fingerprint(strategy: "BaseStrategy") -> Tuple[str, str]:
+    """Identifies a strategy by its type and configuration for checkpoint reuse."""
+    try:
+        config = repr(sorted(vars(strategy).items()))
+    except TypeError:
+        config = repr(strategy)
+    return (f"{type(strategy).__module__}.{type(strategy).__qualname__}", config)
+
+
+def _same_state(left: Any, right: Any) -> bool:
+    try:
+        return type(left) is type(right) and vars(left) == vars(right)
+    except TypeError:
+        return False
+
+
+def _restore_state(target: Any, snapshot: Any) -> Any:
+    """Puts a copy of ``snapshot`` into ``target`` in place, so callers' references stay valid.
+
+    Objects without an instance ``__dict__`` cannot be restored in place, so a fresh copy
+    is returned for the caller to use instead.
+    """
+    restored = copy.deepcopy(snapshot)
+    if type(target) is type(restored) and hasattr(target, "__dict__"):
+        vars(target).clear()
+        vars(target).update(vars(restored))
+        return target
+    return restored
+
+
+def _validated_stream(
+    periods: Iterable[Union[Tuple[int, List[Dict[str, Any]]], CompiledPeriod]],
+    quality: Optional[DataQualityReport] = None,
+) -> Iterator[CompiledPeriod]:
+    """Validates streamed periods one at a time and checks they arrive in order.
+
+    Compiled periods were validated when their dataset was built and pass through as they are.
+    """
+    previous: Optional[int] = None
+    for entry in periods:
+        week_no = entry.period if isinstance(entry, CompiledPeriod) else entry[0]
+        if previous is not None and not week_no > previous:
+            raise ValueError(f"Streamed periods must be strictly increasing: period {week_no} follows {previous}.")
+        previous = week_no
+        if isinstance(entry, CompiledPeriod):
+            yield entry
+        else:
+            yield CompiledPeriod(week_no, to_records(prepare_data({week_no: entry[1]}, quality=quality)[week_no]))
+
+
+class PeriodSummary(NamedTuple):
+    """Aggregate counters for one period of a betting backtest.
+
+    :ivar period: The period number.
+    :ivar games: Settled games fed to the arena.
+    :ivar bets_placed: Bets staked and settled in the period.
+    :ivar staked: Total amount staked.
+    :ivar returned: Total paid back on winning bets, stakes included.
+    :ivar bets_priced: Bets calculated for the next period.
+    :ivar bankroll: Total funds at the end of the period.
+    """
+
+    period: int
+    games: int
+    bets_placed: int
+    staked: float
+    returned: float
+    bets_priced: int
+    bankroll: float
+
+
+class _Checkpoint(NamedTuple):
+    """Everything a betting run carries from one period into the next."""
+
+    arena: Any
+    bankroll: "BankRoll"
+    pending_bets: List[Bet]
+
+
+class _CheckpointLog:
+    """Per-period state kept by :meth:`Backtest.run_incremental`.
+
+    ``checkpoints[i]`` is the state at the start of the ``i``-th period in sorted order,
+    and the log holds one more entry than there are periods: the state after the last.
+    ``reports[i]`` holds the data issues found while running the ``i``-th period, which
+    include those found pricing the period after it.
+    """
+
+    def __init__(self, settings: Tuple[Any, ...], initial_bankroll: "BankRoll"):
+        self.settings = settings
+        self.initial_bankroll = initial_bankroll
+        self.fingerprints: List[Tuple[int, str]] = []
+        self.checkpoints: List[_Checkpoint] = []
+        self.summaries: List[PeriodSummary] = []
+        self.reports: List[DataQualityReport] = []
+
+
 class Backtest:
     """Runs backtests for betting strategies using an elote Arena for ratings.
 
@@ -118,121 +280,235 @@ class Backtest:
     The strategy and bankroll are supplied separately when running a betting
     simulation.
 
+    Malformed games (missing labels, unusable scores, invalid odds) are counted in
+    :attr:`data_quality` during a run and reported in one warning when it finishes.
+
+    Betting runs record a :class:`PeriodSummary` per period in :attr:`period_summaries`.
+    With ``fast=True`` those summaries are the only instrumentation the inner loops
+    produce: no per-game or per-bet message is built even when debug logging is on,
+    and probabilities are read from the arena without going through
+    :func:`~keeks_elote.model_evaluation.calculate_probabilities`' debug logging.
+
+    With an ``odds_history``, each side of a game is priced and settled at the best line
+    any book offered as of ``decision_time(period)``, falling back to the game's own
+    ``winner_odds``/``loser_odds`` for a side the history has not quoted by then.
+
+    ``observers`` receive each period's events (see
+    :class:`~keeks_elote.observers.BacktestObserver`) as records rather than log lines.
+
     :param arena: An initialized elote Arena instance (e.g., GlickoArena).
     :type arena: RatingArena
+    :param log_data_issues: Also log a warning for every individual data issue.
+    :type log_data_issues: bool
+    :param fast: Skip all per-game and per-bet logging in the betting loops.
+    :type fast: bool
+    :param odds_history: Time-stamped lines from one or more books.
+    :type odds_history: Optional[OddsHistory]
+    :param decision_time: Maps the period being priced to the time its bets are placed.
+                          Without it, bets are placed at the best closing line.
+    :type decision_time: Optional[Callable[[int], Any]]
+    :param observers: Objects notified of each period's events.
+    :type observers: Sequence[BacktestObserver]
     """
 
-    def __init__(self, arena: RatingArena):
+    def __init__(
+        self,
+        arena: RatingArena,
+        log_data_issues: bool = False,
+        fast: bool = False,
+        odds_history: Optional["OddsHistory"] = None,
+        decision_time: Optional[Callable[[int], Any]] = None,
+        observers: Sequence["BacktestObserver"] = (),
+    ):
         """Initializes the Backtest environment.
 
         :param arena: An initialized elote Arena instance.
         :type arena: RatingArena
+        :param log_data_issues: Also log a warning for every individual data issue.
+        :type log_data_issues: bool
+        :param fast: Skip all per-game and per-bet logging in the betting loops.
+        :type fast: bool
+        :param odds_history: Time-stamped lines to price bets at.
+        :type odds_history: Optional[OddsHistory]
+        :param decision_time: Maps the period being priced to the time its bets are placed.
+        :type decision_time: Optional[Callable[[int], Any]]
+        :param observers: Objects notified of each period's events.
+        :type observers: Sequence[BacktestObserver]
         """
-        logger.info(f"Initializing Backtest with arena: {type(arena).__name__}")
+        logger.info("Initializing Backtest with arena: %s", type(arena).__name__)
         self._arena = arena
+        self.fast = fast
+        self.odds_history = odds_history
+        self.decision_time = decision_time
+        self.observers: List["BacktestObserver"] = list(observers)
+        self.data_quality = DataQualityReport(log_events=log_data_issues)
+        self.period_summaries: List[PeriodSummary] = []
+        self.stop_reason: Optional[str] = None
+        self._checkpoints: Optional[_CheckpointLog] = None
+        self.resumed_from: Optional[int] = None
+
+    def add_observer(self, observer: "BacktestObserver") -> None:
+        """Registers an observer for this backtest's events from the next period on."""
+        self.observers.append(observer)
+
+    def _notify(self, hook: str, *args: Any) -> None:
+        """Calls ``hook`` on every observer defining it. Callers check :attr:`observers` first."""
+        for observer in self.observers:
+            method = getattr(observer, hook, None)
+            if method is not None:
+                method(*args)
+
+    @property
+    def arena(self) -> RatingArena:
+        """The arena the backtest rates competitors with, e.g. for :func:`~keeks_elote.persistence.save_ratings`."""
+        return self._arena
 
     def _evaluate_bets_for_next_period(
         self,
-        strategy: BaseStrategy,
-        bankroll: BankRoll,
-        next_period_games: List[Dict[str, Any]],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
+        next_period_games: Sequence[GameRecord],
         price_bets_at_true_odds: bool,
-    ) -> List[Dict[str, Any]]:
-        """Evaluates potential bets for a given list of games."""
-        bets_calculated = []
-        logger.debug(f"Evaluating {len(next_period_games)} games for betting opportunities.")
-        for game in next_period_games:
-            if "winner_odds" in game and "loser_odds" in game:
-                winner_label = game.get("winner")
-                loser_label = game.get("loser")
-                winner_odds_american = game.get("winner_odds")
-                loser_odds_american = game.get("loser_odds")
-
-                if winner_label is None or loser_label is None:
-                    logger.warning(f"Skipping game due to missing labels: {game}")
-                    continue
+        period: Optional[int] = None,
+        decimal_odds: Optional[Any] = None,
+    ) -> List[Bet]:
+        """Evaluates potential bets for a given list of games.
 
-                logger.debug(f"Evaluating game: {winner_label} vs {loser_label}")
-                prob_winner_wins = calculate_probabilities(self._arena, game)
-                prob_loser_wins = 1.0 - prob_winner_wins
+        Per-game debug messages are only built when debug logging is on and the
+        backtest is not in fast mode; the check is made once per call, not per game.
+        ``period`` is the period the games are played in, used to look up their lines in
+        :attr:`odds_history`. ``decimal_odds`` are the games' precompiled odds (see
+        :class:`~keeks_elote.records.CompiledPeriod`), used unless the games are repriced.
+        """
+        bets_calculated: List[Bet] = []
+        debug = self._debug_enabled()
+        if debug:
+            logger.debug("Evaluating %d games for betting opportunities.", len(next_period_games))
+        current_bankroll = bankroll.total_funds
+        lines = self._line_lookup(period)
+        compiled_odds = decimal_odds.tolist() if decimal_odds is not None and lines is None else None
+        for index, game in enumerate(next_period_games):
+            if lines is not None:
+                game = lines(game)
+            if not self._can_price(game, debug):
+                continue
+            winner_odds, loser_odds = self._side_decimal_odds(
+                game, compiled_odds[index] if compiled_odds is not None else None
+            )
+            if winner_odds is None and loser_odds is None:
+                continue
+            winner_label, loser_label = game.winner, game.loser
+            prob_winner_wins = self._win_probability(game)
 
-                # Evaluate betting on the nominal winner
-                decimal_odds_winner = (
-                    _decimal_odds_for_side(winner_odds_american, winner_label)
-                    if winner_odds_american is not None
-                    else None
-                )
-                if decimal_odds_winner is not None:
-                    try:
-                        bet_strategy = _strategy_for_bet(
-                            strategy,
-                            decimal_odds_winner - 1.0,
-                            price_bets_at_true_odds,
-                        )
-                        bet_fraction_winner = bet_strategy.evaluate(
-                            probability=prob_winner_wins, current_bankroll=bankroll.total_funds
-                        )
-                        logger.debug(
-                            f"Strategy suggests betting fraction {bet_fraction_winner:.4f} on {winner_label} (P={prob_winner_wins:.4f}, Odds={decimal_odds_winner:.2f})"
-                        )
-                        if bet_fraction_winner > 0:
-                            bets_calculated.append(
-                                {
-                                    "label": winner_label,
-                                    "opponent": loser_label,
-                                    "fraction": bet_fraction_winner,
-                                    "payoff": decimal_odds_winner - 1.0,
-                                    "loss": 1.0,
-                                    "actual_outcome": True,
-                                }
-                            )
-                    except Exception as e:
-                        logger.error(f"Error evaluating bet on {winner_label}: {e}")
-
-                # Evaluate betting on the nominal loser
-                decimal_odds_loser = (
-                    _decimal_odds_for_side(loser_odds_american, loser_label)
-                    if loser_odds_american is not None
-                    else None
+            # Evaluate betting on the nominal winner, then on the nominal loser
+            for label, opponent, side_odds, probability, actual_outcome in (
+                (winner_label, loser_label, winner_odds, prob_winner_wins, True),
+                (loser_label, winner_label, loser_odds, 1.0 - prob_winner_wins, False),
+            ):
+                if side_odds is None:
+                    continue
+                fraction = self._quote_fraction(
+                    strategy, label, probability, side_odds, current_bankroll, price_bets_at_true_odds, debug
                 )
-                if decimal_odds_loser is not None:
-                    try:
-                        bet_strategy = _strategy_for_bet(
-                            strategy,
-                            decimal_odds_loser - 1.0,
-                            price_bets_at_true_odds,
-                        )
-                        bet_fraction_loser = bet_strategy.evaluate(
-                            probability=prob_loser_wins, current_bankroll=bankroll.total_funds
-                        )
-                        logger.debug(
-                            f"Strategy suggests betting fraction {bet_fraction_loser:.4f} on {loser_label} (P={prob_loser_wins:.4f}, Odds={decimal_odds_loser:.2f})"
-                        )
-                        if bet_fraction_loser > 0:
-                            bets_calculated.append(
-                                {
-                                    "label": loser_label,
-                                    "opponent": winner_label,
-                                    "fraction": bet_fraction_loser,
-                                    "payoff": decimal_odds_loser - 1.0,
-                                    "loss": 1.0,
-                                    "actual_outcome": False,
-                                }
-                            )
-                    except Exception as e:
-                        logger.error(f"Error evaluating bet on {loser_label}: {e}")
-            else:
+                if fraction > 0:
+                    bets_calculated.append(
+                        Bet(label, opponent, fraction, side_odds - 1.0, 1.0, actual_outcome, probability)
+                    )
+        if self.observers and period is not None:
+            self._notify("on_bets_evaluated", period, bets_calculated)
+        return bets_calculated
+
+    def _win_probability(self, game: GameRecord) -> float:
+        """The arena's probability that the game's nominal winner wins it."""
+        if self.fast:
+            # Ask the arena directly, skipping calculate_probabilities' own logging.
+            return self._arena.expected_score(game.winner, game.loser)
+        return calculate_probabilities(self._arena, game)
+
+    def _side_decimal_odds(
+        self, game: GameRecord, compiled: Optional[Sequence[float]]
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Both sides' decimal odds, taken from ``compiled`` where valid and converted otherwise.
+
+        Conversion notes invalid odds in :attr:`data_quality` and gives ``None`` for them.
+        """
+        known = compiled if compiled is not None else (math.nan, math.nan)
+        winner_odds = known[0] if not math.isnan(known[0]) else None
+        loser_odds = known[1] if not math.isnan(known[1]) else None
+        if winner_odds is None:
+            winner_odds = _decimal_odds_for_side(game.winner_odds, game.winner, self.data_quality)
+        if loser_odds is None:
+            loser_odds = _decimal_odds_for_side(game.loser_odds, game.loser, self.data_quality)
+        return winner_odds, loser_odds
+
+    def _line_lookup(self, period: Optional[int]) -> Optional[Callable[[GameRecord], GameRecord]]:
+        """A function repricing a game at its as-of lines, or ``None`` without an odds history."""
+        history = self.odds_history
+        if history is None or period is None:
+            return None
+        as_of = self.decision_time(period) if self.decision_time is not None else None
+
+        def reprice(game: GameRecord) -> GameRecord:
+            winner_line = history.best_line(period, game.winner, game.loser, as_of)
+            loser_line = history.best_line(period, game.loser, game.winner, as_of)
+            if winner_line is None and loser_line is None:
+                return game
+            return game._replace(
+                winner_odds=game.winner_odds if winner_line is None else winner_line.odds,
+                loser_odds=game.loser_odds if loser_line is None else loser_line.odds,
+            )
+
+        return reprice
+
+    def _can_price(self, game: GameRecord, debug: bool) -> bool:
+        """Whether a game has the odds and labels needed to price it."""
+        if not game.has_odds:
+            if debug:
                 logger.debug(
-                    f"Skipping game {game.get('winner')} vs {game.get('loser')} for opportunities (missing odds or labels)."
+                    "Skipping game %s vs %s for opportunities (missing odds or labels).", game.winner, game.loser
                 )
-        return bets_calculated
+            return False
+        if game.winner is None or game.loser is None:
+            if _note_issue(self.data_quality, MISSING_LABELS, game):
+                logger.warning("Skipping game due to missing labels: %s", game)
+            return False
+        if debug:
+            logger.debug("Evaluating game: %s vs %s", game.winner, game.loser)
+        return True
+
+    @staticmethod
+    def _quote_fraction(
+        strategy: "BaseStrategy",
+        label: Any,
+        probability: float,
+        decimal_odds: float,
+        current_bankroll: float,
+        price_bets_at_true_odds: bool,
+        debug: bool,
+    ) -> float:
+        """Asks the strategy what fraction to stake on one side, or 0.0 if it fails."""
+        try:
+            bet_strategy = strategy_for_bet(strategy, decimal_odds - 1.0, price_bets_at_true_odds)
+            fraction = bet_strategy.evaluate(probability=probability, current_bankroll=current_bankroll)
+        except Exception as e:
+            logger.error("Error evaluating bet on %s: %s", label, e)
+            return 0.0
+        if debug:
+            logger.debug(
+                "Strategy suggests betting fraction %.4f on %s (P=%.4f, Odds=%.2f)",
+                fraction,
+                label,
+                probability,
+                decimal_odds,
+            )
+        return fraction
 
     def _execute_bets_for_current_period(
         self,
-        bankroll: BankRoll,
-        bets_to_execute: List[Dict[str, Any]],
+        bankroll: "BankRoll",
+        bets_to_execute: List[Bet],
         period_number: int,
-    ) -> None:
+    ) -> Tuple[int, float, float]:
         """Executes a list of bets against the provided bankroll.
 
         Every bet is sized as ``opening_funds * fraction``, the same base the
@@ -248,60 +524,101 @@ class Backtest:
         strategy asked for while keeping the total within the cap. Clamping each
         bet against the live funds instead would let the earliest games in a
         period consume the whole bankroll and starve the rest.
+
+        :return: The number of bets staked, the total staked and the total paid back.
+        :rtype: Tuple[int, float, float]
         """
-        logger.info(f"Period {period_number}: Executing {len(bets_to_execute)} bets calculated previously.")
+        logger.info("Period %s: Executing %d bets calculated previously.", period_number, len(bets_to_execute))
+        debug = self._debug_enabled()
         opening_funds = bankroll.total_funds
         exposure_budget = bankroll.bettable_funds
-        requested = sum(opening_funds * bet["fraction"] for bet in bets_to_execute if bet["fraction"] > 0)
+        requested = sum(opening_funds * bet.fraction for bet in bets_to_execute if bet.fraction > 0)
 
         exposure_scale = 1.0
         if requested > exposure_budget and requested > 0:
             exposure_scale = exposure_budget / requested
             logger.warning(
-                f"Period {period_number}: {len(bets_to_execute)} bets request {requested:.2f} "
-                f"({requested / opening_funds:.1%} of the bankroll) against a bettable budget of "
-                f"{exposure_budget:.2f}; scaling every stake by {exposure_scale:.4f}."
+                "Period %s: %d bets request %.2f (%.1f%% of the bankroll) against a bettable budget of %.2f; "
+                "scaling every stake by %.4f.",
+                period_number,
+                len(bets_to_execute),
+                requested,
+                100.0 * requested / opening_funds,
+                exposure_budget,
+                exposure_scale,
             )
 
+        settlements: Optional[List[Settlement]] = [] if self.observers else None
+        placed, staked, returned = 0, 0.0, 0.0
         for bet in bets_to_execute:
             try:
-                bet_amount = opening_funds * bet["fraction"] * exposure_scale
-
-                if bet_amount > 0:
-                    bettable_funds = bankroll.bettable_funds
-                    if bet_amount > bettable_funds:
-                        logger.warning(
-                            f"Bet of {bet_amount:.2f} on {bet['label']} exceeds bettable funds "
-                            f"({bettable_funds:.2f}); staking the capped amount instead."
-                        )
-                        bet_amount = bettable_funds
-
-                if bet_amount > 0:
-                    logger.debug(f"Betting {bet_amount:.2f} on {bet['label']} to win (Fraction: {bet['fraction']:.4f})")
-                    bankroll.bet(bet_amount)
-                    if bet["actual_outcome"]:
-                        # Win: return bet amount plus winnings
-                        bankroll.add_funds(bet_amount + bet_amount * bet["payoff"])
-                        logger.debug(f"Bet WON. Bankroll: {bankroll.total_funds:.2f}")
-                    else:
-                        # Loss: bet amount already deducted by bet()
-                        logger.debug(f"Bet LOST. Bankroll: {bankroll.total_funds:.2f}")
-                else:
-                    logger.debug(
-                        f"Bet fraction {bet['fraction']:.4f} resulted in zero or invalid bet amount ({bet_amount:.2f}) for {bet['label']}."
-                    )
+                bet_amount = self._settle_bet(bankroll, bet, opening_funds * bet.fraction * exposure_scale, debug)
             except Exception as e:
-                logger.error(f"Error processing bet for {bet['label']}: {e}. Bankroll: {bankroll.total_funds}")
-        logger.info(f"End of period {period_number} betting. Bankroll: {bankroll.total_funds:.2f}")
+                logger.error("Error processing bet for %s: %s. Bankroll: %s", bet.label, e, bankroll.total_funds)
+                continue
+            if bet_amount > 0:
+                paid = bet_amount + bet_amount * bet.payoff if bet.actual_outcome else 0.0
+                placed += 1
+                staked += bet_amount
+                returned += paid
+                if settlements is not None:
+                    settlements.append(Settlement(bet, bet_amount, paid))
+        logger.info("End of period %s betting. Bankroll: %.2f", period_number, bankroll.total_funds)
+        if settlements is not None:
+            self._notify("on_bets_settled", period_number, settlements, bankroll.total_funds)
+        return placed, staked, returned
+
+    @staticmethod
+    def _settle_bet(bankroll: "BankRoll", bet: Bet, bet_amount: float, debug: bool) -> float:
+        """Stakes one bet (capped at the live bettable funds) and settles it, returning the stake."""
+        if bet_amount > 0:
+            bettable_funds = bankroll.bettable_funds
+            if bet_amount > bettable_funds:
+                logger.warning(
+                    "Bet of %.2f on %s exceeds bettable funds (%.2f); staking the capped amount instead.",
+                    bet_amount,
+                    bet.label,
+                    bettable_funds,
+                )
+                bet_amount = bettable_funds
+
+        if bet_amount <= 0:
+            if debug:
+                logger.debug(
+                    "Bet fraction %.4f resulted in zero or invalid bet amount (%.2f) for %s.",
+                    bet.fraction,
+                    bet_amount,
+                    bet.label,
+                )
+            return 0.0
+
+        if debug:
+            logger.debug("Betting %.2f on %s to win (Fraction: %.4f)", bet_amount, bet.label, bet.fraction)
+        bankroll.bet(bet_amount)
+        if bet.actual_outcome:
+            # Win: return bet amount plus winnings
+            bankroll.add_funds(bet_amount + bet_amount * bet.payoff)
+            if debug:
+                logger.debug("Bet WON. Bankroll: %.2f", bankroll.total_funds)
+        elif debug:
+            # Loss: bet amount already deducted by bet()
+            logger.debug("Bet LOST. Bankroll: %.2f", bankroll.total_funds)
+        return bet_amount
+
+    def _debug_enabled(self) -> bool:
+        """Whether per-game debug messages should be built at all."""
+        return not self.fast and logger.isEnabledFor(logging.DEBUG)
 
     def run_explicit(
         self,
-        data: Dict[int, List[Dict[str, Any]]],
-        strategy: BaseStrategy,
-        bankroll: BankRoll,
+        data: Union[Dict[int, List[Dict[str, Any]]], "CompiledDataset"],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
         period_to_start_betting: int = 3,
         price_bets_at_true_odds: bool = True,
-    ) -> BankRoll:
+        price_first_period: bool = False,
+        stop_rules: Sequence["StopRule"] = (),
+    ) -> "BankRoll":
         """Runs a backtest simulation, processing data period by period.
 
         Calls the strategy's `evaluate` method with `probability` and
@@ -310,81 +627,454 @@ class Backtest:
 
         Data format requires `winner_odds` and `loser_odds` to be American odds.
 
-        :param data: Historical game data keyed by period.
-        :type data: Dict[int, List[Dict[str, Any]]]
+        :param data: Historical game data keyed by period, or a
+                     :class:`~keeks_elote.dataset.CompiledDataset` of it, which skips
+                     validating and converting the games again.
+        :type data: Union[Dict[int, List[Dict[str, Any]]], CompiledDataset]
         :param strategy: An initialized betting strategy instance.
         :type strategy: BaseStrategy
         :param bankroll: An initialized keeks.bankroll.BankRoll instance.
         :type bankroll: BankRoll
         :param period_to_start_betting: The period *after* which the strategy should start issuing
-                                          real bets (periods before this are dry runs).
-                                          Defaults to 3.
+                                          real bets (periods before this are dry runs,
+                                          which only update ratings). Defaults to 3.
         :type period_to_start_betting: int
         :param price_bets_at_true_odds: Size each bet using its game-specific payoff.
                                        If false, use the strategy's configured payoff
                                        for sizing. Settlement always uses the game's
                                        actual odds. Defaults to true.
         :type price_bets_at_true_odds: bool
+        :param price_first_period: Price the first period's games from the arena's starting
+                                   ratings, so they can be bet with ``period_to_start_betting=0``.
+                                   Meant for an arena warm-started from prior ratings (see
+                                   :func:`~keeks_elote.persistence.warm_start`). Defaults to false.
+        :type price_first_period: bool
+        :param stop_rules: Checked after every period, in order; the first to give a reason
+                           ends betting there, discarding bets priced for the next period.
+                           The remaining periods still update the arena's ratings, but
+                           settle and price nothing and add no :attr:`period_summaries`.
+                           The reason is kept in :attr:`stop_reason`. See
+                           :mod:`keeks_elote.stopping`.
+        :type stop_rules: Sequence[StopRule]
         :return: The BankRoll object, updated with results from the backtest.
         :rtype: BankRoll
         """
         logger.info("Starting explicit backtest run.")
-        logger.debug(f"Using strategy: {type(strategy).__name__} with bankroll: {bankroll.total_funds}")
-        logger.debug(f"Period to start betting: {period_to_start_betting}")
+        logger.debug("Using strategy: %s with bankroll: %s", type(strategy).__name__, bankroll.total_funds)
+        logger.debug("Period to start betting: %s", period_to_start_betting)
 
-        data = prepare_data(data)
-        logger.debug(f"Prepared data keys (periods): {list(data.keys())}")
-        period_keys = sorted(data)
+        self.data_quality.reset()
+        self.period_summaries = []
+        self.stop_reason = None
 
-        bets_calculated_prev_period: List[Dict[str, Any]] = []  # Store bets for execution in the *next* period
+        self._run_periods(
+            self._compiled_periods(data),
+            strategy,
+            bankroll,
+            period_to_start_betting,
+            price_bets_at_true_odds,
+            price_first_period,
+            stop_rules,
+        )
 
-        for period_index, week_no in enumerate(period_keys):
-            games = data[week_no]
-            logger.info(f"Processing period {week_no} with {len(games)} games.")
+        self.data_quality.log_summary(logger, "backtest run")
+        if self.observers:
+            self._notify("on_run_end", self.period_summaries, self.stop_reason)
+        logger.info("Explicit backtest run finished.")
+        return bankroll  # Return the updated bankroll object
 
-            current_period_bets_to_execute = bets_calculated_prev_period
+    def run_streaming(
+        self,
+        periods: Iterable[Union[Tuple[int, List[Dict[str, Any]]], CompiledPeriod]],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
+        period_to_start_betting: int = 3,
+        price_bets_at_true_odds: bool = True,
+        price_first_period: bool = False,
+        stop_rules: Sequence["StopRule"] = (),
+    ) -> "BankRoll":
+        """Runs :meth:`run_explicit` over a stream of periods without holding them all.
 
-            # --- Execute bets for the *current* period (calculated in the previous iteration) ---
-            is_betting_period = week_no > period_to_start_betting
-            if is_betting_period:
-                self._execute_bets_for_current_period(bankroll, current_period_bets_to_execute, week_no)
+        ``periods`` yields ``(period, games)`` pairs in increasing period order, such as
+        :func:`~keeks_elote.loaders.stream_periods` produces from an NDJSON or CSV file.
+        Only the current period and the one after it (whose games are being priced) are
+        held at any time. Each period is validated with
+        :func:`~keeks_elote.data_handling.prepare_data` as it arrives.
 
-            # --- Update Arena Ratings with *current* period results ---
-            matchups = [_matchup_tuple(x) for x in games]
-            if matchups:
-                logger.info(f"Updating arena ratings with {len(matchups)} matchups from period {week_no}.")
-                self._arena.tournament(matchups)
-                logger.debug(f"Arena update complete for period {week_no}.")
-            else:
-                logger.info(f"No matchups to update ratings for period {week_no}.")
+        A :class:`~keeks_elote.dataset.CompiledDataset`, or any iterable of its
+        :class:`~keeks_elote.records.CompiledPeriod` entries, streams as well. Those periods
+        are not validated again, and a dataset's compile-time issues are added to
+        :attr:`data_quality`.
+
+        :param periods: ``(period, games)`` pairs or compiled periods, in increasing period order.
+        :type periods: Iterable[Union[Tuple[int, List[Dict[str, Any]]], CompiledPeriod]]
+        :param strategy: An initialized betting strategy instance.
+        :type strategy: BaseStrategy
+        :param bankroll: An initialized keeks.bankroll.BankRoll instance.
+        :type bankroll: BankRoll
+        :param period_to_start_betting: As for :meth:`run_explicit`.
+        :type period_to_start_betting: int
+        :param price_bets_at_true_odds: As for :meth:`run_explicit`.
+        :type price_bets_at_true_odds: bool
+        :param price_first_period: As for :meth:`run_explicit`.
+        :type price_first_period: bool
+        :param stop_rules: As for :meth:`run_explicit`.
+        :type stop_rules: Sequence[StopRule]
+        :return: The BankRoll object, updated with results from the backtest.
+        :rtype: BankRoll
+        :raises ValueError: If the periods are not strictly increasing.
+        """
+        from keeks_elote.dataset import CompiledDataset
+
+        logger.info("Starting streaming backtest run.")
+        self.data_quality.reset()
+        if isinstance(periods, CompiledDataset):
+            self.data_quality.merge(periods.data_quality)
+        self.period_summaries = []
+        self.stop_reason = None
+        self._run_periods(
+            _validated_stream(periods, self.data_quality),
+            strategy,
+            bankroll,
+            period_to_start_betting,
+            price_bets_at_true_odds,
+            price_first_period,
+            stop_rules,
+        )
+        self.data_quality.log_summary(logger, "streaming backtest run")
+        if self.observers:
+            self._notify("on_run_end", self.period_summaries, self.stop_reason)
+        logger.info("Streaming backtest run finished.")
+        return bankroll
+
+    def _compiled_periods(
+        self, data: Union[Dict[int, List[Dict[str, Any]]], "CompiledDataset"]
+    ) -> Iterator[CompiledPeriod]:
+        """The run's periods in order, adding a compiled dataset's issues to :attr:`data_quality`.
+
+        Game dicts are validated here, and each period's records are built as the run reaches it.
+        """
+        from keeks_elote.dataset import CompiledDataset
 
-            # --- Evaluate potential bets for the *next* period ---
-            next_period_key = period_keys[period_index + 1] if period_index + 1 < len(period_keys) else None
-            next_period_games = data[next_period_key] if next_period_key is not None else []
-            bets_calculated_this_period = self._evaluate_bets_for_next_period(
+        if isinstance(data, CompiledDataset):
+            self.data_quality.merge(data.data_quality)
+            return iter(data)
+        data = prepare_data(data, quality=self.data_quality)
+        logger.debug("Prepared data keys (periods): %s", list(data.keys()))
+        return (CompiledPeriod(week_no, to_records(data[week_no])) for week_no in sorted(data))
+
+    def _run_periods(
+        self,
+        periods: Iterator[CompiledPeriod],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
+        period_to_start_betting: int,
+        price_bets_at_true_odds: bool,
+        price_first_period: bool = False,
+        stop_rules: Sequence["StopRule"] = (),
+    ) -> None:
+        """Runs ordered periods through :meth:`_run_period`, looking one period ahead."""
+        bets_calculated_prev_period: List[Bet] = []  # Store bets for execution in the *next* period
+
+        current = next(periods, None)
+        if price_first_period and current is not None and current.period > period_to_start_betting:
+            # Nothing has been played yet, so the first period is priced from the arena's starting ratings.
+            bets_calculated_prev_period = self._evaluate_bets_for_next_period(
+                strategy, bankroll, current.games, price_bets_at_true_odds, current.period, current.decimal_odds
+            )
+        while current is not None:
+            following = next(periods, None)
+            bets_calculated_prev_period, summary = self._run_period(
+                current,
+                following,
+                bets_calculated_prev_period,
                 strategy,
                 bankroll,
-                next_period_games,
+                period_to_start_betting,
                 price_bets_at_true_odds,
             )
+            self.period_summaries.append(summary)
+            if stop_rules and self._should_stop(stop_rules, bankroll):
+                if following is not None:
+                    self._rate_remaining(itertools.chain((following,), periods))
+                break
+            current = following
 
-            if not is_betting_period:
-                logger.info(
-                    f"Period {week_no}: Dry run week. Calculated {len(bets_calculated_this_period)} potential bets for next period."
+    def _rate_remaining(self, periods: Iterable[CompiledPeriod]) -> None:
+        """Rates the periods after a stop, so the arena ends where a full run's would; nothing is settled or priced."""
+        for entry in periods:
+            self._start_period(entry)
+            self._update_ratings(entry.period, entry.games, matchups=entry.matchups)
+
+    def _should_stop(self, stop_rules: Sequence["StopRule"], bankroll: "BankRoll") -> bool:
+        """Records the first stop rule's reason in :attr:`stop_reason` and reports whether one fired."""
+        for rule in stop_rules:
+            reason = rule(self.period_summaries, bankroll)
+            if reason is not None:
+                self.stop_reason = reason
+                logger.info("Stopping after period %s: %s.", self.period_summaries[-1].period, reason)
+                return True
+        return False
+
+    def run_incremental(
+        self,
+        data: Union[Dict[int, List[Dict[str, Any]]], "CompiledDataset"],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
+        period_to_start_betting: int = 3,
+        price_bets_at_true_odds: bool = True,
+    ) -> "BankRoll":
+        """Runs :meth:`run_explicit`, resuming from the last run where the data still agrees.
+
+        Every period's content is fingerprinted and the arena, bankroll and pending bets
+        are checkpointed at the start of every period. On the next call, the first period
+        whose fingerprint changed is found and the run resumes from the checkpoint of the
+        period before it, because that is where the changed period's games were priced.
+        Appended periods resume the same way from the old last period, and unchanged data
+        restores the final checkpoint without re-running anything. The result is
+        identical to a full rerun.
+
+        The first call checkpoints the arena and ``bankroll`` as they stand, and later
+        calls are expected to pass a bankroll in that same starting state (a fresh one
+        built the same way, for instance). A different starting bankroll, strategy
+        configuration, ``period_to_start_betting`` or ``price_bets_at_true_odds`` starts
+        the log over with a full run from the arena's ratings before the first call. Restored state is written back into the arena and
+        bankroll objects in place, so references to them stay valid.
+
+        Checkpoints are deep copies, one per period, so this trades memory for rerun
+        time. Each period's data issues are kept with its checkpoint, so
+        :attr:`data_quality` and :attr:`period_summaries` cover every period, reused or
+        re-run. The period a run resumed from is recorded in :attr:`resumed_from` (``None``
+        when nothing had to be re-run). Call :meth:`reset_checkpoints` to drop the log,
+        and after changing :attr:`odds_history`, whose lines are not fingerprinted.
+
+        :param data: Historical game data keyed by period, or a compiled dataset of it.
+        :type data: Union[Dict[int, List[Dict[str, Any]]], CompiledDataset]
+        :param strategy: An initialized betting strategy instance.
+        :type strategy: BaseStrategy
+        :param bankroll: The starting bankroll, updated in place.
+        :type bankroll: BankRoll
+        :param period_to_start_betting: As for :meth:`run_explicit`.
+        :type period_to_start_betting: int
+        :param price_bets_at_true_odds: As for :meth:`run_explicit`.
+        :type price_bets_at_true_odds: bool
+        :return: The BankRoll object, updated with results from the backtest.
+        :rtype: BankRoll
+        """
+        self.data_quality.reset()
+        fingerprints, period_entry = self._fingerprinted_periods(data)
+        period_keys = [key for key, _ in fingerprints]
+        settings = (period_to_start_betting, price_bets_at_true_odds, _strategy_fingerprint(strategy))
+
+        log = self._checkpoints
+        if log is None or log.settings != settings or not _same_state(log.initial_bankroll, bankroll):
+            if log is not None:
+                # The arena holds the old run's final ratings; start over from its initial ones.
+                self._arena = _restore_state(self._arena, log.checkpoints[0].arena)
+            log = _CheckpointLog(settings, copy.deepcopy(bankroll))
+            log.checkpoints.append(_Checkpoint(copy.deepcopy(self._arena), copy.deepcopy(bankroll), []))
+            self._checkpoints = log
+            resume = 0
+        else:
+            agreeing = 0
+            for old, new in zip(log.fingerprints, fingerprints):
+                if old != new:
+                    break
+                agreeing += 1
+            if agreeing == len(log.fingerprints) == len(fingerprints):
+                resume = agreeing
+            else:
+                # The changed period was priced while running the one before it.
+                resume = max(agreeing - 1, 0)
+
+        checkpoint = log.checkpoints[resume]
+        self._arena = _restore_state(self._arena, checkpoint.arena)
+        _restore_state(bankroll, checkpoint.bankroll)
+        bets_calculated_prev_period = list(checkpoint.pending_bets)
+        del log.checkpoints[resume + 1 :]
+        del log.summaries[resume:]
+        del log.reports[resume:]
+        for report in log.reports:
+            self.data_quality.merge(report)
+        log.fingerprints = fingerprints
+        self.resumed_from = period_keys[resume] if resume < len(period_keys) else None
+        logger.info(
+            "Incremental run resuming at period %s of %d (%d periods reused).",
+            self.resumed_from,
+            len(period_keys),
+            resume,
+        )
+
+        def period_at(index: int) -> Optional[CompiledPeriod]:
+            return period_entry(index) if index < len(period_keys) else None
+
+        run_quality = self.data_quality
+        period_quality = DataQualityReport(run_quality.max_examples, run_quality.log_events)
+        current = period_at(resume)
+        period_index = resume
+        while current is not None:
+            period_index += 1
+            self.data_quality = period_quality
+            try:
+                following = period_at(period_index)
+                bets_calculated_prev_period, summary = self._run_period(
+                    current,
+                    following,
+                    bets_calculated_prev_period,
+                    strategy,
+                    bankroll,
+                    period_to_start_betting,
+                    price_bets_at_true_odds,
                 )
+            finally:
+                self.data_quality = run_quality
+            run_quality.merge(period_quality)
+            log.reports.append(period_quality)
+            period_quality = DataQualityReport(run_quality.max_examples, run_quality.log_events)
+            log.summaries.append(summary)
+            log.checkpoints.append(
+                _Checkpoint(copy.deepcopy(self._arena), copy.deepcopy(bankroll), list(bets_calculated_prev_period))
+            )
+            current = following
 
-            # Store calculated bets for the next iteration
-            bets_calculated_prev_period = bets_calculated_this_period
+        self.period_summaries = list(log.summaries)
+        self.data_quality.log_summary(logger, "incremental backtest run")
+        if self.observers:
+            self._notify("on_run_end", self.period_summaries, None)
+        logger.info("Incremental backtest run finished.")
+        return bankroll
 
-        logger.info("Explicit backtest run finished.")
-        return bankroll  # Return the updated bankroll object
+    def _fingerprinted_periods(
+        self, data: Union[Dict[int, List[Dict[str, Any]]], "CompiledDataset"]
+    ) -> Tuple[List[Tuple[int, str]], Callable[[int], CompiledPeriod]]:
+        """Each period's key and fingerprint in order, and a function building the period at a position.
 
-    def run_and_project(self, data: Dict[int, List[Dict[str, Any]]]):
-        """Runs a simulation focused on generating and logging future projections.
+        Game dicts are validated here, but a period's records are only built if the run reaches it.
+        """
+        from keeks_elote.dataset import CompiledDataset
+
+        if isinstance(data, CompiledDataset):
+            self.data_quality.merge(data.data_quality)
+            entries = tuple(data)
+            fingerprints = [
+                (entry.period, period_fingerprint([game.to_dict() for game in entry.games])) for entry in entries
+            ]
+            return fingerprints, lambda index: entries[index]
+        prepared = prepare_data(data, quality=self.data_quality)
+        keys = sorted(prepared)
+
+        def period_entry(index: int) -> CompiledPeriod:
+            return CompiledPeriod(keys[index], to_records(prepared[keys[index]]))
+
+        return [(key, period_fingerprint(prepared[key])) for key in keys], period_entry
+
+    def reset_checkpoints(self) -> None:
+        """Drops the checkpoints kept by :meth:`run_incremental`."""
+        self._checkpoints = None
+        self.resumed_from = None
+
+    def _run_period(
+        self,
+        current: CompiledPeriod,
+        following: Optional[CompiledPeriod],
+        current_period_bets_to_execute: List[Bet],
+        strategy: "BaseStrategy",
+        bankroll: "BankRoll",
+        period_to_start_betting: int,
+        price_bets_at_true_odds: bool,
+    ) -> Tuple[List[Bet], PeriodSummary]:
+        """Runs one period of a betting backtest and returns the bets for the next one.
+
+        The period's previously calculated bets are settled first, then its results
+        update the arena, and finally the ``following`` period's games are priced from
+        the updated ratings.
+        """
+        week_no, games = current.period, current.games
+        self._start_period(current)
+
+        # --- Execute bets for the *current* period (calculated in the previous iteration) ---
+        placed, staked, returned = 0, 0.0, 0.0
+        is_betting_period = week_no > period_to_start_betting
+        if is_betting_period:
+            placed, staked, returned = self._execute_bets_for_current_period(
+                bankroll, current_period_bets_to_execute, week_no
+            )
+
+        # --- Update Arena Ratings with *current* period results ---
+        self._update_ratings(week_no, games, matchups=current.matchups)
+
+        # --- Evaluate potential bets for the *next* period ---
+        # Bets priced for a dry-run period would never be executed, so warm-up periods
+        # only update ratings.
+        bets_calculated_this_period = (
+            self._evaluate_bets_for_next_period(
+                strategy,
+                bankroll,
+                following.games,
+                price_bets_at_true_odds,
+                following.period,
+                following.decimal_odds,
+            )
+            if following is not None and following.period > period_to_start_betting
+            else []
+        )
+
+        if not is_betting_period:
+            logger.info(
+                "Period %s: Dry run week. Calculated %d potential bets for next period.",
+                week_no,
+                len(bets_calculated_this_period),
+            )
+
+        summary = PeriodSummary(
+            week_no, len(games), placed, staked, returned, len(bets_calculated_this_period), bankroll.total_funds
+        )
+        # Store calculated bets for the next iteration
+        return bets_calculated_this_period, summary
+
+    def _start_period(self, entry: CompiledPeriod) -> None:
+        logger.info("Processing period %s with %d games.", entry.period, len(entry.games))
+        if self.observers:
+            self._notify("on_period_start", entry.period, entry.games)
+
+    def _update_ratings(
+        self,
+        week_no: int,
+        games: Sequence[GameRecord],
+        arena: Optional[RatingArena] = None,
+        matchups: Optional[Sequence[Tuple[Any, ...]]] = None,
+    ) -> None:
+        """Feeds a period's settled results to the arena (or to ``arena``, such as a branch of it).
+
+        ``matchups`` are the games' precompiled matchup tuples; without them they are built here.
+        """
+        if matchups is None:
+            matchups = [matchup_tuple(x, self.data_quality) for x in games]
+        else:
+            matchups = list(matchups)
+        target = self._arena if arena is None else arena
+        # Only update ratings if there were games in the period
+        if matchups:
+            logger.info("Updating arena ratings with %d matchups from period %s.", len(matchups), week_no)
+            target.tournament(matchups)
+            logger.debug("Arena update complete for period %s.", week_no)
+        else:
+            logger.info("No matchups to update ratings for period %s.", week_no)
+        if self.observers:
+            self._notify("on_ratings_updated", week_no, target, matchups)
+
+    def run_and_project(
+        self,
+        data: Union[Dict[int, List[Dict[str, Any]]], "CompiledDataset"],
+        sink: Optional[ProjectionSink] = None,
+        batch_size: Optional[int] = 1000,
+        evaluate_in_thread: bool = False,
+    ) -> Optional[ProjectionSink]:
+        """Runs a simulation focused on generating future projections.
 
         This method iterates through historical periods, updating the arena ratings
         based on game outcomes. For each period, it then uses the updated ratings
-        to calculate and log win probabilities for the games scheduled in the *next*
+        to calculate win probabilities for the games scheduled in the *next*
         period.
 
         No betting simulation is performed.
@@ -392,45 +1082,111 @@ class Backtest:
         The expected data schema is the same as for ``run_explicit``, although odds
         are not used in this method.
 
-        :param data: Historical game data keyed by period.
-        :type data: Dict[int, List[Dict[str, Any]]]
+        Without a ``sink`` each projection is logged at info level. With one, each slate
+        is written to it as :class:`~keeks_elote.projections.Projection` rows in batches
+        of ``batch_size``, and the sink is closed when the run ends.
+
+        With ``evaluate_in_thread``, a slate is projected in a worker thread while the
+        main thread rates the following period's results on a copy-on-write branch of
+        the arena (see :func:`~keeks_elote.branching.branch_arena`), which is committed
+        once the slate is done. Projections are identical to a sequential run. Arenas
+        without a ``competitors`` mapping cannot be branched and run sequentially.
+
+        :param data: Historical game data keyed by period, or a compiled dataset of it.
+        :type data: Union[Dict[int, List[Dict[str, Any]]], CompiledDataset]
+        :param sink: Where to write projections, e.g. a :class:`~keeks_elote.projections.ColumnarSink`.
+        :type sink: Optional[ProjectionSink]
+        :param batch_size: Projections per ``sink.write`` call, or ``None`` for one call per slate.
+        :type batch_size: Optional[int]
+        :param evaluate_in_thread: Project each slate in a worker thread.
+        :type evaluate_in_thread: bool
+        :return: The sink, once closed, or ``None`` when projections were logged.
+        :rtype: Optional[ProjectionSink]
         """
         logger.info("Starting projection run.")
-        data = prepare_data(data)
-        logger.debug(f"Prepared data keys (periods): {list(data.keys())}")
-        period_keys = sorted(data)
-
-        for period_index, week_no in enumerate(period_keys):
-            games = data[week_no]
-            logger.info(f"Processing period {week_no} with {len(games)} games.")
-            # print('\nrunning with week %s' % (week_no,)) # Replaced with logging
-
-            matchups = [_matchup_tuple(x) for x in games]
-            # Only update ratings if there were games in the period
-            if matchups:
-                logger.info(f"Updating arena ratings with {len(matchups)} matchups from period {week_no}.")
-                self._arena.tournament(matchups)
-                logger.debug(f"Arena update complete for period {week_no}.")
-            else:
-                logger.info(f"No matchups to update ratings for period {week_no}.")
-
-            next_period_key = period_keys[period_index + 1] if period_index + 1 < len(period_keys) else None
-            next_period_games = data[next_period_key] if next_period_key is not None else []
-            projected_period = next_period_key if next_period_key is not None else week_no + 1
-            logger.info(f"Generating projections for period {projected_period} ({len(next_period_games)} games).")
-            for game in next_period_games:
-                winner, loser = game.get("winner"), game.get("loser")
-                if winner is None or loser is None:
-                    logger.warning(f"Skipping game due to missing labels: {game}")
-                    continue
-                logger.debug(f"Projecting game: {winner} vs {loser}")
-                prob_win = calculate_probabilities(self._arena, game)
-                if prob_win > 0.5:
-                    logger.info(f"Predicted {winner} over {loser}: {prob_win:.4f}")
-                    # print('Predicted %s over %s: %s' % (game.get('winner'), game.get('loser'), prob_win, )) # Replaced
+        self.data_quality.reset()
+        periods = self._compiled_periods(data)
+        threaded = evaluate_in_thread and isinstance(getattr(self._arena, "competitors", None), MutableMapping)
+        if evaluate_in_thread and not threaded:
+            logger.info("%s cannot be branched; projecting sequentially.", type(self._arena).__name__)
+
+        with ThreadPoolExecutor(max_workers=1) if threaded else nullcontext() as pool:
+            current = next(periods, None)
+            if current is not None:
+                self._start_period(current)
+                self._update_ratings(current.period, current.games, matchups=current.matchups)
+            while current is not None:
+                following = next(periods, None)
+                next_period_games = following.games if following is not None else []
+                projected_period = following.period if following is not None else current.period + 1
+                logger.info(
+                    "Generating projections for period %s (%d games).", projected_period, len(next_period_games)
+                )
+                slate = [game for game in next_period_games if self._has_labels(game)]
+
+                if pool is not None and following is not None:
+                    projections = self._project_while_rating(pool, slate, following)
+                else:
+                    projections = self._project_slate(self._arena, projected_period, slate)
+                    if following is not None:
+                        self._start_period(following)
+                        self._update_ratings(following.period, following.games, matchups=following.matchups)
+
+                if sink is None:
+                    self._log_projections(projections)
                 else:
-                    # If prob_win <= 0.5, the model favors the listed 'loser'
-                    logger.info(f"Predicted {loser} over {winner}: {1.0 - prob_win:.4f}")
-                    # print('Predicted %s over %s: %s' % (game.get('loser'), game.get('winner'), prob_win, )) # Incorrect output previously
+                    write_batched(sink, projections, batch_size)
+                current = following
 
+        if sink is not None:
+            sink.close()
+        self.data_quality.log_summary(logger, "projection run")
+        if self.observers:
+            self._notify("on_run_end", [], None)
         logger.info("Projection run finished.")
+        return sink
+
+    def _has_labels(self, game: GameRecord) -> bool:
+        if game.winner is None or game.loser is None:
+            if _note_issue(self.data_quality, MISSING_LABELS, game):
+                logger.warning("Skipping game due to missing labels: %s", game)
+            return False
+        return True
+
+    def _project_slate(self, arena: RatingArena, period: int, games: List[GameRecord]) -> List[Projection]:
+        """Projects labelled games from ``arena``'s current ratings."""
+        if self.fast:
+            expected_score = arena.expected_score
+            return [
+                Projection(period, game.winner, game.loser, expected_score(game.winner, game.loser)) for game in games
+            ]
+        return [Projection(period, game.winner, game.loser, calculate_probabilities(arena, game)) for game in games]
+
+    def _project_while_rating(
+        self, pool: ThreadPoolExecutor, slate: List[GameRecord], results: CompiledPeriod
+    ) -> List[Projection]:
+        """Projects ``slate`` in the worker while ``results`` are rated on a branch, then commits the branch."""
+        period = results.period
+        future = pool.submit(self._project_slate, self._arena, period, slate)
+        # The branch copies each competitor before changing it, so the worker keeps
+        # reading the ratings as they stood before this period.
+        branch = branch_arena(self._arena)
+        self._start_period(results)
+        self._update_ratings(period, results.games, branch, results.matchups)
+        projections = future.result()
+        branch.commit()
+        history = getattr(self._arena, "history", None)
+        if history is not None and branch.history is not None:
+            for bout in getattr(branch.history, "bouts", ()):
+                history.add_bout(bout)
+        return projections
+
+    @staticmethod
+    def _log_projections(projections: List[Projection]) -> None:
+        for projection in projections:
+            winner, loser, prob_win = projection.competitor, projection.opponent, projection.probability
+            if prob_win > 0.5:
+                logger.info("Predicted %s over %s: %.4f", winner, loser, prob_win)
+            else:
+                # If prob_win <= 0.5, the model favors the listed 'loser'
+                logger.info("Predicted %s over %s: %.4f", loser, winner, 1.0 - prob_win)
@@ -0,0 +1,271 @@
+import abc
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _BatchArena(abc.ABC):
+    """Accumulates every game into per-pair totals and re-solves the ratings after each tournament.
+
+    Each unordered pair of competitors keeps one row: games played, the first
+    competitor's wins and the sum and sum of squares of its scoring margin. A tournament
+    only adds to those rows, so re-solving costs a few passes over the pairs rather than
+    a replay of every game. Subclasses solve from the row arrays, warm-started from the
+    previous solution.
+
+    Matchups use the tuples :meth:`~keeks_elote.backtest.Backtest` builds: ``(a, b)``
+    for a win by ``a``, or ``(a, b, attributes, match_time, outcome, scores)`` with
+    ``outcome`` the first competitor's result (1.0, 0.5 or 0.0) and ``scores`` a
+    ``(score_a, score_b)`` pair or ``None``.
+    """
+
+    def __init__(self, unscored_margin: float = 1.0):
+        self.unscored_margin = unscored_margin
+        self._index: Dict[Any, int] = {}
+        self._labels: List[Any] = []
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self._first: List[int] = []
+        self._second: List[int] = []
+        self._games: List[float] = []
+        self._first_wins: List[float] = []
+        self._margin: List[float] = []
+        self._margin_sq: List[float] = []
+        self.last_iterations = 0
+
+    def _competitor(self, label: Any) -> int:
+        index = self._index.get(label)
+        if index is None:
+            index = self._index[label] = len(self._labels)
+            self._labels.append(label)
+        return index
+
+    def _record(self, matchup: Sequence[Any]) -> None:
+        a, b = self._competitor(matchup[0]), self._competitor(matchup[1])
+        outcome = matchup[4] if len(matchup) > 4 and matchup[4] is not None else 1.0
+        scores = matchup[5] if len(matchup) > 5 else None
+        if scores is not None:
+            margin = float(scores[0]) - float(scores[1])
+        else:
+            margin = (2.0 * float(outcome) - 1.0) * self.unscored_margin
+        if a > b:
+            a, b, outcome, margin = b, a, 1.0 - outcome, -margin
+        row = self._rows.get((a, b))
+        if row is None:
+            row = self._rows[(a, b)] = len(self._first)
+            self._first.append(a)
+            self._second.append(b)
+            self._games.append(0.0)
+            self._first_wins.append(0.0)
+            self._margin.append(0.0)
+            self._margin_sq.append(0.0)
+        self._games[row] += 1.0
+        self._first_wins[row] += float(outcome)
+        self._margin[row] += margin
+        self._margin_sq[row] += margin * margin
+
+    def tournament(self, matchups: List[Tuple[Any, ...]]) -> None:
+        """Adds a period's games and re-solves the ratings over every game seen so far."""
+        for matchup in matchups:
+            self._record(matchup)
+        if self._labels:
+            self._solve(
+                np.asarray(self._first, dtype=np.intp),
+                np.asarray(self._second, dtype=np.intp),
+                np.asarray(self._games, dtype=np.float64),
+            )
+        logger.debug(
+            "%s solved %d competitors over %d pairs in %d iterations.",
+            type(self).__name__,
+            len(self._labels),
+            len(self._first),
+            self.last_iterations,
+        )
+
+    @abc.abstractmethod
+    def _solve(self, first: np.ndarray, second: np.ndarray, games: np.ndarray) -> None:
+        """Re-solves the ratings from the per-pair arrays and sets :attr:`last_iterations`."""
+
+    def _sum_by_competitor(self, first: np.ndarray, second: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Per-competitor totals of ``a`` over pairs where it is first and ``b`` where it is second."""
+        size = len(self._labels)
+        return np.bincount(first, a, minlength=size) + np.bincount(second, b, minlength=size)
+
+
+class BradleyTerryArena(_BatchArena):
+    """A Bradley-Terry arena fit to every game so far by minorization-maximization.
+
+    Competitor ``i`` has a strength ``pi_i`` and beats ``j`` with probability
+    ``pi_i / (pi_i + pi_j)``. Each competitor also plays ``prior_games`` virtual games,
+    half of them won, against an average opponent of strength 1. Without that prior an
+    unbeaten or winless competitor has no finite maximum-likelihood strength. Unseen
+    competitors have strength 1.
+
+    Each MM update is two weighted ``bincount`` passes over the pairs. Plain MM converges
+    slowly when strengths are spread out, so the updates are accelerated with SQUAREM:
+    two updates set an extrapolation step and a third stabilizes it. Solves are
+    warm-started from the previous period's strengths.
+
+    :param prior_games: Virtual games each competitor plays against an average opponent.
+    :type prior_games: float
+    :param max_iterations: The most MM updates per solve.
+    :type max_iterations: int
+    :param tol: Stop once no log-strength changes by more than this.
+    :type tol: float
+    """
+
+    def __init__(self, prior_games: float = 1.0, max_iterations: int = 500, tol: float = 1e-8):
+        if prior_games <= 0:
+            raise ValueError("prior_games must be positive.")
+        super().__init__()
+        self.prior_games = prior_games
+        self.max_iterations = max_iterations
+        self.tol = tol
+        self._strength = np.ones(0)
+
+    def _solve(self, first: np.ndarray, second: np.ndarray, games: np.ndarray) -> None:
+        size = len(self._labels)
+        log_strength = np.zeros(size)
+        log_strength[: self._strength.shape[0]] = np.log(self._strength)
+        first_wins = np.asarray(self._first_wins, dtype=np.float64)
+        log_wins = np.log(
+            self._sum_by_competitor(first, second, first_wins, games - first_wins) + self.prior_games / 2.0
+        )
+
+        def update(current: np.ndarray) -> np.ndarray:
+            strength = np.exp(current)
+            weight = games / (strength[first] + strength[second])
+            expected = self._sum_by_competitor(first, second, weight, weight) + self.prior_games / (strength + 1.0)
+            return log_wins - np.log(expected)
+
+        iterations = 0
+        while iterations < self.max_iterations:
+            once = update(log_strength)
+            step = once - log_strength
+            iterations += 1
+            if float(np.max(np.abs(step))) < self.tol:
+                log_strength = once
+                break
+            curvature = update(once) - once - step
+            norm = float(np.linalg.norm(curvature))
+            alpha = min(-float(np.linalg.norm(step)) / norm, -1.0) if norm > 0 else -1.0
+            extrapolated = update(log_strength - 2.0 * alpha * step + alpha * alpha * curvature)
+            # An overshooting extrapolation falls back to the plain MM update.
+            log_strength = extrapolated if np.all(np.isfinite(extrapolated)) else update(once)
+            iterations += 2
+        self._strength = np.exp(log_strength)
+        self.last_iterations = iterations
+
+    def _strength_of(self, label: Any) -> float:
+        index = self._index.get(label)
+        return float(self._strength[index]) if index is not None and index < self._strength.shape[0] else 1.0
+
+    def expected_score(self, competitor: Any, opponent: Any) -> float:
+        mine, theirs = self._strength_of(competitor), self._strength_of(opponent)
+        return mine / (mine + theirs)
+
+    def ratings(self) -> Dict[Any, float]:
+        """Every competitor seen, mapped to its log-strength (0 is an average competitor)."""
+        return {label: math.log(self._strength_of(label)) for label in self._labels}
+
+
+class MasseyArena(_BatchArena):
+    """A Massey least-squares arena fit to every scoring margin so far by conjugate gradient.
+
+    Ratings solve ``r_winner - r_loser ≈ margin`` over every game in the least-squares
+    sense. The normal equations use the Massey matrix, the game-count graph Laplacian,
+    plus ``ridge`` on the diagonal. The ridge acts like that many scoreless games against
+    an average opponent rated 0, which fixes the ratings' level and keeps disconnected
+    groups of competitors solvable. Conjugate gradient runs matrix-free, each step one
+    pass over the pairs, warm-started from the previous period's ratings.
+
+    Games without scores count as a margin of ``unscored_margin`` to the winner.
+    :meth:`expected_score` treats the margin as normal around the rating difference. Its
+    spread is ``scale``, or else the residual standard deviation of the fit.
+
+    :param ridge: Virtual scoreless games each competitor plays against a 0-rated opponent.
+    :type ridge: float
+    :param scale: The margin's standard deviation for win probabilities. Defaults to the
+                  fitted residual standard deviation.
+    :type scale: Optional[float]
+    :param unscored_margin: The margin credited to the winner of a game without scores.
+    :type unscored_margin: float
+    :param max_iterations: The most conjugate-gradient steps per solve. Defaults to the
+                           number of competitors.
+    :type max_iterations: Optional[int]
+    :param tol: Stop once the residual norm falls below this fraction of the right-hand side's.
+    :type tol: float
+    """
+
+    def __init__(
+        self,
+        ridge: float = 0.1,
+        scale: Optional[float] = None,
+        unscored_margin: float = 1.0,
+        max_iterations: Optional[int] = None,
+        tol: float = 1e-10,
+    ):
+        if ridge <= 0:
+            raise ValueError("ridge must be positive.")
+        super().__init__(unscored_margin)
+        self.ridge = ridge
+        self.scale = scale
+        self.max_iterations = max_iterations
+        self.tol = tol
+        self._ratings = np.zeros(0)
+        self._spread = 1.0
+
+    def _solve(self, first: np.ndarray, second: np.ndarray, games: np.ndarray) -> None:
+        size = len(self._labels)
+        margin = np.asarray(self._margin, dtype=np.float64)
+        diagonal = self._sum_by_competitor(first, second, games, games) + self.ridge
+        rhs = self._sum_by_competitor(first, second, margin, -margin)
+
+        def massey(x: np.ndarray) -> np.ndarray:
+            return diagonal * x - self._sum_by_competitor(first, second, games * x[second], games * x[first])
+
+        ratings = np.zeros(size)
+        ratings[: self._ratings.shape[0]] = self._ratings
+        residual = rhs - massey(ratings)
+        direction = residual.copy()
+        norm = float(residual @ residual)
+        target = (self.tol * float(np.linalg.norm(rhs))) ** 2
+        iterations, limit = 0, self.max_iterations or size
+        while norm > target and iterations < limit:
+            product = massey(direction)
+            step = norm / float(direction @ product)
+            ratings += step * direction
+            residual -= step * product
+            updated = float(residual @ residual)
+            direction = residual + (updated / norm) * direction
+            norm = updated
+            iterations += 1
+        self._ratings = ratings
+        self.last_iterations = iterations
+        self._spread = self._residual_spread(ratings, first, second, games, margin)
+
+    def _residual_spread(
+        self, ratings: np.ndarray, first: np.ndarray, second: np.ndarray, games: np.ndarray, margin: np.ndarray
+    ) -> float:
+        """The residual standard deviation of the fit, from the accumulated margin moments."""
+        difference = ratings[first] - ratings[second]
+        squares = np.asarray(self._margin_sq, dtype=np.float64) - 2.0 * difference * margin + games * difference**2
+        dof = float(games.sum()) - len(self._labels)
+        variance = float(squares.sum()) / dof if dof > 0 else 0.0
+        return math.sqrt(variance) if variance > 0 else 1.0
+
+    def _rating_of(self, label: Any) -> float:
+        index = self._index.get(label)
+        return float(self._ratings[index]) if index is not None and index < self._ratings.shape[0] else 0.0
+
+    def expected_score(self, competitor: Any, opponent: Any) -> float:
+        spread = self.scale if self.scale is not None else self._spread
+        difference = self._rating_of(competitor) - self._rating_of(opponent)
+        return 0.5 * (1.0 + math.erf(difference / (spread * math.sqrt(2.0))))
+
+    def ratings(self) -> Dict[Any, float]:
+        """Every competitor seen, mapped to its rating (the average competitor is near 0)."""
+        return {label: self._rating_of(label) for label in self._labels}
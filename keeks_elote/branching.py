@@ -0,0 +1,177 @@
+import copy
+import logging
+from collections import ChainMap
+from collections.abc import MutableMapping
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from keeks_elote.rating_arena import RatingArena
+
+logger = logging.getLogger(__name__)
+
+# Arena helpers that only read competitors, so a branch can hand them straight to its view.
+_READ_ONLY = frozenset(
+    {
+        "leaderboard",
+        "export_state",
+        "get_all_competitors",
+        "get_competitor_by_id",
+        "base_competitor",
+        "base_competitor_kwargs",
+    }
+)
+
+
+def group_members(participants: Sequence[Any]) -> List[Any]:
+    """The competitor ids in a ``match_group`` participant list, expanding ``(id, roster)`` sides."""
+    members: List[Any] = []
+    for entry in participants:
+        if isinstance(entry, (list, tuple)) and len(entry) == 2 and isinstance(entry[1], (list, tuple)):
+            members.extend(entry[1])
+        else:
+            members.append(entry)
+    return members
+
+
+class ArenaBranch:
+    """A copy-on-write what-if view of an arena.
+
+    A branch shares every competitor with the state it was taken from and only copies a
+    competitor the first time one of its own ``tournament`` calls is about to change it.
+    Taking a branch is therefore O(1), running hypothetical results through it is
+    O(competitors changed), and :meth:`rollback` is a dictionary clear. Branches nest, so
+    "what if X wins this week, and then Y the week after" is a branch of a branch.
+
+    The branch satisfies :class:`~keeks_elote.rating_arena.RatingArena`, so it can be
+    handed to :class:`~keeks_elote.backtest.Backtest` or the simulator like any arena.
+
+    Besides ``tournament``, elote's ``matchup``, ``rating_period``, ``match_group`` and
+    ``process_history`` also copy before they write. Read-only helpers such as
+    ``leaderboard`` see the branch's competitors; other arena attributes are not exposed.
+
+    It works with arenas that keep their competitors in a ``competitors`` mapping, as
+    elote's ``LambdaArena`` does. The state a branch was taken from must not be changed
+    while the branch is in use; write back through :meth:`commit` instead.
+
+    Use :func:`branch_arena` to take the first branch of an arena.
+
+    :param root: The arena whose behaviour the branch borrows.
+    :type root: RatingArena
+    :param parent_maps: The competitor mappings the branch reads through, nearest first.
+    :type parent_maps: Sequence[MutableMapping]
+    """
+
+    def __init__(self, root: RatingArena, parent_maps: Sequence[MutableMapping]):
+        self._root = root
+        self._overlay: Dict[Any, Any] = {}
+        self._competitors: ChainMap = ChainMap(self._overlay, *parent_maps)
+        # A shallow copy borrows the arena's configuration and methods; only the
+        # competitor store is swapped for the layered view.
+        self._view = copy.copy(root)
+        self._view.competitors = self._competitors  # type: ignore[attr-defined]
+        history = getattr(root, "history", None)
+        if history is not None:
+            # Bouts recorded on a hypothetical branch must not leak into the real history.
+            self._view.history = type(history)()  # type: ignore[attr-defined]
+
+    @property
+    def changed_competitors(self) -> Set[Any]:
+        """Competitors this branch holds its own copy of."""
+        return set(self._overlay)
+
+    @property
+    def competitors(self) -> ChainMap:
+        """The branch's competitors, layered over its parents'. Change them through the mutators."""
+        return self._competitors
+
+    @property
+    def history(self) -> Any:
+        """Bouts recorded on this branch alone, when the arena keeps a history."""
+        return getattr(self._view, "history", None)
+
+    def _copy_on_write(self, competitor: Any) -> None:
+        if competitor not in self._overlay and competitor in self._competitors:
+            self._overlay[competitor] = copy.deepcopy(self._competitors[competitor])
+
+    def tournament(self, matchups: List[Tuple[Any, ...]]) -> Any:
+        """Applies hypothetical results to this branch only."""
+        for matchup in matchups:
+            self._copy_on_write(matchup[0])
+            self._copy_on_write(matchup[1])
+        return self._view.tournament(matchups)
+
+    def matchup(self, a: Any, b: Any, *args: Any, **kwargs: Any) -> Any:
+        """Applies one hypothetical result to this branch only."""
+        self._copy_on_write(a)
+        self._copy_on_write(b)
+        return self._view.matchup(a, b, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def rating_period(self, matchups: Sequence[Tuple[Any, ...]], **kwargs: Any) -> Any:
+        """Applies a hypothetical rating period to this branch only."""
+        for matchup in matchups:
+            self._copy_on_write(matchup[0])
+            self._copy_on_write(matchup[1])
+        return self._view.rating_period(matchups, **kwargs)  # type: ignore[attr-defined]
+
+    def match_group(self, participants: Sequence[Any], *args: Any, **kwargs: Any) -> Any:
+        """Applies a hypothetical N-way bout to this branch only."""
+        for member in group_members(participants):
+            self._copy_on_write(member)
+        return self._view.match_group(participants, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def process_history(self, bouts: Sequence[Tuple[Any, ...]], *args: Any, **kwargs: Any) -> Any:
+        """Applies hypothetical historical bouts to this branch only."""
+        for bout in bouts:
+            self._copy_on_write(bout[0])
+            self._copy_on_write(bout[1])
+        return self._view.process_history(bouts, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def expected_score(self, competitor: Any, opponent: Any) -> float:
+        return self._view.expected_score(competitor, opponent)
+
+    def branch(self) -> "ArenaBranch":
+        """Takes a nested branch that reads through this one."""
+        return ArenaBranch(self._root, self._competitors.maps)
+
+    def rollback(self) -> None:
+        """Discards every change made on this branch."""
+        logger.debug("Rolling back %d changed competitors.", len(self._overlay))
+        self._overlay.clear()
+        history = getattr(self._root, "history", None)
+        if history is not None:
+            self._view.history = type(history)()  # type: ignore[attr-defined]
+
+    def commit(self) -> None:
+        """Writes this branch's changes into the state it was taken from.
+
+        Committing a first-level branch updates the real arena's competitors. The branch
+        is empty afterwards and keeps reading through the now-updated parent.
+        """
+        parent = self._competitors.maps[1]
+        logger.debug("Committing %d changed competitors.", len(self._overlay))
+        parent.update(self._overlay)
+        self._overlay.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        # Read-only helpers such as leaderboard() see the branch's competitors. Anything else
+        # could change competitors shared with the parent without copying them first.
+        if name not in _READ_ONLY:
+            raise AttributeError(
+                f"{type(self).__name__} has no attribute {name!r}; branches expose the copy-on-write "
+                f"mutators and the read-only helpers {sorted(_READ_ONLY)}"
+            )
+        return getattr(self._view, name)
+
+
+def branch_arena(arena: RatingArena) -> ArenaBranch:
+    """Takes a copy-on-write branch of an arena for what-if analysis.
+
+    :param arena: An arena keeping its competitors in a ``competitors`` mapping.
+    :type arena: RatingArena
+    :return: A branch that starts out identical to the arena.
+    :rtype: ArenaBranch
+    :raises TypeError: If the arena does not expose a ``competitors`` mapping.
+    """
+    competitors = getattr(arena, "competitors", None)
+    if not isinstance(competitors, MutableMapping):
+        raise TypeError(f"branch_arena needs an arena with a competitors mapping, got {type(arena).__name__}.")
+    return ArenaBranch(arena, [competitors])
@@ -0,0 +1,429 @@
+"""The ``keeks-elote`` command: backtests, projections and sweeps from a JSON config file.
+
+Only the standard library is imported at module level. Building an arena or strategy
+imports just the modules its config names, so ``--help`` and ``--check`` runs start
+without loading keeks, elote or NumPy, and each sweep worker imports only what its jobs
+use.
+
+A config names its data file and each component. Relative paths are resolved against
+the config file's directory::
+
+    {
+        "data": "games.ndjson",
+        "period_key": "week",
+        "arena": {"competitor": "glicko"},
+        "strategy": {"class": "kelly", "kwargs": {"payoff": 1.0, "loss": 1.0, "transaction_cost": 0.0}},
+        "bankroll": {"initial_funds": 1000.0, "percent_bettable": 0.5, "max_draw_down": 1.0},
+        "period_to_start_betting": 3,
+        "stop_rules": [{"class": "ruin", "kwargs": {"min_fraction": 0.05}}]
+    }
+
+A sweep config gives ``arenas``, ``strategies`` and ``bankrolls`` as mappings of names to
+specs and may give ``data`` as a mapping of names to files. Every combination is one job.
+"""
+
+import argparse
+import functools
+import importlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Short names for the classes configs most often refer to; anything else is "module:Class".
+_ARENAS = {
+    "bradley-terry": "keeks_elote.batch_arena:BradleyTerryArena",
+    "massey": "keeks_elote.batch_arena:MasseyArena",
+}
+_COMPETITORS = {
+    "elo": "elote.competitors.elo:EloCompetitor",
+    "glicko": "elote.competitors.glicko:GlickoCompetitor",
+    "glicko2": "elote.competitors.glicko2:Glicko2Competitor",
+    "ecf": "elote.competitors.ecf:ECFCompetitor",
+    "dwz": "elote.competitors.dwz:DWZCompetitor",
+}
+_STRATEGIES = {
+    "kelly": "keeks.binary_strategies.kelly:KellyCriterion",
+    "fractional-kelly": "keeks.binary_strategies.kelly:FractionalKellyCriterion",
+    "fixed-fraction": "keeks.binary_strategies.simple:FixedFractionStrategy",
+}
+_STOP_RULES = {
+    "ruin": "keeks_elote.stopping:RuinStop",
+    "drawdown": "keeks_elote.stopping:DrawdownStop",
+    "minimum-bets": "keeks_elote.stopping:MinimumBetsStop",
+    "benchmark": "keeks_elote.stopping:BenchmarkStop",
+}
+_SINKS = {
+    ".csv": "keeks_elote.projections:CsvSink",
+    ".ndjson": "keeks_elote.projections:NdjsonSink",
+    ".jsonl": "keeks_elote.projections:NdjsonSink",
+    ".npz": "keeks_elote.projections:NpzSink",
+}
+_BANKROLL_FIELDS = {"initial_funds", "percent_bettable", "max_draw_down"}
+
+
+class ConfigError(ValueError):
+    """A config file that cannot be run."""
+
+
+def _resolve(reference: str, aliases: Dict[str, str]) -> Any:
+    """Imports the object a ``module:Name`` (or ``module.Name``) reference or alias names."""
+    target = aliases.get(reference, reference)
+    module, sep, name = target.partition(":")
+    if not sep:
+        module, _, name = target.rpartition(".")
+    if not module or not name:
+        raise ConfigError(f"{reference!r} is neither a known name nor a 'module:Class' reference.")
+    try:
+        return getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError) as exc:
+        raise ConfigError(f"Cannot import {target!r}: {exc}") from exc
+
+
+def _first_wins(a: Any, b: Any, attributes: Any = None) -> bool:
+    # Matchups always list the winner first, as in examples/cfb.py.
+    return True
+
+
+def build_arena(spec: Dict[str, Any]) -> Any:
+    """An arena from ``{"competitor": ..., "kwargs": {...}}`` or ``{"class": ..., "kwargs": {...}}``.
+
+    A ``competitor`` spec builds an elote ``LambdaArena`` of that competitor type.
+    """
+    kwargs = spec.get("kwargs", {})
+    if "competitor" in spec:
+        from elote.arenas.lambda_arena import LambdaArena
+
+        competitor = _resolve(spec["competitor"], _COMPETITORS)
+        return LambdaArena(_first_wins, base_competitor=competitor, base_competitor_kwargs=kwargs)
+    return _resolve(spec["class"], _ARENAS)(**kwargs)
+
+
+def build_strategy(spec: Dict[str, Any]) -> Any:
+    """A keeks strategy from ``{"class": ..., "kwargs": {...}}``."""
+    return _resolve(spec["class"], _STRATEGIES)(**spec.get("kwargs", {}))
+
+
+def build_bankroll(spec: Dict[str, Any]) -> Any:
+    """A keeks ``BankRoll`` from its constructor arguments."""
+    from keeks.bankroll import BankRoll
+
+    return BankRoll(**spec)
+
+
+def _build_stop_rules(specs: Sequence[Dict[str, Any]]) -> List[Any]:
+    return [_resolve(spec["class"], _STOP_RULES)(**spec.get("kwargs", {})) for spec in specs]
+
+
+@functools.lru_cache(maxsize=4)
+def load_periods(path: str, period_key: str = "period") -> Any:
+    """Reads an NDJSON or CSV game file into a :class:`~keeks_elote.dataset.CompiledDataset`.
+
+    Results are cached per process, so a sweep worker reads and compiles each data file once.
+    """
+    from keeks_elote.dataset import CompiledDataset
+    from keeks_elote.loaders import stream_periods
+
+    return CompiledDataset(dict(stream_periods(path, period_key)))
+
+
+def _check_spec(errors: List[str], where: str, spec: Any, keys: Tuple[str, ...]) -> None:
+    if not isinstance(spec, dict) or not any(key in spec for key in keys):
+        errors.append(f"{where} must be an object with {' or '.join(repr(key) for key in keys)}.")
+    elif not isinstance(spec.get("kwargs", {}), dict):
+        errors.append(f"{where}.kwargs must be an object.")
+
+
+def _check_axis(errors: List[str], label: str, specs: Dict[str, Any], keys: Tuple[str, ...]) -> None:
+    if not specs:
+        errors.append(f"No {label} is configured.")
+    for name, spec in specs.items():
+        _check_spec(errors, f"{label} {name!r}", spec, keys)
+
+
+def _check_bankroll(errors: List[str], where: str, spec: Any) -> None:
+    if not isinstance(spec, dict) or set(spec) - _BANKROLL_FIELDS:
+        errors.append(f"{where} may only set {', '.join(sorted(_BANKROLL_FIELDS))}.")
+
+
+def _named(config: Dict[str, Any], plural: str, singular: str) -> Dict[str, Any]:
+    """A sweep axis: the ``plural`` mapping, or the single ``singular`` entry named ``default``."""
+    if plural in config:
+        return config[plural]
+    return {"default": config[singular]} if singular in config else {}
+
+
+def _data_files(config: Dict[str, Any], base: Path) -> Dict[str, str]:
+    data = config.get("data")
+    files = data if isinstance(data, dict) else ({"default": data} if data is not None else {})
+    return {name: str(base / path) for name, path in files.items()}
+
+
+def validate(command: str, config: Dict[str, Any], base: Path) -> List[str]:
+    """Every problem with a config, found without importing anything it names.
+
+    :param command: ``backtest``, ``project`` or ``sweep``.
+    :type command: str
+    :param config: The parsed config.
+    :type config: Dict[str, Any]
+    :param base: The directory relative data paths are resolved against.
+    :type base: Path
+    :return: One message per problem; empty when the config can be run.
+    :rtype: List[str]
+    """
+    errors: List[str] = []
+    files = _data_files(config, base)
+    if not files:
+        errors.append("'data' must name a game file.")
+    if command != "sweep" and len(files) > 1:
+        errors.append(f"'{command}' runs on a single data file.")
+    errors.extend(f"Data file {path} does not exist." for path in files.values() if not Path(path).is_file())
+
+    _check_axis(errors, "arena", _named(config, "arenas", "arena"), ("competitor", "class"))
+    if command != "project":
+        _check_axis(errors, "strategy", _named(config, "strategies", "strategy"), ("class",))
+        bankrolls = _named(config, "bankrolls", "bankroll")
+        if not bankrolls:
+            errors.append("No bankroll is configured.")
+        for name, spec in bankrolls.items():
+            _check_bankroll(errors, f"bankroll {name!r}", spec)
+    for index, spec in enumerate(config.get("stop_rules", [])):
+        _check_spec(errors, f"stop_rules[{index}]", spec, ("class",))
+    return errors
+
+
+def sweep_specs(config: Dict[str, Any], base: Path) -> List[Dict[str, Any]]:
+    """The sweep's jobs as plain, picklable dicts: one per arena × strategy × bankroll × data file."""
+    shared = {
+        "period_key": config.get("period_key", "period"),
+        "period_to_start_betting": config.get("period_to_start_betting", 3),
+        "price_bets_at_true_odds": config.get("price_bets_at_true_odds", True),
+        "stop_rules": config.get("stop_rules", []),
+    }
+    return [
+        {
+            **shared,
+            "tags": {"arena": arena, "strategy": strategy, "bankroll": bankroll, "data": data},
+            "arena": arena_spec,
+            "strategy": strategy_spec,
+            "bankroll": bankroll_spec,
+            "data": path,
+        }
+        for arena, arena_spec in _named(config, "arenas", "arena").items()
+        for strategy, strategy_spec in _named(config, "strategies", "strategy").items()
+        for bankroll, bankroll_spec in _named(config, "bankrolls", "bankroll").items()
+        for data, path in _data_files(config, base).items()
+    ]
+
+
+def run_sweep_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs one sweep job from its spec and returns its result as a JSON-ready dict."""
+    from keeks_elote.work_queue import SweepJob
+
+    job = SweepJob(
+        functools.partial(build_arena, spec["arena"]),
+        build_strategy(spec["strategy"]),
+        functools.partial(build_bankroll, spec["bankroll"]),
+        load_periods(spec["data"], spec["period_key"]),
+        spec["period_to_start_betting"],
+        spec["price_bets_at_true_odds"],
+        spec["tags"],
+        _build_stop_rules(spec["stop_rules"]),
+    )
+    result = job()
+    return {
+        "tags": result.tags,
+        "starting_funds": result.starting_funds,
+        "final_funds": result.final_funds,
+        "return": result.bankroll_return,
+        "bets": sum(summary.bets_placed for summary in result.period_summaries),
+        "periods": len(result.period_summaries),
+        "stop_reason": result.stop_reason,
+    }
+
+
+def _write_lines(handle: IO[str], rows: Iterator[Dict[str, Any]]) -> int:
+    written = 0
+    for row in rows:
+        handle.write(json.dumps(row) + "\n")
+        handle.flush()
+        written += 1
+    return written
+
+
+def _open_output(path: Optional[str]) -> Tuple[IO[str], bool]:
+    if path is None or path == "-":
+        return sys.stdout, False
+    return open(path, "w", encoding="utf-8"), True
+
+
+def _run_sweep(config: Dict[str, Any], base: Path, args: argparse.Namespace) -> int:
+    specs = sweep_specs(config, base)
+    if args.queue:
+        from keeks_elote.work_queue import WorkQueue
+
+        WorkQueue(args.queue).submit_many([functools.partial(run_sweep_spec, spec) for spec in specs])
+        print(f"Queued {len(specs)} jobs in {args.queue}.", file=sys.stderr)
+        return 0
+    handle, owned = _open_output(args.output or config.get("output"))
+    try:
+        if args.jobs == 1:
+            _write_lines(handle, map(run_sweep_spec, specs))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                _write_lines(handle, pool.map(run_sweep_spec, specs))
+    finally:
+        if owned:
+            handle.close()
+    return 0
+
+
+def _run_backtest(config: Dict[str, Any], base: Path, args: argparse.Namespace) -> int:
+    from keeks_elote.backtest import Backtest
+
+    (path,) = _data_files(config, base).values()
+    bankroll = build_bankroll(config["bankroll"])
+    starting_funds = bankroll.total_funds
+    backtest = Backtest(build_arena(config["arena"]), fast=config.get("fast", False))
+    backtest.run_explicit(
+        load_periods(path, config.get("period_key", "period")),
+        build_strategy(config["strategy"]),
+        bankroll,
+        config.get("period_to_start_betting", 3),
+        config.get("price_bets_at_true_odds", True),
+        stop_rules=_build_stop_rules(config.get("stop_rules", [])),
+    )
+    report = {
+        "starting_funds": starting_funds,
+        "final_funds": bankroll.total_funds,
+        "stop_reason": backtest.stop_reason,
+        "data_quality": dict(backtest.data_quality.counts),
+        "periods": [summary._asdict() for summary in backtest.period_summaries],
+    }
+    handle, owned = _open_output(args.output or config.get("output"))
+    try:
+        json.dump(report, handle, indent=2)
+        handle.write("\n")
+    finally:
+        if owned:
+            handle.close()
+    return 0
+
+
+def _run_projection(config: Dict[str, Any], base: Path, args: argparse.Namespace) -> int:
+    from keeks_elote.backtest import Backtest
+
+    (path,) = _data_files(config, base).values()
+    output = args.output or config.get("output")
+    if output is None or output == "-":
+        from keeks_elote.projections import NdjsonSink
+
+        sink: Any = NdjsonSink(sys.stdout)
+    else:
+        suffix = Path(output).suffix
+        if suffix not in _SINKS:
+            raise ConfigError(f"Cannot write projections to {output}: use one of {', '.join(sorted(_SINKS))}.")
+        sink = _resolve(_SINKS[suffix], {})(output)
+    backtest = Backtest(build_arena(config["arena"]), fast=config.get("fast", False))
+    backtest.run_and_project(load_periods(path, config.get("period_key", "period")), sink=sink)
+    return 0
+
+
+def _run_worker(args: argparse.Namespace) -> int:
+    from keeks_elote.work_queue import WorkQueue, run_worker
+
+    ran = run_worker(WorkQueue(args.queue_file), poll_interval=args.poll_interval, stop_when_empty=not args.forever)
+    print(f"Ran {ran} jobs.", file=sys.stderr)
+    return 0
+
+
+_COMMANDS: Dict[str, Callable[[Dict[str, Any], Path, argparse.Namespace], int]] = {
+    "backtest": _run_backtest,
+    "project": _run_projection,
+    "sweep": _run_sweep,
+}
+
+
+def _positive_int(value: str) -> int:
+    """An argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """The ``keeks-elote`` argument parser."""
+    parser = argparse.ArgumentParser(prog="keeks-elote", description="Backtest betting strategies on rating systems.")
+    parser.add_argument("-v", "--verbose", action="count", default=0, help="log progress (-vv for debug output)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, summary in (
+        ("backtest", "run one betting backtest and write its period summaries as JSON"),
+        ("project", "rate each period and write projections for the next (CSV, NDJSON or NPZ by suffix)"),
+        ("sweep", "run every arena x strategy x bankroll x data combination, one NDJSON line per job"),
+    ):
+        command = commands.add_parser(name, help=summary, description=summary)
+        command.add_argument("config", help="the JSON config file")
+        command.add_argument("-o", "--output", help="where to write results (default: the config's 'output' or stdout)")
+        command.add_argument("--check", action="store_true", help="validate the config and data paths, then exit")
+        if name == "sweep":
+            command.add_argument(
+                "-j", "--jobs", type=_positive_int, default=None, help="worker processes (default: CPU count)"
+            )
+            command.add_argument("--queue", help="submit the jobs to this work-queue file instead of running them")
+    worker = commands.add_parser("worker", help="run jobs from a work-queue file until it is drained")
+    worker.add_argument("queue_file", help="the SQLite work-queue file")
+    worker.add_argument("--poll-interval", type=float, default=5.0, help="seconds between polls while waiting")
+    worker.add_argument("--forever", action="store_true", help="keep polling once the queue is empty")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the ``keeks-elote`` command.
+
+    :param argv: The arguments, excluding the program name. Defaults to ``sys.argv[1:]``.
+    :type argv: Optional[Sequence[str]]
+    :return: The exit status.
+    :rtype: int
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=(logging.WARNING, logging.INFO, logging.DEBUG)[min(args.verbose, 2)],
+        format="%(asctime)s %(name)s %(levelname)s %(message)s",
+    )
+    if args.command == "worker":
+        return _run_worker(args)
+
+    config_path = Path(args.config)
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"keeks-elote: cannot read {config_path}: {exc}", file=sys.stderr)
+        return 2
+    base = config_path.parent
+    errors = validate(args.command, config, base) if isinstance(config, dict) else ["The config must be an object."]
+    for error in errors:
+        print(f"keeks-elote: {config_path}: {error}", file=sys.stderr)
+    if errors:
+        return 2
+    if args.check:
+        jobs = len(sweep_specs(config, base)) if args.command == "sweep" else 1
+        print(f"{config_path}: OK ({jobs} job{'s' if jobs != 1 else ''}).", file=sys.stderr)
+        return 0
+    try:
+        return _COMMANDS[args.command](config, base, args)
+    except ConfigError as exc:
+        print(f"keeks-elote: {config_path}: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
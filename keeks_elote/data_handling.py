@@ -1,10 +1,18 @@
+import hashlib
+import json
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from keeks_elote.data_quality import MISSING_LABELS, DataQualityReport
+from keeks_elote.records import GameRecord
 
 logger = logging.getLogger(__name__)
 
 
-def prepare_data(data: Dict[int, List[Dict[str, Any]]]) -> Dict[int, List[Dict[str, Any]]]:
+def prepare_data(
+    data: Dict[int, List[Dict[str, Any]]],
+    quality: Optional[DataQualityReport] = None,
+) -> Dict[int, List[Dict[str, Any]]]:
     """Prepares and validates the input data structure.
 
     Validation rules:
@@ -13,10 +21,14 @@ def prepare_data(data: Dict[int, List[Dict[str, Any]]]) -> Dict[int, List[Dict[s
       :class:`TypeError`.
     * Each period must contain a ``list`` of games; anything else raises
       :class:`TypeError`.
-    * Each game must be a ``dict`` containing both ``winner`` and ``loser``
-      keys. Games that are not dicts or are missing either label are dropped
-      with a warning (consistent with how :class:`~keeks_elote.backtest.Backtest`
-      skips unlabeled games).
+    * Each game must be a ``dict`` (or a :class:`~keeks_elote.records.GameRecord`)
+      containing both ``winner`` and ``loser`` keys. Games that are not dicts or
+      are missing either label are dropped (consistent with how
+      :class:`~keeks_elote.backtest.Backtest` skips unlabeled games).
+
+    Dropped games are counted in ``quality`` under
+    :data:`~keeks_elote.data_quality.MISSING_LABELS` rather than logged one by one.
+    Without a report, a single summary warning is logged for the call.
 
     Well-formed input is returned unchanged (the same object), so the
     passthrough contract is preserved. A new structure is only built when one
@@ -24,16 +36,18 @@ def prepare_data(data: Dict[int, List[Dict[str, Any]]]) -> Dict[int, List[Dict[s
 
     :param data: Raw historical game data, expected to be keyed by period.
     :type data: Dict[int, List[Dict[str, Any]]]
+    :param quality: The report to count dropped games in. The caller then owns the summary.
+    :type quality: Optional[DataQualityReport]
     :return: The validated data with any malformed games removed.
     :rtype: Dict[int, List[Dict[str, Any]]]
     :raises TypeError: If ``data`` is not a dict or a period does not contain a list.
     """
     logger.info("Preparing data...")
-    logger.debug(f"Input data type: {type(data)}")
     if not isinstance(data, dict):
         raise TypeError(f"prepare_data expected a dict keyed by period, got {type(data).__name__}.")
-    logger.debug(f"Data has {len(data)} periods.")
+    logger.debug("Data has %d periods.", len(data))
 
+    report = quality if quality is not None else DataQualityReport()
     cleaned: Dict[int, List[Dict[str, Any]]] = {}
     dropped = 0
     for period, games in data.items():
@@ -43,13 +57,34 @@ def prepare_data(data: Dict[int, List[Dict[str, Any]]]) -> Dict[int, List[Dict[s
             )
         valid_games = []
         for game in games:
-            if not isinstance(game, dict) or game.get("winner") is None or game.get("loser") is None:
-                logger.warning(f"Period {period}: dropping game with missing winner/loser labels: {game}")
+            if not isinstance(game, (dict, GameRecord)) or game.get("winner") is None or game.get("loser") is None:
+                report.record(MISSING_LABELS, game)
+                if report.log_events:
+                    logger.warning("Period %s: dropping game with missing winner/loser labels: %s", period, game)
                 dropped += 1
                 continue
             valid_games.append(game)
         cleaned[period] = valid_games
 
+    if quality is None:
+        report.log_summary(logger, "prepared data")
     logger.info("Data preparation complete.")
     # Preserve the passthrough contract (same object) when nothing was dropped.
     return data if dropped == 0 else cleaned
+
+
+def period_fingerprint(games: List[Dict[str, Any]]) -> str:
+    """Digests a period's games so that any change to them changes the digest.
+
+    Games are serialized with sorted keys, so two periods with the same games in the same
+    order fingerprint identically however their dicts were built. Game order is part of
+    the fingerprint because it is part of what the arena sees. Values that JSON cannot
+    represent fall back to their ``repr``.
+
+    :param games: The games of one period.
+    :type games: List[Dict[str, Any]]
+    :return: A hex digest of the period's content.
+    :rtype: str
+    """
+    payload = json.dumps(games, sort_keys=True, default=repr, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,80 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MISSING_LABELS = "missing_labels"
+UNPARSEABLE_SCORES = "unparseable_scores"
+NON_WINNING_SCORES = "non_winning_scores"
+INVALID_ODDS = "invalid_odds"
+
+# How each category reads in a summary line, and what was done about it.
+_DESCRIPTIONS = {
+    MISSING_LABELS: "games missing winner/loser labels (dropped)",
+    UNPARSEABLE_SCORES: "games with unparseable scores (rated on result alone)",
+    NON_WINNING_SCORES: "games whose scores do not show the recorded winner (rated on result alone)",
+    INVALID_ODDS: "sides with invalid odds (not bet)",
+}
+
+
+class DataQualityReport:
+    """Counts malformed-data issues by category instead of logging each one.
+
+    A dirty feed can carry the same problem on every other row, and a warning per row
+    (formatted whether or not anyone reads it) then costs more than the backtest. A
+    report keeps a count per category plus the first few offending records as examples,
+    and :meth:`log_summary` emits a single line for the whole run. Per-event warnings
+    are still available by setting ``log_events``; call sites check it before doing any
+    formatting work.
+
+    The categories are the module constants :data:`MISSING_LABELS`,
+    :data:`UNPARSEABLE_SCORES`, :data:`NON_WINNING_SCORES` and :data:`INVALID_ODDS`.
+
+    :param max_examples: How many example records to keep per category.
+    :type max_examples: int
+    :param log_events: Also log a warning for every individual issue.
+    :type log_events: bool
+    """
+
+    def __init__(self, max_examples: int = 5, log_events: bool = False):
+        self.max_examples = max_examples
+        self.log_events = log_events
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, List[Any]] = {}
+
+    def record(self, category: str, example: Any = None) -> None:
+        """Counts one issue, keeping ``example`` if the category has room for it."""
+        self.counts[category] = self.counts.get(category, 0) + 1
+        if example is not None:
+            kept = self.examples.setdefault(category, [])
+            if len(kept) < self.max_examples:
+                kept.append(example)
+
+    @property
+    def total(self) -> int:
+        """Issues counted across every category."""
+        return sum(self.counts.values())
+
+    def merge(self, other: "DataQualityReport") -> None:
+        """Adds another report's counts and (space permitting) examples to this one."""
+        for category, count in other.counts.items():
+            self.counts[category] = self.counts.get(category, 0) + count
+        for category, examples in other.examples.items():
+            kept = self.examples.setdefault(category, [])
+            kept.extend(examples[: max(self.max_examples - len(kept), 0)])
+
+    def reset(self) -> None:
+        """Clears every count and example."""
+        self.counts.clear()
+        self.examples.clear()
+
+    def summary(self) -> str:
+        """One human-readable line listing each category's count."""
+        return "; ".join(
+            f"{count} {_DESCRIPTIONS.get(category, category)}" for category, count in sorted(self.counts.items())
+        )
+
+    def log_summary(self, log: Optional[logging.Logger] = None, context: str = "run") -> None:
+        """Logs one warning summarizing the issues, or nothing when there were none."""
+        if self.counts:
+            (log or logger).warning("Data quality issues in %s: %s.", context, self.summary())
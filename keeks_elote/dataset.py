@@ -0,0 +1,146 @@
+import logging
+import math
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from keeks_elote.backtest import american_to_decimal, matchup_tuple
+from keeks_elote.data_handling import prepare_data
+from keeks_elote.data_quality import DataQualityReport
+from keeks_elote.records import CompiledPeriod, to_records
+from keeks_elote.timeline import GameTimeline
+
+logger = logging.getLogger(__name__)
+
+
+def _decimal_or_nan(american_odds: Any) -> float:
+    if american_odds is None:
+        return math.nan
+    try:
+        return american_to_decimal(american_odds)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _compile_period(period: int, games: List[Any], quality: DataQualityReport) -> CompiledPeriod:
+    records = tuple(to_records(games))
+    matchups = tuple(matchup_tuple(game, quality) for game in records)
+    odds = np.array(
+        [(_decimal_or_nan(game.winner_odds), _decimal_or_nan(game.loser_odds)) for game in records],
+        dtype=np.float64,
+    ).reshape(len(records), 2)
+    odds.flags.writeable = False
+    return CompiledPeriod(period, records, matchups, odds)
+
+
+class CompiledDataset:
+    """Game data validated and converted once, for any number of backtest runs.
+
+    Passing the dict schema to :meth:`~keeks_elote.backtest.Backtest.run_explicit` or
+    :meth:`~keeks_elote.backtest.Backtest.run_and_project` validates it, sorts the
+    periods, builds every game's record and matchup tuple and converts the odds on each
+    run. A compiled dataset does that work up front and holds the result as
+    :class:`~keeks_elote.records.CompiledPeriod` entries in period order: the games as
+    :class:`~keeks_elote.records.GameRecord` tuples, the matchup tuples fed to the arena
+    and a read-only array of each game's decimal odds. Pass it in place of the dict to
+    skip the per-run preprocessing, for instance across a notebook's reruns or a sweep's
+    jobs.
+
+    :attr:`timeline` indexes each competitor's games for "games of X before period t"
+    queries that do not scan every period.
+
+    A dataset cannot be changed once built, so one can be shared by many backtests and
+    threads. Issues found while compiling (games dropped for missing labels, scores that
+    cannot be used) are kept in :attr:`data_quality` and added to each run's
+    :attr:`~keeks_elote.backtest.Backtest.data_quality` report. Invalid odds are still
+    counted by each run, for the games it prices.
+
+    :param data: Game data keyed by period, as for :meth:`~keeks_elote.backtest.Backtest.run_explicit`.
+    :type data: Dict[int, List[Dict[str, Any]]]
+    :param log_data_issues: Also log a warning for every issue found while compiling.
+    :type log_data_issues: bool
+    :raises TypeError: If ``data`` is not a dict or a period does not contain a list.
+    """
+
+    __slots__ = ("_periods", "_positions", "_quality", "_timeline")
+
+    _periods: Tuple[CompiledPeriod, ...]
+    _positions: Mapping[int, int]
+    _quality: DataQualityReport
+    _timeline: Optional[GameTimeline]
+
+    def __init__(self, data: Dict[int, List[Dict[str, Any]]], log_data_issues: bool = False):
+        quality = DataQualityReport(log_events=log_data_issues)
+        data = prepare_data(data, quality=quality)
+        periods = tuple(_compile_period(period, data[period], quality) for period in sorted(data))
+        self._set(periods, quality)
+        logger.info("Compiled %d periods (%d games).", len(periods), sum(len(entry.games) for entry in periods))
+
+    def _set(self, periods: Tuple[CompiledPeriod, ...], quality: DataQualityReport) -> None:
+        positions = MappingProxyType({entry.period: position for position, entry in enumerate(periods)})
+        object.__setattr__(self, "_periods", periods)
+        object.__setattr__(self, "_positions", positions)
+        object.__setattr__(self, "_quality", quality)
+        object.__setattr__(self, "_timeline", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (_restore, (self._periods, self._quality))
+
+    def __len__(self) -> int:
+        return len(self._periods)
+
+    def __iter__(self) -> Iterator[CompiledPeriod]:
+        return iter(self._periods)
+
+    def __contains__(self, period: object) -> bool:
+        return period in self._positions
+
+    def __getitem__(self, period: int) -> CompiledPeriod:
+        return self._periods[self._positions[period]]
+
+    @property
+    def periods(self) -> Tuple[int, ...]:
+        """The period keys, in increasing order."""
+        return tuple(entry.period for entry in self._periods)
+
+    def next_period(self, period: int) -> Optional[int]:
+        """The period after ``period``, or ``None`` for the last one.
+
+        :raises KeyError: If ``period`` is not in the dataset.
+        """
+        position = self._positions[period] + 1
+        return self._periods[position].period if position < len(self._periods) else None
+
+    @property
+    def timeline(self) -> GameTimeline:
+        """Each competitor's games in play order, for as-of queries; built on first use."""
+        timeline = self._timeline
+        if timeline is None:
+            timeline = GameTimeline(self._periods)
+            object.__setattr__(self, "_timeline", timeline)
+        return timeline
+
+    @property
+    def data_quality(self) -> DataQualityReport:
+        """A copy of the issues found while compiling."""
+        report = DataQualityReport(self._quality.max_examples)
+        report.merge(self._quality)
+        return report
+
+    def to_dict(self) -> Dict[int, List[Dict[str, Any]]]:
+        """The validated games in the dict schema, keyed by period."""
+        return {entry.period: [game.to_dict() for game in entry.games] for entry in self._periods}
+
+
+def _restore(periods: Tuple[CompiledPeriod, ...], quality: DataQualityReport) -> CompiledDataset:
+    """Rebuilds an unpickled dataset without compiling it again."""
+    dataset = object.__new__(CompiledDataset)
+    for entry in periods:
+        if entry.decimal_odds is not None:
+            entry.decimal_odds.flags.writeable = False
+    dataset._set(periods, quality)
+    return dataset
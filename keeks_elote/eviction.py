@@ -0,0 +1,370 @@
+import logging
+import pickle
+import sqlite3
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from keeks_elote.branching import group_members
+from keeks_elote.model_evaluation import rating_table
+from keeks_elote.rating_arena import RatingArena
+
+logger = logging.getLogger(__name__)
+
+# How each stored field is decoded: a float, an int held exactly in a float64, or None.
+_FLOAT, _INT, _NONE = 0, 1, 2
+_EXACT_INT = 2**53
+# Packed rows are addressed as row * _MAX_LAYOUTS + layout index.
+_MAX_LAYOUTS = 256
+_KINDS = {float: _FLOAT, int: _INT, type(None): _NONE}
+
+
+def _packable(cls: type) -> bool:
+    """Whether instances of ``cls`` are plain objects whose whole state is their ``__dict__``."""
+    return (
+        # Slots would hold state outside the dict; abc.ABC declares empty ones.
+        not any(vars(base).get("__slots__") for base in cls.__mro__)
+        and getattr(cls, "__getstate__", None) is getattr(object, "__getstate__", None)
+        and getattr(cls, "__setstate__", None) is None
+        and cls.__reduce_ex__ is object.__reduce_ex__
+    )
+
+
+class _Layout:
+    """The packed rows of one competitor class with one set of attributes."""
+
+    def __init__(self, cls: type, fields: Tuple[str, ...]):
+        self.cls = cls
+        self.fields = fields
+        self.values = np.zeros((16, len(fields)), dtype=np.float64)
+        self.kinds = np.zeros((16, len(fields)), dtype=np.int8)
+        self.free: List[int] = []
+        self.used = 0
+
+    def allocate(self) -> int:
+        if self.free:
+            return self.free.pop()
+        if self.used == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.kinds = np.concatenate([self.kinds, np.zeros_like(self.kinds)])
+        self.used += 1
+        return self.used - 1
+
+    def load(self, row: int) -> Any:
+        competitor: Any = object.__new__(self.cls)
+        state = competitor.__dict__
+        for field, value, kind in zip(self.fields, self.values[row].tolist(), self.kinds[row].tolist()):
+            state[field] = value if kind == _FLOAT else (int(value) if kind == _INT else None)
+        self.free.append(row)
+        return competitor
+
+
+class ArrayColdStore:
+    """Keeps evicted competitors in memory, packed into NumPy arrays.
+
+    A plain competitor whose attributes are all floats, ints or ``None`` (as elote's Elo
+    and Glicko competitors are) is stored as one float64 row of a per-class array, plus
+    one byte per field recording how to decode it, so a stored competitor costs its label,
+    one small int and a few bytes per attribute. It is rebuilt exactly as it was. Any
+    other competitor is kept pickled.
+    """
+
+    def __init__(self) -> None:
+        self._layouts: List[_Layout] = []
+        self._layout_index: Dict[Tuple[type, Tuple[str, ...]], int] = {}
+        self._rows: Dict[Any, int] = {}
+        self._pickled: Dict[Any, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pickled)
+
+    def __contains__(self, label: object) -> bool:
+        return label in self._rows or label in self._pickled
+
+    def _pack(self, competitor: Any) -> Optional[Tuple[int, List[Any], List[Optional[int]]]]:
+        """A competitor's layout index, field values and field kinds, or ``None`` if it must be pickled."""
+        state = getattr(competitor, "__dict__", None)
+        if state is None:
+            return None
+        key = (type(competitor), tuple(state))
+        index = self._layout_index.get(key)
+        if index is None:
+            # Layouts of unpackable classes are remembered as -1, so the class is checked once.
+            index = -1
+            if _packable(key[0]) and len(self._layouts) < _MAX_LAYOUTS:
+                index = len(self._layouts)
+                self._layouts.append(_Layout(*key))
+            self._layout_index[key] = index
+        if index < 0:
+            return None
+        values = list(state.values())
+        kinds = [_KINDS.get(type(value)) for value in values]
+        if None in kinds:
+            return None
+        if _INT in kinds and any(abs(value) > _EXACT_INT for value in values if type(value) is int):
+            return None
+        return index, [0.0 if value is None else value for value in values], kinds
+
+    def _discard(self, label: Any) -> None:
+        address = self._rows.pop(label, None)
+        if address is not None:
+            self._layouts[address % _MAX_LAYOUTS].free.append(address // _MAX_LAYOUTS)
+        self._pickled.pop(label, None)
+
+    def put_many(self, competitors: Iterable[Tuple[Any, Any]]) -> None:
+        """Stores ``(label, competitor)`` pairs, replacing any earlier state for a label."""
+        # Rows are gathered per layout and written with one array assignment each.
+        pending: Dict[int, Tuple[List[int], List[List[Any]], List[List[Any]]]] = {}
+        for label, competitor in competitors:
+            self._discard(label)
+            packed = self._pack(competitor)
+            if packed is None:
+                self._pickled[label] = pickle.dumps(competitor, protocol=pickle.HIGHEST_PROTOCOL)
+                continue
+            index, values, kinds = packed
+            rows, row_values, row_kinds = pending.setdefault(index, ([], [], []))
+            row = self._layouts[index].allocate()
+            self._rows[label] = row * _MAX_LAYOUTS + index
+            rows.append(row)
+            row_values.append(values)
+            row_kinds.append(kinds)
+        for index, (rows, row_values, row_kinds) in pending.items():
+            layout = self._layouts[index]
+            layout.values[rows] = row_values
+            layout.kinds[rows] = row_kinds
+
+    def pop(self, label: Any) -> Optional[Any]:
+        """Removes and returns a stored competitor, or ``None`` if ``label`` is not stored."""
+        address = self._rows.pop(label, None)
+        if address is not None:
+            return self._layouts[address % _MAX_LAYOUTS].load(address // _MAX_LAYOUTS)
+        state = self._pickled.pop(label, None)
+        return None if state is None else pickle.loads(state)
+
+    def pop_all(self) -> Iterator[Tuple[Any, Any]]:
+        """Removes and yields every stored ``(label, competitor)`` pair."""
+        for label in list(self._rows) + list(self._pickled):
+            yield label, self.pop(label)
+
+
+class SqliteColdStore:
+    """Keeps evicted competitors on disk in one SQLite file.
+
+    Labels and competitors are pickled, so labels must pickle to the same bytes every
+    time (strings, numbers and tuples of them do). Each eviction sweep is written in one
+    transaction. The file is a scratch store for one run: only open files you trust.
+
+    :param path: The SQLite file, created if missing. ``":memory:"`` keeps it in memory.
+    :type path: Union[str, Path]
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = path
+        self._connection = sqlite3.connect(str(path))
+        self._connection.execute("CREATE TABLE IF NOT EXISTS competitors (label BLOB PRIMARY KEY, state BLOB NOT NULL)")
+        self._connection.commit()
+
+    @staticmethod
+    def _key(label: Any) -> bytes:
+        return pickle.dumps(label, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __len__(self) -> int:
+        return int(self._connection.execute("SELECT COUNT(*) FROM competitors").fetchone()[0])
+
+    def __contains__(self, label: object) -> bool:
+        row = self._connection.execute("SELECT 1 FROM competitors WHERE label = ?", (self._key(label),)).fetchone()
+        return row is not None
+
+    def put_many(self, competitors: Iterable[Tuple[Any, Any]]) -> None:
+        """Stores ``(label, competitor)`` pairs in one transaction, replacing earlier states."""
+        rows = [
+            (self._key(label), pickle.dumps(competitor, protocol=pickle.HIGHEST_PROTOCOL))
+            for label, competitor in competitors
+        ]
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO competitors VALUES (?, ?)", rows)
+
+    def pop(self, label: Any) -> Optional[Any]:
+        """Removes and returns a stored competitor, or ``None`` if ``label`` is not stored."""
+        key = self._key(label)
+        with self._connection:
+            row = self._connection.execute("SELECT state FROM competitors WHERE label = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("DELETE FROM competitors WHERE label = ?", (key,))
+        return pickle.loads(row[0])
+
+    def pop_all(self) -> Iterator[Tuple[Any, Any]]:
+        """Removes and yields every stored ``(label, competitor)`` pair."""
+        with self._connection:
+            rows = self._connection.execute("SELECT label, state FROM competitors").fetchall()
+            self._connection.execute("DELETE FROM competitors")
+        for label, state in rows:
+            yield pickle.loads(label), pickle.loads(state)
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._connection.close()
+
+
+ColdStore = Union[ArrayColdStore, SqliteColdStore]
+
+
+class EvictingArena:
+    """An arena wrapper that moves competitors idle for ``idle_periods`` periods to a cold store.
+
+    Every ``tournament`` or ``rating_period`` call counts as one period, as a
+    ``tournament`` does in :class:`~keeks_elote.backtest.Backtest`. After each,
+    competitors that have not played or been scored in the last ``idle_periods`` periods
+    are removed from the arena's ``competitors`` mapping and written to ``cold_store`` in
+    one batch. A competitor that reappears in a result or in ``expected_score`` is read
+    back before the arena sees it, with exactly the rating it was evicted with, so results are the
+    same as with the bare arena. Memory then follows the active pool rather than everyone
+    ever seen.
+
+    Recency is kept in one insertion-ordered dict of the live competitors, touched
+    competitors moving to its end, so a sweep only looks at the competitors it evicts.
+
+    The arena must keep its competitors in a ``competitors`` mapping, as elote's
+    ``LambdaArena`` does. elote's other mutators (``matchup``, ``rating_period``,
+    ``match_group`` and ``process_history``) rehydrate their competitors too. The wrapper
+    exposes nothing else of the arena, so it cannot be branched and
+    :meth:`~keeks_elote.backtest.Backtest.run_and_project` projects it sequentially. Reach
+    the arena itself through :attr:`arena`: it holds live competitors only, so call
+    :meth:`restore_all` before reading or saving all of them.
+
+    :param arena: The arena to wrap.
+    :type arena: RatingArena
+    :param idle_periods: Periods without a game or a score after which a competitor is evicted.
+    :type idle_periods: int
+    :param cold_store: Where evicted competitors go. Defaults to a :class:`ArrayColdStore`.
+    :type cold_store: Optional[Union[ArrayColdStore, SqliteColdStore]]
+    :raises TypeError: If the arena has no ``competitors`` mapping.
+    :raises ValueError: If ``idle_periods`` is less than 1.
+    """
+
+    def __init__(self, arena: RatingArena, idle_periods: int, cold_store: Optional[ColdStore] = None):
+        competitors = getattr(arena, "competitors", None)
+        if not isinstance(competitors, MutableMapping):
+            raise TypeError(f"EvictingArena needs an arena with a competitors mapping, got {type(arena).__name__}.")
+        if idle_periods < 1:
+            raise ValueError(f"idle_periods must be at least 1, got {idle_periods}")
+        self._arena = arena
+        self.idle_periods = idle_periods
+        self.cold_store: ColdStore = ArrayColdStore() if cold_store is None else cold_store
+        self.period = 0
+        self.evictions = 0
+        self.rehydrations = 0
+        self._competitors: MutableMapping = competitors
+        # Live competitors to the period they were last touched in, least recent first.
+        self._last_seen: Dict[Any, int] = dict.fromkeys(competitors, 0)
+
+    @property
+    def arena(self) -> RatingArena:
+        """The wrapped arena."""
+        return self._arena
+
+    @property
+    def hot_count(self) -> int:
+        """Competitors live in the arena."""
+        return len(self._competitors)
+
+    @property
+    def cold_count(self) -> int:
+        """Competitors held in the cold store."""
+        return len(self.cold_store)
+
+    def _touch(self, label: Any) -> None:
+        if label not in self._competitors and self._last_seen.get(label) is None:
+            competitor = self.cold_store.pop(label)
+            if competitor is not None:
+                self._competitors[label] = competitor
+                self.rehydrations += 1
+        self._last_seen.pop(label, None)
+        self._last_seen[label] = self.period
+
+    def tournament(self, matchups: List[Tuple[Any, ...]]) -> Any:
+        """Rehydrates the matchups' cold competitors, runs the tournament, then evicts idle competitors."""
+        self.period += 1
+        for matchup in matchups:
+            self._touch(matchup[0])
+            self._touch(matchup[1])
+        result = self._arena.tournament(matchups)
+        self._evict()
+        return result
+
+    def rating_period(self, matchups: Sequence[Tuple[Any, ...]], **kwargs: Any) -> Any:
+        """Rehydrates the matchups' cold competitors, runs the rating period, then evicts idle competitors."""
+        self.period += 1
+        for matchup in matchups:
+            self._touch(matchup[0])
+            self._touch(matchup[1])
+        result = self._arena.rating_period(matchups, **kwargs)  # type: ignore[attr-defined]
+        self._evict()
+        return result
+
+    def matchup(self, a: Any, b: Any, *args: Any, **kwargs: Any) -> Any:
+        """Rehydrates both competitors and records one result."""
+        self._touch(a)
+        self._touch(b)
+        return self._arena.matchup(a, b, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def match_group(self, participants: Sequence[Any], *args: Any, **kwargs: Any) -> Any:
+        """Rehydrates every participant and records one N-way bout."""
+        self.rehydrate(group_members(participants))
+        return self._arena.match_group(participants, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def process_history(self, bouts: Sequence[Tuple[Any, ...]], *args: Any, **kwargs: Any) -> Any:
+        """Rehydrates the bouts' competitors and replays them."""
+        for bout in bouts:
+            self._touch(bout[0])
+            self._touch(bout[1])
+        return self._arena.process_history(bouts, *args, **kwargs)  # type: ignore[attr-defined]
+
+    def expected_score(self, competitor: Any, opponent: Any) -> float:
+        self._touch(competitor)
+        self._touch(opponent)
+        return self._arena.expected_score(competitor, opponent)
+
+    def rehydrate(self, labels: Iterable[Any]) -> None:
+        """Brings any cold competitors among ``labels`` back into the arena and marks them active."""
+        for label in labels:
+            self._touch(label)
+
+    def rating_table(self, competitors: Sequence[Any]) -> Optional[Tuple[type, List[Any]]]:
+        """The wrapped arena's competitors for bulk scoring, rehydrating cold ones first.
+
+        :func:`~keeks_elote.model_evaluation.probability_matrix` and
+        :func:`~keeks_elote.model_evaluation.pair_probabilities` score through this.
+        """
+        self.rehydrate(competitors)
+        return rating_table(self._arena, competitors)
+
+    def _evict(self) -> None:
+        cutoff = self.period - self.idle_periods
+        evicted: List[Tuple[Any, Any]] = []
+        for label, seen in self._last_seen.items():
+            if seen > cutoff:
+                break
+            evicted.append((label, self._competitors.get(label)))
+        for label, _ in evicted:
+            del self._last_seen[label]
+            self._competitors.pop(label, None)
+        # Labels that were only scored, never rated, have nothing to store.
+        evicted = [(label, competitor) for label, competitor in evicted if competitor is not None]
+        if evicted:
+            self.cold_store.put_many(evicted)
+            self.evictions += len(evicted)
+            logger.debug("Evicted %d idle competitors after period %d.", len(evicted), self.period)
+
+    def restore_all(self) -> int:
+        """Moves every cold competitor back into the arena and returns how many there were."""
+        restored = 0
+        for label, competitor in self.cold_store.pop_all():
+            self._competitors[label] = competitor
+            self._last_seen[label] = self.period
+            restored += 1
+        self.rehydrations += restored
+        return restored
@@ -0,0 +1,243 @@
+import csv
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from keeks_elote.backtest import american_to_decimal
+from keeks_elote.model_evaluation import pair_probabilities, rating_table
+from keeks_elote.observers import BacktestObserver
+from keeks_elote.projections import PathOrFile, open_for_writing
+from keeks_elote.rating_arena import RatingArena
+from keeks_elote.records import GameRecord
+
+logger = logging.getLogger(__name__)
+
+# Version of the .npz feature layout written by FeatureExporter.write_npz.
+_NPZ_VERSION = 1
+
+
+def _ratings(arena: RatingArena, labels: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Current ratings and rating deviations for ``labels``, NaN where the arena does not expose them."""
+    bulk = rating_table(arena, labels) if labels else None
+    if bulk is None:
+        missing = np.full(len(labels), np.nan)
+        return missing, missing.copy()
+    _, table = bulk
+    ratings = np.array([entry.rating for entry in table], dtype=np.float64)
+    rd = np.array([getattr(entry, "rd", math.nan) for entry in table], dtype=np.float64)
+    return ratings, rd
+
+
+def _implied_probability(game: GameRecord) -> float:
+    """The market's probability for the game's first-listed side, with the overround removed."""
+    try:
+        winner, loser = 1.0 / american_to_decimal(game.winner_odds), 1.0 / american_to_decimal(game.loser_odds)
+    except (TypeError, ValueError):
+        return math.nan
+    return winner / (winner + loser)
+
+
+class FeatureExporter(BacktestObserver):
+    """Captures point-in-time rating features for every game during a single backtest pass.
+
+    Register it on a :class:`~keeks_elote.backtest.Backtest` running over ``arena``, then
+    call :meth:`~keeks_elote.backtest.Backtest.run_and_project` (or any other run)::
+
+        exporter = FeatureExporter(arena)
+        Backtest(arena, observers=[exporter]).run_and_project(data)
+        exporter.write_npz("features.npz")
+
+    Each period's features are computed when the period starts, before its results reach
+    the arena, so every row uses only results from earlier periods. A row orders the
+    two sides by label rather than by result, so ``competitor`` is not always the winner;
+    ``won`` is the target. Each period is scored in one vectorized pass and stored as
+    column arrays.
+
+    Columns:
+
+    * ``period``, ``competitor``, ``opponent`` and ``won`` (1 if ``competitor`` won).
+    * ``competitor_rating``, ``opponent_rating``, ``competitor_rd`` and ``opponent_rd``:
+      the pre-game ratings and rating deviations. They are read from elote Elo or Glicko
+      competitors and are NaN for other arenas, and ``rd`` is NaN for Elo.
+    * ``expected_score``: ``arena.expected_score(competitor, opponent)``.
+    * ``competitor_delta_<k>`` and ``opponent_delta_<k>`` for each ``k`` in
+      ``delta_periods``: the pre-game rating minus the rating before period ``period - k``.
+    * ``implied_probability``: ``competitor``'s chance from the game's moneylines, with
+      the overround removed, or NaN without two valid lines.
+
+    Only the ratings needed for the deltas are kept: each competitor's rating after each
+    period it played within the last ``max(delta_periods)`` periods.
+
+    :param arena: The arena the backtest rates with. Pass the arena itself, not a branch of it.
+    :type arena: RatingArena
+    :param delta_periods: The look-backs, in periods, for the rating-change features.
+    :type delta_periods: Sequence[int]
+    """
+
+    def __init__(self, arena: RatingArena, delta_periods: Sequence[int] = (1, 4)):
+        if any(k < 1 for k in delta_periods):
+            raise ValueError(f"delta_periods must be positive, got {list(delta_periods)}")
+        self.arena = arena
+        self.delta_periods = tuple(delta_periods)
+        self._horizon = max(self.delta_periods, default=0)
+        # Each competitor's rating after each recent period it played, oldest first. The first
+        # entry, at period -inf, is its rating when first seen.
+        self._history: Dict[Any, List[Tuple[float, float]]] = {}
+        self._chunks: Dict[str, List[np.ndarray]] = {field: [] for field in self.fields}
+
+    @property
+    def fields(self) -> List[str]:
+        """The exported columns, in order."""
+        deltas = [f"{side}_delta_{k}" for k in self.delta_periods for side in ("competitor", "opponent")]
+        return [
+            "period",
+            "competitor",
+            "opponent",
+            "won",
+            "competitor_rating",
+            "opponent_rating",
+            "competitor_rd",
+            "opponent_rd",
+            "expected_score",
+            *deltas,
+            "implied_probability",
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks["period"])
+
+    def _rating_before(self, label: Any, period: float, current: float) -> float:
+        entries = self._history.get(label)
+        if not entries:
+            return current
+        for entry_period, rating in reversed(entries):
+            if entry_period < period:
+                return rating
+        return math.nan
+
+    def on_period_start(self, period: int, games: Sequence[GameRecord]) -> None:
+        games = [game for game in games if game.winner is not None and game.loser is not None]
+        if not games:
+            return
+        # Sides are ordered by label, so the column a team lands in says nothing about the result.
+        flipped = [str(game.loser) < str(game.winner) for game in games]
+        pairs = [(g.loser, g.winner) if flip else (g.winner, g.loser) for g, flip in zip(games, flipped)]
+        positions: Dict[Any, int] = {}
+        for pair in pairs:
+            for label in pair:
+                positions.setdefault(label, len(positions))
+        labels = list(positions)
+        ratings, rd = _ratings(self.arena, labels)
+        for label, rating in zip(labels, ratings.tolist()):
+            if label not in self._history and not math.isnan(rating):
+                self._history[label] = [(-math.inf, rating)]
+
+        rows = np.array([positions[a] for a, _ in pairs], dtype=np.intp)
+        cols = np.array([positions[b] for _, b in pairs], dtype=np.intp)
+        implied = np.array([_implied_probability(game) for game in games], dtype=np.float64)
+        flips = np.array(flipped, dtype=bool)
+        columns: Dict[str, Any] = {
+            "period": np.full(len(games), period, dtype=np.int64),
+            "competitor": [a for a, _ in pairs],
+            "opponent": [b for _, b in pairs],
+            "won": (~flips).astype(np.int8),
+            "competitor_rating": ratings[rows],
+            "opponent_rating": ratings[cols],
+            "competitor_rd": rd[rows],
+            "opponent_rd": rd[cols],
+            "expected_score": pair_probabilities(self.arena, pairs),
+            "implied_probability": np.where(flips, 1.0 - implied, implied),
+        }
+        for k in self.delta_periods:
+            before = np.array(
+                [self._rating_before(label, period - k, rating) for label, rating in zip(labels, ratings.tolist())],
+                dtype=np.float64,
+            )
+            delta = ratings - before
+            columns[f"competitor_delta_{k}"] = delta[rows]
+            columns[f"opponent_delta_{k}"] = delta[cols]
+        for field, values in columns.items():
+            self._chunks[field].append(np.asarray(values) if not isinstance(values, list) else _labels(values))
+
+    def on_ratings_updated(self, period: int, arena: RatingArena, matchups: Sequence[Tuple[Any, ...]]) -> None:
+        if not self._horizon or not matchups:
+            return
+        labels = list(dict.fromkeys(label for matchup in matchups for label in matchup[:2]))
+        ratings, _ = _ratings(arena, labels)
+        # Later games only look back to period (period + 1 - horizon); keep the last entry before that.
+        oldest = period + 1 - self._horizon
+        for label, rating in zip(labels, ratings.tolist()):
+            if math.isnan(rating):
+                continue
+            entries = self._history.setdefault(label, [(-math.inf, rating)])
+            entries.append((period, rating))
+            while len(entries) > 1 and entries[1][0] < oldest:
+                entries.pop(0)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The features as one array per column; labels become strings unless they are all numbers.
+
+        :return: The columns named in :attr:`fields`.
+        :rtype: Dict[str, np.ndarray]
+        """
+        arrays = {}
+        for field, chunks in self._chunks.items():
+            if not chunks:
+                arrays[field] = np.zeros(0, dtype=np.int64 if field in ("period", "won") else np.float64)
+                continue
+            column = np.concatenate(chunks)
+            arrays[field] = column.astype(str) if column.dtype == object else column
+        return arrays
+
+    def write_npz(self, path: Union[str, Path]) -> None:
+        """Writes the features to a compressed ``.npz`` file of columns, readable with :func:`load_features`."""
+        arrays = {"version": np.asarray(_NPZ_VERSION, dtype=np.int64), **self.to_arrays()}
+        with open(path, "wb") as handle:
+            np.savez_compressed(handle, **arrays)  # type: ignore[arg-type]
+        logger.info("Wrote %d feature rows to %s.", len(self), path)
+
+    def write_csv(self, target: PathOrFile) -> None:
+        """Writes the features as CSV with a header row.
+
+        :param target: A path, or an open text file (left open).
+        :type target: Union[str, Path, IO[str]]
+        """
+        arrays = self.to_arrays()
+        handle, owned = open_for_writing(target)
+        try:
+            writer = csv.writer(handle)
+            writer.writerow(self.fields)
+            writer.writerows(zip(*(arrays[field].tolist() for field in self.fields)))
+        finally:
+            if owned:
+                handle.close()
+            else:
+                handle.flush()
+
+
+def _labels(values: List[Any]) -> np.ndarray:
+    """Labels as an array, kept numeric when they all are and as objects otherwise."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iuf":
+        return array
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def load_features(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Reads features written by :meth:`FeatureExporter.write_npz`.
+
+    :param path: The ``.npz`` file.
+    :type path: Union[str, Path]
+    :return: The feature columns.
+    :rtype: Dict[str, np.ndarray]
+    :raises ValueError: If the file is not a feature file this version can read.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "version" not in archive.files or int(archive["version"]) != _NPZ_VERSION:
+            raise ValueError(f"{path} is not a version {_NPZ_VERSION} feature file.")
+        return {field: archive[field] for field in archive.files if field != "version"}
@@ -0,0 +1,195 @@
+import logging
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from keeks_elote.loaders import PeriodKey, normalize_game, parse_moneyline
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_team(name: Any) -> str:
+    """Folds a team name to a join key: case-folded, punctuation dropped, whitespace collapsed.
+
+    ``"St. John's"``, ``"st johns"`` and ``"ST JOHNS "`` all become ``"st johns"``.
+    """
+    return " ".join(_PUNCTUATION.sub("", str(name).casefold()).split())
+
+
+class _Normalizer:
+    """Memoized :func:`normalize_team` with aliases, since every name repeats across seasons."""
+
+    def __init__(self, aliases: Optional[Dict[str, str]]):
+        self._aliases = {normalize_team(alias): normalize_team(name) for alias, name in (aliases or {}).items()}
+        self._cache: Dict[Any, str] = {}
+
+    def __call__(self, name: Any) -> str:
+        key = self._cache.get(name)
+        if key is None:
+            key = normalize_team(name)
+            key = self._cache[name] = self._aliases.get(key, key)
+        return key
+
+
+class JoinResult(NamedTuple):
+    """The outcome of :func:`join_feeds`.
+
+    ``games`` holds every distinct result in the backtest schema, with ``winner_odds``
+    and ``loser_odds`` set where a line matched. Results without a line are kept, to be
+    rated but not bet, and are also listed in ``unmatched_results``. Lines that match no
+    result are in ``unmatched_odds``. ``conflicting_results`` pairs each dropped result
+    with the earlier result for the same game that it contradicts (a different winner).
+    The counts are of rows dropped as exact duplicates of an earlier game or line, and
+    of lines dropped because a moneyline could not be parsed.
+    """
+
+    games: List[Dict[str, Any]]
+    unmatched_results: List[Dict[str, Any]]
+    unmatched_odds: List[Dict[str, Any]]
+    conflicting_results: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    duplicate_results: int
+    duplicate_odds: int
+    invalid_odds: int
+
+    def periods(self, period_key: PeriodKey = "period") -> Dict[int, List[Dict[str, Any]]]:
+        """The joined games grouped into the ``{period: games}`` schema :func:`prepare_data` expects.
+
+        :param period_key: A game field holding the period, or a function computing it, such
+                           as :func:`~keeks_elote.loaders.weekly_periods`.
+        :type period_key: Union[str, Callable[[Dict[str, Any]], int]]
+        :return: The games keyed by period, each period in join order.
+        :rtype: Dict[int, List[Dict[str, Any]]]
+        """
+        key_of = period_key if callable(period_key) else (lambda game: int(game[period_key]))  # type: ignore[index]
+        grouped: Dict[int, List[Dict[str, Any]]] = {}
+        for game in self.games:
+            grouped.setdefault(key_of(game), []).append(game)
+        return grouped
+
+
+def _index_odds(
+    odds: Iterable[Dict[str, Any]],
+    game_key: Callable[[Any, Any, Any], Hashable],
+    normalize: _Normalizer,
+    date_field: str,
+    team_fields: Tuple[str, str],
+    moneyline_fields: Tuple[str, str],
+) -> Tuple[Dict[Hashable, Tuple[Dict[str, Any], Dict[str, Any]]], int, int]:
+    """Hashes each valid line by game, keeping the first line seen for each game."""
+    index: Dict[Hashable, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+    duplicates = invalid = 0
+    for row in odds:
+        first_ml, second_ml = (
+            parse_moneyline(row.get(moneyline_fields[0])),
+            parse_moneyline(row.get(moneyline_fields[1])),
+        )
+        if first_ml is None or second_ml is None:
+            invalid += 1
+            continue
+        first, second = row[team_fields[0]], row[team_fields[1]]
+        key = game_key(row[date_field], first, second)
+        if key in index:
+            duplicates += 1
+            continue
+        index[key] = (row, {normalize(first): first_ml, normalize(second): second_ml})
+    return index, duplicates, invalid
+
+
+def join_feeds(
+    results: Iterable[Dict[str, Any]],
+    odds: Iterable[Dict[str, Any]],
+    date_field: str = "date",
+    odds_date_field: Optional[str] = None,
+    team_fields: Tuple[str, str] = ("home_team", "away_team"),
+    moneyline_fields: Tuple[str, str] = ("home_ml", "away_ml"),
+    aliases: Optional[Dict[str, str]] = None,
+    date_key: Callable[[Any], Hashable] = str,
+) -> JoinResult:
+    """Attaches moneylines from an odds feed to the games of a results feed.
+
+    Each game is keyed by its date and its two normalized team names (see
+    :func:`normalize_team`), in either order. The odds are hashed by that key in one pass,
+    then each result is looked up in constant time, so a join is O(n + m) rather than
+    comparing every result with every line.
+
+    Either feed may concatenate several providers (``itertools.chain`` them in priority
+    order). The first row for a game wins: later results for the same game are dropped as
+    duplicates, or reported as conflicts when they name a different winner, and later
+    lines for it are dropped as duplicates. Lines whose moneylines cannot be parsed are
+    skipped, so a lower-priority provider's valid line can fill in for them. Two games
+    between the same teams on the same date are treated as one.
+
+    Result rows are copied and passed through
+    :func:`~keeks_elote.loaders.normalize_game`, so a ``"28-14"`` ``score`` field
+    becomes ``winner_score`` and ``loser_score``.
+
+    :param results: Result rows with ``winner``, ``loser`` and the date field.
+    :type results: Iterable[Dict[str, Any]]
+    :param odds: Line rows with the date, two team fields and their two moneyline fields.
+    :type odds: Iterable[Dict[str, Any]]
+    :param date_field: The results' date field.
+    :type date_field: str
+    :param odds_date_field: The lines' date field. Defaults to ``date_field``.
+    :type odds_date_field: Optional[str]
+    :param team_fields: The lines' two team fields.
+    :type team_fields: Tuple[str, str]
+    :param moneyline_fields: The lines' American moneylines for those two teams, in order.
+    :type moneyline_fields: Tuple[str, str]
+    :param aliases: Alternative team names mapped to the name to use, e.g. ``{"Ole Miss": "Mississippi"}``.
+    :type aliases: Optional[Dict[str, str]]
+    :param date_key: Maps a date value from either feed to a comparable key. Defaults to ``str``.
+    :type date_key: Callable[[Any], Hashable]
+    :return: The joined games and what could not be joined.
+    :rtype: JoinResult
+    """
+    normalize = _Normalizer(aliases)
+
+    def game_key(date: Any, team: Any, other: Any) -> Hashable:
+        first, second = normalize(team), normalize(other)
+        return (date_key(date), first, second) if first <= second else (date_key(date), second, first)
+
+    index, duplicate_odds, invalid_odds = _index_odds(
+        odds, game_key, normalize, odds_date_field or date_field, team_fields, moneyline_fields
+    )
+    seen: Dict[Hashable, Dict[str, Any]] = {}
+    matched: Set[Hashable] = set()
+    games: List[Dict[str, Any]] = []
+    unmatched_results: List[Dict[str, Any]] = []
+    conflicts: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    duplicate_results = 0
+    for row in results:
+        key = game_key(row[date_field], row["winner"], row["loser"])
+        earlier = seen.get(key)
+        if earlier is not None:
+            if normalize(earlier["winner"]) == normalize(row["winner"]):
+                duplicate_results += 1
+            else:
+                conflicts.append((row, earlier))
+            continue
+        game = seen[key] = normalize_game(dict(row))
+        games.append(game)
+        line = index.get(key)
+        if line is None:
+            unmatched_results.append(game)
+            continue
+        matched.add(key)
+        moneylines = line[1]
+        game["winner_odds"] = moneylines[normalize(row["winner"])]
+        game["loser_odds"] = moneylines[normalize(row["loser"])]
+
+    unmatched_odds = [row for key, (row, _) in index.items() if key not in matched]
+    logger.info(
+        "Joined %d of %d games to odds; %d lines unmatched, %d duplicate results, %d conflicting, "
+        "%d duplicate and %d invalid lines.",
+        len(matched),
+        len(games),
+        len(unmatched_odds),
+        duplicate_results,
+        len(conflicts),
+        duplicate_odds,
+        invalid_odds,
+    )
+    return JoinResult(
+        games, unmatched_results, unmatched_odds, conflicts, duplicate_results, duplicate_odds, invalid_odds
+    )
@@ -0,0 +1,152 @@
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keeks_elote.model_evaluation import probability_matrix
+from keeks_elote.rating_arena import RatingArena
+
+logger = logging.getLogger(__name__)
+
+
+class LeagueMatrix:
+    """Full-league win probabilities from an arena, computed in bulk and cached.
+
+    :meth:`matrix` builds the pairwise matrix with
+    :func:`~keeks_elote.model_evaluation.probability_matrix` (one vectorized expression for
+    elote Elo and Glicko ratings) and keeps it until the ratings change. The cache is
+    dropped whenever :meth:`tournament` is called, so the wrapper can stand in for the
+    arena anywhere a :class:`~keeks_elote.rating_arena.RatingArena` is expected, such as
+    :class:`~keeks_elote.backtest.Backtest`. Tournaments run on the wrapped arena directly
+    are noticed through its history where it keeps one; otherwise call
+    :meth:`invalidate`.
+
+    A matrix is cached per competitor ordering requested, keeping the ``max_cached`` most
+    recently used, and every cached matrix is dropped once the ratings change.
+
+    :param arena: The arena holding the ratings.
+    :type arena: RatingArena
+    :param max_cached: How many competitor orderings to keep matrices for.
+    :type max_cached: int
+    """
+
+    def __init__(self, arena: RatingArena, max_cached: int = 8):
+        if max_cached < 1:
+            raise ValueError(f"max_cached must be at least 1, got {max_cached!r}")
+        self.arena = arena
+        self.max_cached = max_cached
+        # Insertion order doubles as recency order: a hit is moved to the end.
+        self._cache: Dict[Tuple[Hashable, ...], Tuple[np.ndarray, Dict[Any, int]]] = {}
+        self._token: Any = None
+
+    def tournament(self, matchups: List[Tuple[Any, ...]]) -> Any:
+        """Runs the tournament on the arena and drops every cached matrix."""
+        self.invalidate()
+        return self.arena.tournament(matchups)
+
+    def expected_score(self, competitor: Any, opponent: Any) -> float:
+        return self.arena.expected_score(competitor, opponent)
+
+    def invalidate(self) -> None:
+        """Drops every cached matrix."""
+        self._cache.clear()
+
+    def _state_token(self) -> Any:
+        history = getattr(self.arena, "history", None)
+        bouts = getattr(history, "bouts", None)
+        return (id(history), len(bouts)) if bouts is not None else None
+
+    def competitors(self) -> List[Any]:
+        """Every competitor the arena holds, in its own order (empty if it does not expose them).
+
+        Competitors come from the arena's ``competitors`` mapping or, for the batch arenas,
+        its ``ratings()``.
+        """
+        competitors = getattr(self.arena, "competitors", None)
+        if competitors is None and callable(getattr(self.arena, "ratings", None)):
+            competitors = self.arena.ratings()  # type: ignore[attr-defined]
+        return list(competitors or ())
+
+    def _entry(self, competitors: Optional[Sequence[Any]]) -> Tuple[np.ndarray, Dict[Any, int], Tuple[Any, ...]]:
+        labels = tuple(self.competitors() if competitors is None else competitors)
+        token = self._state_token()
+        if token != self._token:
+            self._cache.clear()
+            self._token = token
+        cached = self._cache.pop(labels, None)
+        if cached is None:
+            logger.debug("Building the %d x %d probability matrix.", len(labels), len(labels))
+            matrix = probability_matrix(self.arena, labels)
+            matrix.flags.writeable = False
+            cached = (matrix, {label: i for i, label in enumerate(labels)})
+            if len(self._cache) >= self.max_cached:
+                del self._cache[next(iter(self._cache))]
+        self._cache[labels] = cached
+        return cached[0], cached[1], labels
+
+    def matrix(self, competitors: Optional[Sequence[Any]] = None) -> np.ndarray:
+        """The read-only pairwise matrix: ``[i, j]`` is the probability ``i`` beats ``j``.
+
+        :param competitors: Row/column order. Defaults to every competitor in the arena.
+        :type competitors: Optional[Sequence[Any]]
+        :return: An ``(N, N)`` array with 0.5 on the diagonal.
+        :rtype: np.ndarray
+        """
+        return self._entry(competitors)[0]
+
+    def probability(self, competitor: Any, opponent: Any, competitors: Optional[Sequence[Any]] = None) -> float:
+        """The cached probability that ``competitor`` beats ``opponent``."""
+        matrix, index, _ = self._entry(competitors)
+        return float(matrix[index[competitor], index[opponent]])
+
+    def strength(self, competitors: Optional[Sequence[Any]] = None) -> Dict[Any, float]:
+        """Each competitor's average win probability against the rest of the field."""
+        matrix, _, labels = self._entry(competitors)
+        if len(labels) < 2:
+            return dict.fromkeys(labels, 0.5)
+        scores = (matrix.sum(axis=1) - 0.5) / (len(labels) - 1)
+        return dict(zip(labels, scores.tolist()))
+
+    def top_k(self, k: int, competitors: Optional[Sequence[Any]] = None) -> List[Tuple[Any, float]]:
+        """The ``k`` strongest competitors by :meth:`strength`, strongest first.
+
+        :param k: How many to return.
+        :type k: int
+        :param competitors: The field. Defaults to every competitor in the arena.
+        :type competitors: Optional[Sequence[Any]]
+        :return: ``(competitor, strength)`` pairs.
+        :rtype: List[Tuple[Any, float]]
+        """
+        strengths = self.strength(competitors)
+        labels = list(strengths)
+        scores = np.fromiter(strengths.values(), dtype=np.float64, count=len(labels))
+        return [(labels[i], float(scores[i])) for i in _largest(scores, k)]
+
+    def strongest_opponents(
+        self, competitor: Any, k: int, competitors: Optional[Sequence[Any]] = None
+    ) -> List[Tuple[Any, float]]:
+        """The ``k`` opponents most likely to beat ``competitor``, most dangerous first.
+
+        :param competitor: The competitor to find opponents for.
+        :type competitor: Any
+        :param k: How many to return.
+        :type k: int
+        :param competitors: The field. Defaults to every competitor in the arena.
+        :type competitors: Optional[Sequence[Any]]
+        :return: ``(opponent, probability the opponent wins)`` pairs.
+        :rtype: List[Tuple[Any, float]]
+        """
+        matrix, index, labels = self._entry(competitors)
+        row = index[competitor]
+        threat = matrix[:, row].copy()
+        threat[row] = -np.inf
+        return [(labels[i], float(threat[i])) for i in _largest(threat, min(k, len(labels) - 1))]
+
+
+def _largest(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, largest first, via a partial sort."""
+    k = max(min(k, scores.shape[0]), 0)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
@@ -0,0 +1,262 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import logging
+import math
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PathOrFile = Union[str, Path, IO[str]]
+PeriodKey = Union[str, Callable[[Dict[str, Any]], int]]
+
+# CSV cells are always strings; these columns are converted to numbers on the way in.
+_NUMERIC_COLUMNS = ("winner_odds", "loser_odds", "winner_score", "loser_score")
+
+
+def _as_number(value: Any) -> Optional[Union[int, float]]:
+    """A finite number from a number or numeric string, as an int when it is whole."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def parse_moneyline(value: Any) -> Optional[Union[int, float]]:
+    """Parses an American moneyline such as ``"+121"``, ``"-149"`` or ``150``.
+
+    :return: The moneyline as a number, or ``None`` when it is missing, non-numeric,
+             non-finite or zero.
+    :rtype: Optional[Union[int, float]]
+    """
+    number = _as_number(value)
+    return None if number == 0 else number
+
+
+def parse_score(value: Any) -> Optional[Tuple[Union[int, float], Union[int, float]]]:
+    """Parses a ``"28-14"`` style score into its two numbers, winner first.
+
+    :return: The two scores, or ``None`` when the value is not two numbers joined by a dash.
+    :rtype: Optional[Tuple[Union[int, float], Union[int, float]]]
+    """
+    if not isinstance(value, str):
+        return None
+    left, sep, right = value.strip().partition("-")
+    if not sep:
+        return None
+    first, second = _as_number(left), _as_number(right)
+    if first is None or second is None:
+        return None
+    return (first, second)
+
+
+def normalize_game(
+    game: Dict[str, Any],
+    moneyline_fields: Tuple[str, str] = ("winner_ml", "loser_ml"),
+    score_field: Optional[str] = "score",
+) -> Dict[str, Any]:
+    """Normalizes one raw game record in place into the backtest schema.
+
+    * When either moneyline field is present, both are parsed into ``winner_odds`` and
+      ``loser_odds`` (American odds). If either fails to parse, both odds are removed, so
+      a game is never priced on one side only.
+    * A ``score_field`` value such as ``"28-14"`` becomes ``winner_score`` and
+      ``loser_score`` unless those are already set. Unparseable scores are left out.
+
+    The record is modified and returned rather than copied, since the loaders build a
+    fresh dict per row anyway.
+
+    :param game: A raw game record.
+    :type game: Dict[str, Any]
+    :param moneyline_fields: The winner and loser moneyline fields.
+    :type moneyline_fields: Tuple[str, str]
+    :param score_field: The combined score field, or ``None`` to skip score parsing.
+    :type score_field: Optional[str]
+    :return: The same record, normalized.
+    :rtype: Dict[str, Any]
+    """
+    winner_ml_field, loser_ml_field = moneyline_fields
+    if winner_ml_field in game or loser_ml_field in game:
+        winner_odds = parse_moneyline(game.get(winner_ml_field))
+        loser_odds = parse_moneyline(game.get(loser_ml_field))
+        if winner_odds is None or loser_odds is None:
+            game.pop("winner_odds", None)
+            game.pop("loser_odds", None)
+        else:
+            game["winner_odds"] = winner_odds
+            game["loser_odds"] = loser_odds
+
+    if score_field is not None and "winner_score" not in game and "loser_score" not in game:
+        scores = parse_score(game.get(score_field))
+        if scores is not None:
+            game["winner_score"], game["loser_score"] = scores
+    return game
+
+
+def _open_text(source: PathOrFile) -> Tuple[IO[str], bool]:
+    """Opens a path (transparently gunzipping ``.gz``) or passes an open file through."""
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix == ".gz":
+            return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline=""), True
+        return open(path, "r", encoding="utf-8", newline=""), True
+    return source, False
+
+
+def iter_ndjson_games(source: PathOrFile, **normalize_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Streams games from a newline-delimited JSON file, one line at a time.
+
+    Blank lines are skipped. Each record is passed through :func:`normalize_game`.
+
+    :param source: A path (``.gz`` is decompressed on the fly) or an open text file.
+    :type source: Union[str, Path, IO[str]]
+    :return: An iterator of normalized game dicts.
+    :rtype: Iterator[Dict[str, Any]]
+    :raises ValueError: If a line is not valid JSON or not a JSON object.
+    """
+    handle, owned = _open_text(source)
+    try:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                game = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Line {line_no} is not valid JSON: {exc}") from exc
+            if not isinstance(game, dict):
+                raise ValueError(f"Line {line_no} holds a {type(game).__name__}, expected a JSON object.")
+            yield normalize_game(game, **normalize_kwargs)
+    finally:
+        if owned:
+            handle.close()
+
+
+def iter_csv_games(source: PathOrFile, delimiter: str = ",", **normalize_kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Streams games from a CSV file with a header row, one row at a time.
+
+    Empty cells are dropped rather than kept as empty strings, and the odds and score
+    columns are converted to numbers. Each record is then passed through
+    :func:`normalize_game`.
+
+    :param source: A path (``.gz`` is decompressed on the fly) or an open text file.
+    :type source: Union[str, Path, IO[str]]
+    :param delimiter: The field delimiter. Defaults to a comma.
+    :type delimiter: str
+    :return: An iterator of normalized game dicts.
+    :rtype: Iterator[Dict[str, Any]]
+    """
+    handle, owned = _open_text(source)
+    try:
+        for row in csv.DictReader(handle, delimiter=delimiter):
+            game: Dict[str, Any] = {key: value for key, value in row.items() if key is not None and value != ""}
+            for column in _NUMERIC_COLUMNS:
+                if column in game:
+                    number = _as_number(game[column])
+                    if number is None:
+                        del game[column]
+                    else:
+                        game[column] = number
+            yield normalize_game(game, **normalize_kwargs)
+    finally:
+        if owned:
+            handle.close()
+
+
+def weekly_periods(
+    season_start: Union[datetime.date, datetime.datetime],
+    date_field: str = "date",
+    date_format: str = "%Y%m%d",
+) -> Callable[[Dict[str, Any]], int]:
+    """Builds a period key that numbers seven-day weeks after ``season_start``.
+
+    Week 1 covers the seven days after ``season_start`` (the start day itself belongs to
+    week 0), matching how ``examples/cfb.py`` batches its games.
+
+    :param season_start: The day before week 1 begins.
+    :type season_start: Union[datetime.date, datetime.datetime]
+    :param date_field: The game field holding the date.
+    :type date_field: str
+    :param date_format: The ``strptime`` format of that field.
+    :type date_format: str
+    :return: A function mapping a game to its week number.
+    :rtype: Callable[[Dict[str, Any]], int]
+    """
+    start = season_start.date() if isinstance(season_start, datetime.datetime) else season_start
+
+    def period_of(game: Dict[str, Any]) -> int:
+        played = datetime.datetime.strptime(str(game[date_field]), date_format).date()
+        return ((played - start).days - 1) // 7 + 1
+
+    return period_of
+
+
+def iter_periods(
+    games: Iterable[Dict[str, Any]], period_key: PeriodKey = "period"
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Groups a stream of games into ``(period, games)`` pairs in period order.
+
+    Only one period is held at a time, so the input must already be ordered by period
+    (a date-ordered archive is). A game whose period is earlier than one already emitted
+    is an error rather than being silently dropped or buffered.
+
+    :param games: Games in period order, for example from :func:`iter_ndjson_games`.
+    :type games: Iterable[Dict[str, Any]]
+    :param period_key: The game field holding the period, or a function computing it.
+    :type period_key: Union[str, Callable[[Dict[str, Any]], int]]
+    :return: An iterator of ``(period, games)`` pairs with strictly increasing periods.
+    :rtype: Iterator[Tuple[int, List[Dict[str, Any]]]]
+    :raises ValueError: If the games are not ordered by period.
+    """
+    key_of = period_key if callable(period_key) else (lambda game: int(game[period_key]))  # type: ignore[index]
+    current: Optional[int] = None
+    bucket: List[Dict[str, Any]] = []
+    for game in games:
+        period = key_of(game)
+        if current is not None and period < current:
+            raise ValueError(f"Games are not in period order: period {period} follows period {current}.")
+        if period != current:
+            if current is not None:
+                yield current, bucket
+            current, bucket = period, []
+        bucket.append(game)
+    if current is not None:
+        yield current, bucket
+
+
+def stream_periods(
+    source: PathOrFile,
+    period_key: PeriodKey = "period",
+    file_format: Optional[str] = None,
+    **normalize_kwargs: Any,
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """Streams a game file as ``(period, games)`` pairs for :meth:`Backtest.run_streaming`.
+
+    :param source: A path or an open text file.
+    :type source: Union[str, Path, IO[str]]
+    :param period_key: As for :func:`iter_periods`.
+    :type period_key: Union[str, Callable[[Dict[str, Any]], int]]
+    :param file_format: ``"ndjson"`` or ``"csv"``. Inferred from the file suffix when omitted
+                        (``.ndjson``/``.jsonl`` or ``.csv``, optionally followed by ``.gz``).
+    :type file_format: Optional[str]
+    :return: An iterator of ``(period, games)`` pairs.
+    :rtype: Iterator[Tuple[int, List[Dict[str, Any]]]]
+    :raises ValueError: If the format cannot be inferred or is unknown.
+    """
+    if file_format is None:
+        suffixes = [s for s in Path(str(getattr(source, "name", source))).suffixes if s != ".gz"]
+        file_format = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}.get(suffixes[-1] if suffixes else "")
+    if file_format == "ndjson":
+        games = iter_ndjson_games(source, **normalize_kwargs)
+    elif file_format == "csv":
+        games = iter_csv_games(source, **normalize_kwargs)
+    else:
+        raise ValueError(f"Cannot stream games from {source!r}: pass file_format='ndjson' or 'csv'.")
+    return iter_periods(games, period_key)
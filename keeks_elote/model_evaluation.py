@@ -1,12 +1,18 @@
+import functools
 import logging
-from typing import Any, Dict
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+
+from keeks_elote.branching import ArenaBranch
 from keeks_elote.rating_arena import RatingArena
+from keeks_elote.records import GameRecord
 
 logger = logging.getLogger(__name__)
 
 
-def calculate_probabilities(arena: RatingArena, game: Dict[str, Any]) -> float:
+def calculate_probabilities(arena: RatingArena, game: Union[Dict[str, Any], GameRecord]) -> float:
     """Calculates the win probability for the 'winner' in a given game using the arena.
 
     This function retrieves the expected score (win probability) of the competitor
@@ -16,14 +22,160 @@ def calculate_probabilities(arena: RatingArena, game: Dict[str, Any]) -> float:
     :param arena: The elote Arena instance containing competitor ratings.
     :type arena: RatingArena
     :param game: A dictionary representing the game, must contain 'winner' and 'loser' keys.
-    :type game: Dict[str, Any]
+                 A :class:`~keeks_elote.records.GameRecord` is accepted as well.
+    :type game: Union[Dict[str, Any], GameRecord]
     :return: The calculated win probability for the competitor listed as 'winner'.
     :rtype: float
     """
     winner = game.get("winner")
     loser = game.get("loser")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return arena.expected_score(winner, loser)
     logger.debug(f"Calculating expected score for {winner} vs {loser}.")
     # Example function to calculate probabilities
     prob_win = arena.expected_score(winner, loser)
     logger.debug(f"Expected score (P({winner})) = {prob_win:.4f}")
     return prob_win
+
+
+def rating_table(arena: RatingArena, competitors: Sequence[Any]) -> Optional[Tuple[type, List[Any]]]:
+    """The competitor objects behind ``competitors``, when their scores can be computed in bulk.
+
+    Bulk scoring reproduces elote's own ``LambdaArena.expected_score``, so it is only used
+    when the arena scores through that method (directly or through a branch) and every
+    competitor is exactly an :class:`EloCompetitor` or every one a :class:`GlickoCompetitor`.
+    Competitors the arena has not seen are scored as unrated, as the arena would. A
+    wrapper arena, such as :class:`~keeks_elote.eviction.EvictingArena`, answers through
+    its own ``rating_table(competitors)`` method.
+
+    :param arena: The arena holding the ratings.
+    :type arena: RatingArena
+    :param competitors: The competitors' labels.
+    :type competitors: Sequence[Any]
+    :return: The competitors' common type and their objects in ``competitors`` order, or
+             ``None`` when the arena must be asked pair by pair.
+    :rtype: Optional[Tuple[type, List[Any]]]
+    """
+    hook = getattr(arena, "rating_table", None)
+    if callable(hook):
+        bulk: Optional[Tuple[type, List[Any]]] = hook(competitors)
+        return bulk
+    if isinstance(arena, ArenaBranch):
+        arena = arena._view
+    # An arena scoring through LambdaArena means elote is already imported; never import it here.
+    lambda_arena = sys.modules.get("elote.arenas.lambda_arena")
+    if (
+        lambda_arena is None
+        or getattr(type(arena), "expected_score", None) is not lambda_arena.LambdaArena.expected_score
+    ):
+        return None
+    pool = arena.competitors  # type: ignore[attr-defined]
+    unrated = None
+    table = []
+    for competitor in competitors:
+        if competitor in pool:
+            table.append(pool[competitor])
+        else:
+            if unrated is None:
+                unrated = arena.base_competitor(**arena.base_competitor_kwargs)  # type: ignore[attr-defined]
+            table.append(unrated)
+    kinds = {type(entry) for entry in table}
+    if len(kinds) != 1 or not kinds <= _bulk_kernels().keys():
+        return None
+    return kinds.pop(), table
+
+
+# Each kernel scores table[rows] against table[cols] elementwise; broadcasting a column of
+# indices against a row of them gives the whole matrix.
+def _elo_kernel(table: List[Any], rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # EloCompetitor.expected_score: T_i / (T_i + T_j) with T = 10 ** (rating / base).
+    ratings = np.array([entry.rating for entry in table], dtype=np.float64)
+    base = np.array([entry._base_rating for entry in table], dtype=np.float64)
+    scaled = ratings / base
+    return 1.0 / (1.0 + 10.0 ** (scaled[cols] - scaled[rows]))
+
+
+def _glicko_kernel(table: List[Any], rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # GlickoCompetitor.expected_score: 1 / (1 + 10 ** (-g(rd_j) * (r_i - r_j) / 400)).
+    ratings = np.array([entry.rating for entry in table], dtype=np.float64)
+    rd = np.array([entry.rd for entry in table], dtype=np.float64)
+    q = type(table[0])._q
+    g = 1.0 / np.sqrt(1.0 + 3.0 * q**2 * rd**2 / np.pi**2)
+    return 1.0 / (1.0 + 10.0 ** (-g[cols] * (ratings[rows] - ratings[cols]) / 400.0))
+
+
+@functools.lru_cache(maxsize=None)
+def _bulk_kernels() -> Dict[type, Callable[[List[Any], np.ndarray, np.ndarray], np.ndarray]]:
+    """The vectorized kernel for each elote competitor type, imported on first use."""
+    from elote.competitors.elo import EloCompetitor
+    from elote.competitors.glicko import GlickoCompetitor
+
+    return {EloCompetitor: _elo_kernel, GlickoCompetitor: _glicko_kernel}
+
+
+def probability_matrix(arena: RatingArena, competitors: Sequence[Any]) -> np.ndarray:
+    """Builds the pairwise win-probability matrix for a set of competitors.
+
+    Entry ``[i, j]`` is ``arena.expected_score(competitors[i], competitors[j])``, the
+    probability that competitor ``i`` beats competitor ``j``. The diagonal is 0.5. Each
+    pair is only asked for once and the lower triangle is filled in as ``1 - P[j, i]``,
+    so the matrix is consistent even for rating systems whose ``expected_score`` is not
+    exactly antisymmetric.
+
+    For elote Elo and Glicko ratings held in a ``LambdaArena`` (or a branch of one), the
+    whole matrix is computed with one vectorized NumPy expression instead of ``N²/2``
+    ``expected_score`` calls; it agrees with the scalar path to floating-point rounding.
+    Any other arena or rating system is asked pair by pair.
+
+    :param arena: The arena holding the current ratings.
+    :type arena: RatingArena
+    :param competitors: The competitors to include, in row/column order.
+    :type competitors: Sequence[Any]
+    :return: An ``(N, N)`` float array of win probabilities.
+    :rtype: np.ndarray
+    """
+    n = len(competitors)
+    bulk = rating_table(arena, competitors) if n else None
+    if bulk is not None:
+        kind, table = bulk
+        index = np.arange(n)
+        full = _bulk_kernels()[kind](table, index[:, None], index[None, :])
+        upper = np.triu(full, k=1)
+        matrix = upper + np.tril(1.0 - upper.T, k=-1)
+        np.fill_diagonal(matrix, 0.5)
+        return matrix
+
+    matrix = np.full((n, n), 0.5)
+    for i in range(n):
+        for j in range(i + 1, n):
+            p = float(arena.expected_score(competitors[i], competitors[j]))
+            matrix[i, j] = p
+            matrix[j, i] = 1.0 - p
+    return matrix
+
+
+def pair_probabilities(arena: RatingArena, pairs: Sequence[Tuple[Any, Any]]) -> np.ndarray:
+    """Win probabilities for a batch of ``(competitor, opponent)`` pairs.
+
+    Entry ``k`` is ``arena.expected_score(*pairs[k])``. Elote Elo and Glicko ratings in a
+    ``LambdaArena`` are scored in one vectorized expression over the batch's distinct
+    competitors, as in :func:`probability_matrix`; other arenas are asked pair by pair.
+
+    :param arena: The arena holding the current ratings.
+    :type arena: RatingArena
+    :param pairs: The matchups to score.
+    :type pairs: Sequence[Tuple[Any, Any]]
+    :return: A float array with one probability per pair.
+    :rtype: np.ndarray
+    """
+    positions: Dict[Any, int] = {}
+    for pair in pairs:
+        for competitor in pair:
+            positions.setdefault(competitor, len(positions))
+    bulk = rating_table(arena, list(positions)) if pairs else None
+    if bulk is None:
+        return np.array([arena.expected_score(a, b) for a, b in pairs], dtype=np.float64)
+    kind, table = bulk
+    rows = np.array([positions[a] for a, _ in pairs], dtype=np.intp)
+    cols = np.array([positions[b] for _, b in pairs], dtype=np.intp)
+    return _bulk_kernels()[kind](table, rows, cols)
@@ -0,0 +1,53 @@
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from keeks_elote.records import Bet, GameRecord
+
+if TYPE_CHECKING:
+    from keeks_elote.backtest import PeriodSummary
+    from keeks_elote.rating_arena import RatingArena
+
+
+class Settlement(NamedTuple):
+    """One executed bet: the ``stake`` placed on it and what it ``returned`` (stake plus winnings, or 0)."""
+
+    bet: Bet
+    stake: float
+    returned: float
+
+
+class BacktestObserver:
+    """Receives a backtest's events, once per period, as the records the run already holds.
+
+    Register observers with ``Backtest(arena, observers=[...])`` or
+    :meth:`~keeks_elote.backtest.Backtest.add_observer`. Each hook is called at most once
+    per period with everything that happened in that step, so nothing is formatted and
+    nothing is copied per game. The sequences passed in belong to the run: read them
+    during the call and copy anything to be kept. With no observer registered the
+    backtest skips every hook and builds no event data.
+
+    Within a betting period the hooks run in order: :meth:`on_period_start`,
+    :meth:`on_bets_settled` (betting periods only), :meth:`on_ratings_updated` and
+    :meth:`on_bets_evaluated` for the following period's games, if that period is bet.
+    ``price_first_period`` runs also call :meth:`on_bets_evaluated` for the first period
+    before it starts, if it is bet.
+    :meth:`on_run_end` follows the last period. Projection runs call
+    :meth:`on_period_start`, :meth:`on_ratings_updated` and :meth:`on_run_end`.
+
+    Every hook here does nothing, so a subclass overrides only the ones it needs. Any
+    object with some of these methods can be registered; missing hooks are skipped.
+    """
+
+    def on_period_start(self, period: int, games: Sequence[GameRecord]) -> None:
+        """A period is about to be run on its settled ``games``."""
+
+    def on_bets_settled(self, period: int, settlements: List[Settlement], bankroll: float) -> None:
+        """The bets priced for ``period`` were executed, leaving ``bankroll`` in total funds."""
+
+    def on_ratings_updated(self, period: int, arena: "RatingArena", matchups: Sequence[Tuple[Any, ...]]) -> None:
+        """``period``'s ``matchups`` were fed to ``arena``, whose ratings now include them."""
+
+    def on_bets_evaluated(self, period: int, bets: List[Bet]) -> None:
+        """The strategy priced ``bets`` on ``period``'s games, to be settled when it is run."""
+
+    def on_run_end(self, period_summaries: Sequence["PeriodSummary"], stop_reason: Optional[str]) -> None:
+        """The run finished (or a stop rule ended it with ``stop_reason``)."""
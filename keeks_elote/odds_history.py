@@ -0,0 +1,165 @@
+import logging
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from keeks_elote.backtest import american_to_decimal
+
+logger = logging.getLogger(__name__)
+
+
+class LineQuote(NamedTuple):
+    """One side's price: American ``odds`` offered by ``book`` at ``timestamp``."""
+
+    odds: Any
+    book: Any
+    timestamp: Any
+
+
+class _SideLines:
+    """Every quote for one side of one game, with a lazily built best-line index.
+
+    The index holds, for each distinct quote time, the best price among every book's
+    latest quote at that time, so an as-of lookup is one binary search over ``times``.
+    """
+
+    __slots__ = ("quotes", "times", "best")
+
+    def __init__(self) -> None:
+        self.quotes: List[Tuple[Any, int, Any, float, Any]] = []
+        self.times: Optional[List[Any]] = None
+        self.best: List[LineQuote] = []
+
+    def add(self, timestamp: Any, book: Any, decimal_odds: float, american_odds: Any) -> None:
+        self.quotes.append((timestamp, len(self.quotes), book, decimal_odds, american_odds))
+        self.times = None
+
+    def _build(self) -> List[Any]:
+        self.quotes.sort(key=lambda quote: (quote[0], quote[1]))
+        latest: Dict[Any, Tuple[float, LineQuote]] = {}
+        times: List[Any] = []
+        best: List[LineQuote] = []
+        for timestamp, _, book, decimal_odds, american_odds in self.quotes:
+            latest[book] = (decimal_odds, LineQuote(american_odds, book, timestamp))
+            line = max(latest.values(), key=lambda entry: entry[0])[1]
+            if times and times[-1] == timestamp:
+                best[-1] = line
+            else:
+                times.append(timestamp)
+                best.append(line)
+        self.times, self.best = times, best
+        return times
+
+    def as_of(self, timestamp: Any) -> Optional[LineQuote]:
+        times = self.times if self.times is not None else self._build()
+        if timestamp is None:
+            return self.best[-1] if self.best else None
+        position = bisect_right(times, timestamp)
+        return self.best[position - 1] if position else None
+
+
+class OddsHistory:
+    """Time-stamped moneylines for each game from any number of books.
+
+    Quotes are kept per side of each game, keyed by ``(period, competitor, opponent)``.
+    :meth:`best_line` answers "the best price on offer as of time ``T``" with a dictionary
+    lookup and one binary search: the first lookup after a change sorts that side's quotes
+    once and records the running best line across books at every quote time. A book's
+    line stays on offer until that book posts a new one.
+
+    Pass a history to :class:`~keeks_elote.backtest.Backtest` to price and settle bets at
+    the as-of line instead of the game's ``winner_odds``/``loser_odds``.
+
+    Timestamps may be anything mutually comparable (numbers, ``datetime`` objects, ISO
+    strings in one format).
+    """
+
+    def __init__(self) -> None:
+        self._sides: Dict[Tuple[Any, Any, Any], _SideLines] = {}
+        self._snapshots = 0
+
+    def __len__(self) -> int:
+        """The number of snapshots added."""
+        return self._snapshots
+
+    def add(
+        self,
+        period: int,
+        competitor: Any,
+        opponent: Any,
+        book: Any,
+        timestamp: Any,
+        competitor_odds: Any,
+        opponent_odds: Any = None,
+    ) -> None:
+        """Records one book's quote on a game.
+
+        :param period: The period the game is played in.
+        :type period: int
+        :param competitor: The side ``competitor_odds`` prices.
+        :type competitor: Any
+        :param opponent: The other side, priced by ``opponent_odds``.
+        :type opponent: Any
+        :param book: The sportsbook offering the line.
+        :type book: Any
+        :param timestamp: When the line was posted.
+        :type timestamp: Any
+        :param competitor_odds: American odds on ``competitor``, or ``None`` if not quoted.
+        :type competitor_odds: Any
+        :param opponent_odds: American odds on ``opponent``, or ``None`` if not quoted.
+        :type opponent_odds: Any
+        :raises ValueError: If either price is not valid American odds.
+        :raises TypeError: If either price is not a real number.
+        """
+        for label, other, odds in ((competitor, opponent, competitor_odds), (opponent, competitor, opponent_odds)):
+            if odds is None:
+                continue
+            decimal_odds = american_to_decimal(odds)
+            side = self._sides.get((period, label, other))
+            if side is None:
+                side = self._sides[(period, label, other)] = _SideLines()
+            side.add(timestamp, book, decimal_odds, odds)
+        self._snapshots += 1
+
+    def best_line(self, period: int, competitor: Any, opponent: Any, as_of: Any = None) -> Optional[LineQuote]:
+        """The best price on ``competitor`` against ``opponent`` as of ``as_of``.
+
+        :param period: The period the game is played in.
+        :type period: int
+        :param competitor: The side to back.
+        :type competitor: Any
+        :param opponent: The side it plays.
+        :type opponent: Any
+        :param as_of: The decision time; quotes posted later are ignored. ``None`` uses
+                      every quote, i.e. the best closing line.
+        :type as_of: Any
+        :return: The best line, or ``None`` when no book had quoted the side by then.
+        :rtype: Optional[LineQuote]
+        """
+        side = self._sides.get((period, competitor, opponent))
+        return side.as_of(as_of) if side is not None else None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "OddsHistory":
+        """Builds a history from snapshot dicts.
+
+        Each row has ``period``, ``competitor``, ``opponent``, ``book``, ``timestamp``,
+        ``competitor_odds`` and optionally ``opponent_odds``, as in :meth:`add`.
+
+        :param rows: The snapshots, in any order.
+        :type rows: Iterable[Dict[str, Any]]
+        :return: The history.
+        :rtype: OddsHistory
+        """
+        history = cls()
+        for row in rows:
+            history.add(
+                row["period"],
+                row["competitor"],
+                row["opponent"],
+                row["book"],
+                row["timestamp"],
+                row["competitor_odds"],
+                row.get("opponent_odds"),
+            )
+        logger.info("Loaded %d odds snapshots.", len(history))
+        return history
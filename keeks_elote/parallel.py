@@ -0,0 +1,260 @@
+import logging
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keeks_elote.records import Bet
+
+logger = logging.getLogger(__name__)
+
+# Each array starts on a cache-line boundary inside the shared block.
+_ALIGNMENT = 64
+
+Kernel = Callable[[Mapping[str, np.ndarray], int, np.random.Generator], Any]
+
+
+class SharedSpec(NamedTuple):
+    """Where a set of arrays lives in shared memory: small enough to send to every worker.
+
+    ``layout`` holds one ``(key, dtype, shape, offset)`` entry per array.
+    """
+
+    name: str
+    layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...]
+
+
+def _views(buffer: Any, layout: Sequence[Tuple[str, str, Tuple[int, ...], int]]) -> Dict[str, np.ndarray]:
+    views = {}
+    for key, dtype, shape, offset in layout:
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        view.flags.writeable = False
+        views[key] = view
+    return views
+
+
+class SharedArrays:
+    """Publishes a set of NumPy arrays once into a single shared memory block.
+
+    The arrays are copied in when the block is created; after that, any process can
+    attach to :attr:`spec` with :func:`attach_shared` and read them without a copy. The
+    views handed out are read-only. The creating process owns the block, and
+    :meth:`close` (or leaving the ``with`` block) releases it.
+
+    :param arrays: The arrays to publish, by name.
+    :type arrays: Mapping[str, np.ndarray]
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        layout = []
+        size = 0
+        contiguous = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            contiguous[key] = array
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            layout.append((key, array.dtype.str, tuple(array.shape), size))
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for key, _, _, offset in layout:
+            array = contiguous[key]
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, offset=offset)[...] = array
+        self._shm: Optional[shared_memory.SharedMemory] = shm
+        self.spec = SharedSpec(shm.name, tuple(layout))
+        self.arrays = _views(shm.buf, layout)
+        logger.debug("Published %d arrays (%d bytes) to shared memory %s.", len(layout), size, shm.name)
+
+    def close(self) -> None:
+        """Releases and unlinks the shared block. The views in :attr:`arrays` are invalid afterwards."""
+        if self._shm is None:
+            return
+        self.arrays = {}
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def attach_shared(spec: SharedSpec) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+    """Attaches to arrays published by :class:`SharedArrays` without copying them.
+
+    The returned block must be kept alive (and eventually closed, not unlinked) for as
+    long as the views are used.
+
+    :param spec: The published :attr:`SharedArrays.spec`.
+    :type spec: SharedSpec
+    :return: The attached block and read-only views of the arrays by name.
+    :rtype: Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]
+    """
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=spec.name, track=False)
+    else:
+        # Pool workers share the owner's resource tracker, so attaching here re-registers
+        # a name it already tracks, and the owner's unlink unregisters it.
+        shm = shared_memory.SharedMemory(name=spec.name)
+    return shm, _views(shm.buf, spec.layout)
+
+
+# Set once per worker process by the pool initializer, so tasks carry no array data.
+_worker_block: Optional[shared_memory.SharedMemory] = None
+_worker_arrays: Dict[str, np.ndarray] = {}
+
+
+def _attach_worker(spec: SharedSpec) -> None:
+    global _worker_block, _worker_arrays
+    _worker_block, _worker_arrays = attach_shared(spec)
+
+
+def _run_chunk(kernel: Kernel, n_paths: int, seed: np.random.SeedSequence) -> Any:
+    return kernel(_worker_arrays, n_paths, np.random.default_rng(seed))
+
+
+class MonteCarloExecutor:
+    """Runs a Monte Carlo kernel over many paths, in chunks, across a process pool.
+
+    The input arrays are published once with :class:`SharedArrays`, and each worker
+    attaches to them when it starts, so a task only carries the kernel, a path count and
+    a seed. The work is split into chunks of ``chunk_size`` paths, and chunk ``i`` always
+    draws from the ``i``-th child of ``SeedSequence(seed)``, so results depend on
+    ``seed`` and ``chunk_size`` but not on ``max_workers`` or on scheduling. Results are
+    returned in chunk order.
+
+    A kernel is a module-level function ``kernel(arrays, n_paths, rng)`` (it is pickled
+    by reference) returning that chunk's result; :func:`simulate_outcome_paths` and
+    :func:`bootstrap_period_paths` are provided. With ``max_workers=1`` chunks run in
+    this process, which gives the same results without a pool.
+
+    :param arrays: The input arrays, by name, as the kernel expects them.
+    :type arrays: Mapping[str, np.ndarray]
+    :param max_workers: Worker processes. Defaults to the CPU count.
+    :type max_workers: Optional[int]
+    :param chunk_size: Paths per chunk.
+    :type chunk_size: int
+    :param seed: Entropy for the root seed sequence.
+    :type seed: Optional[int]
+    """
+
+    def __init__(
+        self,
+        arrays: Mapping[str, np.ndarray],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 10000,
+        seed: Optional[int] = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self._shared = SharedArrays(arrays)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _chunks(self, n_paths: int) -> Tuple[List[int], List[np.random.SeedSequence]]:
+        n_chunks = math.ceil(n_paths / self.chunk_size)
+        sizes = [min(self.chunk_size, n_paths - i * self.chunk_size) for i in range(n_chunks)]
+        return sizes, np.random.SeedSequence(self.seed).spawn(n_chunks)
+
+    def map(self, kernel: Kernel, n_paths: int) -> List[Any]:
+        """Runs ``kernel`` over ``n_paths`` paths and returns each chunk's result in chunk order.
+
+        :param kernel: A module-level ``kernel(arrays, n_paths, rng)`` function.
+        :type kernel: Callable
+        :param n_paths: The total number of paths.
+        :type n_paths: int
+        :return: One result per chunk.
+        :rtype: List[Any]
+        """
+        sizes, seeds = self._chunks(n_paths)
+        if self.max_workers == 1:
+            arrays = self._shared.arrays
+            return [kernel(arrays, size, np.random.default_rng(seed)) for size, seed in zip(sizes, seeds)]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_attach_worker, initargs=(self._shared.spec,)
+            )
+        logger.info("Running %d paths in %d chunks across the process pool.", n_paths, len(sizes))
+        return list(self._pool.map(_run_chunk, [kernel] * len(sizes), sizes, seeds))
+
+    def run(self, kernel: Kernel, n_paths: int) -> np.ndarray:
+        """Like :meth:`map`, concatenating the per-chunk arrays along the first axis."""
+        results = self.map(kernel, n_paths)
+        return np.concatenate(results) if results else np.empty(0)
+
+    def close(self) -> None:
+        """Shuts the pool down and releases the shared arrays."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._shared.close()
+
+    def __enter__(self) -> "MonteCarloExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def bet_arrays(bets_by_period: Mapping[int, Sequence[Bet]]) -> Dict[str, np.ndarray]:
+    """Flattens priced bets into the arrays the provided kernels read.
+
+    Periods are taken in sorted order; ``period_start`` holds each period's first bet
+    index plus a final end offset, so period ``k`` is ``period_start[k]:period_start[k + 1]``.
+
+    :param bets_by_period: The bets settled in each period.
+    :type bets_by_period: Mapping[int, Sequence[Bet]]
+    :return: ``probability``, ``payoff``, ``fraction``, ``outcome`` and ``period_start`` arrays.
+    :rtype: Dict[str, np.ndarray]
+    """
+    bets = [bet for period in sorted(bets_by_period) for bet in bets_by_period[period]]
+    counts = [len(bets_by_period[period]) for period in sorted(bets_by_period)]
+    return {
+        "probability": np.array([bet.probability for bet in bets], dtype=np.float64),
+        "payoff": np.array([bet.payoff for bet in bets], dtype=np.float64),
+        "fraction": np.array([bet.fraction for bet in bets], dtype=np.float64),
+        "outcome": np.array([bet.actual_outcome for bet in bets], dtype=np.bool_),
+        "period_start": np.concatenate(([0], np.cumsum(counts, dtype=np.int64))),
+    }
+
+
+def _period_returns(arrays: Mapping[str, np.ndarray], wins: np.ndarray) -> np.ndarray:
+    """Each period's bankroll return for a ``(..., n_bets)`` array of outcomes.
+
+    Stakes are fractions of the period's opening bankroll, as in the backtest.
+    """
+    fraction, payoff = arrays["fraction"], arrays["payoff"]
+    bet_returns = np.where(wins, fraction * payoff, -fraction)
+    cumulative = np.concatenate((np.zeros(wins.shape[:-1] + (1,)), np.cumsum(bet_returns, axis=-1)), axis=-1)
+    start = arrays["period_start"]
+    return cumulative[..., start[1:]] - cumulative[..., start[:-1]]
+
+
+def simulate_outcome_paths(arrays: Mapping[str, np.ndarray], n_paths: int, rng: np.random.Generator) -> np.ndarray:
+    """Kernel: redraws every bet's outcome from its model probability.
+
+    :return: Each path's final bankroll as a multiple of the starting bankroll.
+    :rtype: np.ndarray
+    """
+    wins = rng.random((n_paths, arrays["probability"].shape[0])) < arrays["probability"]
+    growth = np.maximum(1.0 + _period_returns(arrays, wins), 0.0)
+    return np.prod(growth, axis=1)
+
+
+def bootstrap_period_paths(arrays: Mapping[str, np.ndarray], n_paths: int, rng: np.random.Generator) -> np.ndarray:
+    """Kernel: resamples whole periods, with their actual outcomes, with replacement.
+
+    :return: Each path's final bankroll as a multiple of the starting bankroll.
+    :rtype: np.ndarray
+    """
+    growth = np.maximum(1.0 + _period_returns(arrays, arrays["outcome"]), 0.0)
+    if growth.shape[0] == 0:
+        return np.ones(n_paths)
+    picks = rng.integers(0, growth.shape[0], size=(n_paths, growth.shape[0]))
+    return np.prod(growth[picks], axis=1)
@@ -0,0 +1,178 @@
+import gzip
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from keeks_elote.rating_arena import RatingArena
+
+logger = logging.getLogger(__name__)
+
+_FORMAT = "keeks-elote-ratings"
+_VERSION = 1
+
+
+class RatingSnapshot(NamedTuple):
+    """Competitor ratings captured from an arena.
+
+    ``ratings`` maps each competitor to ``(rating, rd)``; ``rd`` is ``None`` for rating
+    systems without a rating deviation.
+    """
+
+    competitor_type: str
+    ratings: Dict[Any, Tuple[float, Optional[float]]]
+
+    def mean_rating(self) -> float:
+        """The average rating, or NaN for an empty snapshot."""
+        if not self.ratings:
+            return math.nan
+        return sum(rating for rating, _ in self.ratings.values()) / len(self.ratings)
+
+
+def _competitors(arena: RatingArena) -> Dict[Any, Any]:
+    competitors = getattr(arena, "competitors", None)
+    if not isinstance(competitors, dict):
+        raise TypeError(f"{type(arena).__name__} has no competitors dict to read or seed ratings through.")
+    return competitors
+
+
+def _label_from_json(label: Any) -> Any:
+    """Turns the JSON arrays a tuple label was written as back into (nested) tuples.
+
+    Labels are dict keys and so never lists, which makes every array a tuple.
+    """
+    if isinstance(label, list):
+        return tuple(_label_from_json(item) for item in label)
+    return label
+
+
+def export_ratings(arena: RatingArena) -> RatingSnapshot:
+    """Captures every competitor's current rating (and rating deviation, if it has one).
+
+    :param arena: An arena exposing a ``competitors`` dict, such as elote's ``LambdaArena``.
+    :type arena: RatingArena
+    :return: The arena's ratings.
+    :rtype: RatingSnapshot
+    :raises TypeError: If the arena has no ``competitors`` dict.
+    """
+    ratings: Dict[Any, Tuple[float, Optional[float]]] = {}
+    types = set()
+    for label, competitor in _competitors(arena).items():
+        rd = getattr(competitor, "rd", None)
+        ratings[label] = (float(competitor.rating), None if rd is None else float(rd))
+        types.add(type(competitor).__name__)
+    return RatingSnapshot(types.pop() if len(types) == 1 else "", ratings)
+
+
+def save_ratings(arena: RatingArena, path: Union[str, Path]) -> RatingSnapshot:
+    """Writes an arena's ratings to a compact JSON file, gzipped when the path ends in ``.gz``.
+
+    Competitors are stored as ``[label, rating, rd]`` rows, so labels keep their JSON type
+    (integer team ids stay integers). Tuple labels, such as ``(team, season)``, are written
+    as arrays and read back as tuples.
+
+    :param arena: The arena to export, typically at the end of a season's run.
+    :type arena: RatingArena
+    :param path: The file to write.
+    :type path: Union[str, Path]
+    :return: The saved ratings.
+    :rtype: RatingSnapshot
+    """
+    snapshot = export_ratings(arena)
+    document = {
+        "format": _FORMAT,
+        "version": _VERSION,
+        "competitor_type": snapshot.competitor_type,
+        "ratings": [[label, rating, rd] for label, (rating, rd) in snapshot.ratings.items()],
+    }
+    payload = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    path = Path(path)
+    if path.suffix == ".gz":
+        payload = gzip.compress(payload)
+    path.write_bytes(payload)
+    logger.info("Saved %d ratings to %s.", len(snapshot.ratings), path)
+    return snapshot
+
+
+def load_ratings(path: Union[str, Path]) -> RatingSnapshot:
+    """Reads ratings written by :func:`save_ratings`.
+
+    :param path: The file to read; ``.gz`` files are decompressed.
+    :type path: Union[str, Path]
+    :return: The saved ratings.
+    :rtype: RatingSnapshot
+    :raises ValueError: If the file is not a ratings file this version can read.
+    """
+    path = Path(path)
+    payload = path.read_bytes()
+    if path.suffix == ".gz":
+        payload = gzip.decompress(payload)
+    document = json.loads(payload)
+    if not isinstance(document, dict) or document.get("format") != _FORMAT:
+        raise ValueError(f"{path} is not a keeks-elote ratings file.")
+    if document.get("version") != _VERSION:
+        raise ValueError(f"{path} has ratings format version {document.get('version')!r}; expected {_VERSION}.")
+    ratings: Dict[Any, Tuple[float, Optional[float]]] = {}
+    for label, rating, rd in document["ratings"]:
+        ratings[_label_from_json(label)] = (float(rating), None if rd is None else float(rd))
+    return RatingSnapshot(document.get("competitor_type", ""), ratings)
+
+
+def warm_start(
+    arena: RatingArena,
+    snapshot: RatingSnapshot,
+    regression: float = 0.0,
+    mean: Optional[float] = None,
+    rd_inflation: float = 0.0,
+    max_rd: Optional[float] = None,
+) -> List[Any]:
+    """Seeds an arena with prior ratings, regressed toward the mean and made less certain.
+
+    Each rating becomes ``mean + (1 - regression) * (rating - mean)``, so ``regression=0``
+    carries ratings over unchanged and ``regression=1`` resets everyone to the mean.
+    ``mean`` defaults to the snapshot's average rating. For systems with a rating
+    deviation, ``rd_inflation`` is added in quadrature (``sqrt(rd**2 + rd_inflation**2)``,
+    the Glicko treatment of an idle period) and the result is capped at ``max_rd``.
+
+    Competitors are built with the arena's ``base_competitor`` and
+    ``base_competitor_kwargs``, replacing any existing competitor of the same label, and
+    competitors not in the snapshot are left alone.
+
+    :param arena: The arena to seed, such as elote's ``LambdaArena``.
+    :type arena: RatingArena
+    :param snapshot: Ratings from :func:`load_ratings` or :func:`export_ratings`.
+    :type snapshot: RatingSnapshot
+    :param regression: The fraction of each rating's distance from the mean to remove, in ``[0, 1]``.
+    :type regression: float
+    :param mean: The rating to regress toward.
+    :type mean: Optional[float]
+    :param rd_inflation: Uncertainty added to each rating deviation.
+    :type rd_inflation: float
+    :param max_rd: A ceiling on the inflated rating deviation.
+    :type max_rd: Optional[float]
+    :return: The competitors that were seeded.
+    :rtype: List[Any]
+    :raises ValueError: If ``regression`` is outside ``[0, 1]`` or ``rd_inflation`` is negative.
+    :raises TypeError: If the arena has no ``competitors`` dict or ``base_competitor`` class.
+    """
+    if not 0.0 <= regression <= 1.0:
+        raise ValueError(f"regression must be between 0 and 1, got {regression}.")
+    if rd_inflation < 0:
+        raise ValueError(f"rd_inflation must be non-negative, got {rd_inflation}.")
+    competitors = _competitors(arena)
+    base_competitor = getattr(arena, "base_competitor", None)
+    if base_competitor is None:
+        raise TypeError(f"{type(arena).__name__} has no base_competitor to build seeded competitors from.")
+    kwargs = dict(getattr(arena, "base_competitor_kwargs", None) or {})
+    center = snapshot.mean_rating() if mean is None else mean
+
+    for label, (rating, rd) in snapshot.ratings.items():
+        competitor = base_competitor(**kwargs)
+        competitor.rating = center + (1.0 - regression) * (rating - center)
+        if rd is not None and hasattr(competitor, "rd"):
+            inflated = math.sqrt(rd * rd + rd_inflation * rd_inflation)
+            competitor.rd = inflated if max_rd is None else min(inflated, max_rd)
+        competitors[label] = competitor
+    logger.info("Warm-started %d competitors (regression %.2f toward %.1f).", len(snapshot.ratings), regression, center)
+    return list(snapshot.ratings)
@@ -0,0 +1,174 @@
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Protocol, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PathOrFile = Union[str, Path, IO[str]]
+
+# Version of the .npz projection layout written by NpzSink.
+_NPZ_VERSION = 1
+
+
+class Projection(NamedTuple):
+    """A projected game: ``probability`` is the chance ``competitor`` beats ``opponent``."""
+
+    period: int
+    competitor: Any
+    opponent: Any
+    probability: float
+
+    @property
+    def favorite(self) -> Any:
+        """The competitor the ratings favor (``competitor`` on an even game)."""
+        return self.competitor if self.probability >= 0.5 else self.opponent
+
+
+class ProjectionSink(Protocol):
+    """Where :meth:`~keeks_elote.backtest.Backtest.run_and_project` writes projections.
+
+    ``write`` receives projections in batches; ``close`` is called once at the end of
+    the run.
+    """
+
+    def write(self, projections: Sequence[Projection]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class ColumnarSink:
+    """Collects projections in memory, one list per field.
+
+    :ivar columns: ``period``, ``competitor``, ``opponent`` and ``probability`` lists.
+    """
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, List[Any]] = {field: [] for field in Projection._fields}
+
+    def write(self, projections: Sequence[Projection]) -> None:
+        for field, values in zip(Projection._fields, zip(*projections)):
+            self.columns[field].extend(values)
+
+    def close(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self.columns["period"])
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """The columns as NumPy arrays; labels become a string array unless they are all numbers."""
+        arrays = {
+            "period": np.asarray(self.columns["period"], dtype=np.int64),
+            "probability": np.asarray(self.columns["probability"], dtype=np.float64),
+        }
+        for field in ("competitor", "opponent"):
+            labels = np.asarray(self.columns[field])
+            arrays[field] = labels.astype(str) if labels.dtype == object else labels
+        return arrays
+
+
+def open_for_writing(target: PathOrFile) -> Tuple[IO[str], bool]:
+    """A text handle to write to, and whether the caller owns it and must close it.
+
+    :param target: A path, opened for writing as UTF-8, or an already open text file.
+    :type target: Union[str, Path, IO[str]]
+    :return: The handle, and ``True`` if it was opened here.
+    :rtype: Tuple[IO[str], bool]
+    """
+    if isinstance(target, (str, Path)):
+        return open(target, "w", encoding="utf-8", newline=""), True
+    return target, False
+
+
+class CsvSink:
+    """Writes projections as CSV rows with a header, one ``writerows`` call per batch.
+
+    :param target: A path, or an open text file (left open on :meth:`close`).
+    :type target: Union[str, Path, IO[str]]
+    """
+
+    def __init__(self, target: PathOrFile):
+        self._handle, self._owned = open_for_writing(target)
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(Projection._fields)
+
+    def write(self, projections: Sequence[Projection]) -> None:
+        self._writer.writerows(projections)
+
+    def close(self) -> None:
+        if self._owned:
+            self._handle.close()
+        else:
+            self._handle.flush()
+
+
+class NdjsonSink:
+    """Writes one JSON object per projection, one ``write`` call per batch.
+
+    :param target: A path, or an open text file (left open on :meth:`close`).
+    :type target: Union[str, Path, IO[str]]
+    """
+
+    def __init__(self, target: PathOrFile):
+        self._handle, self._owned = open_for_writing(target)
+
+    def write(self, projections: Sequence[Projection]) -> None:
+        self._handle.write("".join(json.dumps(projection._asdict()) + "\n" for projection in projections))
+
+    def close(self) -> None:
+        if self._owned:
+            self._handle.close()
+        else:
+            self._handle.flush()
+
+
+class NpzSink:
+    """Writes projections to a compressed NumPy ``.npz`` file of columns when closed.
+
+    This is the library's binary columnar format: read it back with
+    :func:`load_projections`, which needs no pickling.
+
+    :param path: The file to write.
+    :type path: Union[str, Path]
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._columns = ColumnarSink()
+
+    def write(self, projections: Sequence[Projection]) -> None:
+        self._columns.write(projections)
+
+    def close(self) -> None:
+        arrays = {"version": np.asarray(_NPZ_VERSION, dtype=np.int64), **self._columns.to_arrays()}
+        with open(self.path, "wb") as handle:
+            np.savez_compressed(handle, **arrays)  # type: ignore[arg-type]
+        logger.info("Wrote %d projections to %s.", len(self._columns), self.path)
+
+
+def load_projections(path: Union[str, Path]) -> Dict[str, np.ndarray]:
+    """Reads projections written by :class:`NpzSink`.
+
+    :param path: The ``.npz`` file.
+    :type path: Union[str, Path]
+    :return: The ``period``, ``competitor``, ``opponent`` and ``probability`` columns.
+    :rtype: Dict[str, np.ndarray]
+    :raises ValueError: If the file is not a projection file this version can read.
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        if "version" not in archive.files or int(archive["version"]) != _NPZ_VERSION:
+            raise ValueError(f"{path} is not a version {_NPZ_VERSION} projection file.")
+        return {field: archive[field] for field in Projection._fields}
+
+
+def write_batched(sink: ProjectionSink, projections: Sequence[Projection], batch_size: Optional[int]) -> None:
+    """Writes projections to ``sink`` in batches of at most ``batch_size`` (all at once for ``None``)."""
+    if not projections:
+        return
+    step = batch_size or len(projections)
+    for start in range(0, len(projections), step):
+        sink.write(projections[start : start + step])
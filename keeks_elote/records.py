@@ -0,0 +1,108 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class GameRecord(NamedTuple):
+    """A compact, immutable game, used in place of the game dict inside a backtest.
+
+    The public API keeps accepting the dict schema; :meth:`from_dict` converts each game
+    once, after validation, so the hot loops read attributes instead of repeating
+    ``.get()`` lookups on a dict several times the size. Keys outside the schema are not
+    carried over. A record also answers ``record.get("winner")``, ``record["winner"]``,
+    ``"winner_odds" in record`` and ``record.keys()`` so code written against game dicts
+    keeps working; like :meth:`to_dict`, the last two only see fields that are set.
+    """
+
+    winner: Any
+    loser: Any
+    winner_odds: Any = None
+    loser_odds: Any = None
+    winner_score: Any = None
+    loser_score: Any = None
+
+    @classmethod
+    def from_dict(cls, game: Union[Dict[str, Any], "GameRecord"]) -> "GameRecord":
+        """Builds a record from a game dict; a record is returned unchanged."""
+        if isinstance(game, GameRecord):
+            return game
+        get = game.get
+        return cls(
+            get("winner"),
+            get("loser"),
+            get("winner_odds"),
+            get("loser_odds"),
+            get("winner_score"),
+            get("loser_score"),
+        )
+
+    @property
+    def has_odds(self) -> bool:
+        """Whether both sides carry a price; games priced on one side only are not bet."""
+        return self.winner_odds is not None and self.loser_odds is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style field lookup, returning ``default`` for unset or unknown fields."""
+        value = getattr(self, key) if key in self._fields else None
+        return default if value is None else value
+
+    def __getitem__(self, key: Any) -> Any:  # type: ignore[override]
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        """Dict-style membership: whether ``key`` names a field that is set."""
+        return isinstance(key, str) and key in self._fields and getattr(self, key) is not None
+
+    def keys(self) -> List[str]:
+        """The names of the fields that are set, as in :meth:`to_dict`."""
+        return [field for field, value in zip(self._fields, self) if value is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The game in the dict schema, leaving out unset fields."""
+        return {field: value for field, value in zip(self._fields, self) if value is not None}
+
+
+class Bet(NamedTuple):
+    """A wager calculated for the next period, settled when that period is run.
+
+    ``probability`` is the model's win probability for ``label`` when the bet was priced.
+    """
+
+    label: Any
+    opponent: Any
+    fraction: float
+    payoff: float
+    loss: float
+    actual_outcome: bool
+    probability: float = math.nan
+
+    def __getitem__(self, key: Any) -> Any:  # type: ignore[override]
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+def to_records(games: Iterable[Union[Dict[str, Any], GameRecord]]) -> List[GameRecord]:
+    """Converts a period's games to records."""
+    from_dict = GameRecord.from_dict
+    return [from_dict(game) for game in games]
+
+
+class CompiledPeriod(NamedTuple):
+    """One period as the backtest loops consume it.
+
+    ``matchups`` holds each game's arena matchup tuple and ``decimal_odds`` an ``(n, 2)``
+    array of each game's winner and loser decimal odds, ``nan`` where a side's odds are
+    missing or invalid. Both are ``None`` for periods run straight from game dicts, which
+    are converted as the run reaches them; :class:`~keeks_elote.dataset.CompiledDataset`
+    fills them in ahead of time.
+    """
+
+    period: int
+    games: Sequence[GameRecord]
+    matchups: Optional[Tuple[Tuple[Any, ...], ...]] = None
+    decimal_odds: Optional["np.ndarray"] = None
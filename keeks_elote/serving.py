@@ -0,0 +1,327 @@
+import asyncio
+import collections
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Deque, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keeks_elote.backtest import american_to_decimal, strategy_for_bet
+from keeks_elote.model_evaluation import pair_probabilities
+from keeks_elote.rating_arena import RatingArena
+
+if TYPE_CHECKING:
+    from keeks.binary_strategies.base import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest batch in the running estimate of evaluation time per request.
+_COST_SMOOTHING = 0.2
+
+
+class StakeQuote(NamedTuple):
+    """A stake suggestion: the win ``probability``, the strategy's bankroll ``fraction`` and the ``stake`` itself."""
+
+    probability: float
+    fraction: float
+    stake: float
+
+
+class ServerMetrics(NamedTuple):
+    """A snapshot of a :class:`ProjectionServer`'s counters.
+
+    Latencies are seconds from a request being submitted to its answer being set, over
+    the most recent requests (see ``latency_window``). They are ``nan`` before the first
+    answer.
+    """
+
+    requests: int
+    batches: int
+    updates: int
+    errors: int
+    mean_batch_size: float
+    largest_batch: int
+    latency_p50: float
+    latency_p99: float
+    latency_max: float
+
+
+class _Request(NamedTuple):
+    competitor: Any
+    opponent: Any
+    # Set for stake requests only.
+    decimal_odds: Optional[float]
+    bankroll: Optional[float]
+    future: "asyncio.Future[Any]"
+    submitted: float
+
+
+class _Update(NamedTuple):
+    matchups: List[Tuple[Any, ...]]
+    future: "asyncio.Future[None]"
+
+
+_STOP = object()
+
+
+class ProjectionServer:
+    """An in-process asyncio service answering win probabilities and stake suggestions in micro-batches.
+
+    Concurrent callers ``await`` :meth:`probability` or :meth:`stake`. Their requests are
+    queued and a single worker task coalesces them into batches, scoring each batch with
+    one :func:`~keeks_elote.model_evaluation.pair_probabilities` call (vectorized for
+    elote Elo and Glicko arenas). A batch is flushed when it holds ``max_batch_size``
+    requests, or when waiting any longer would push its oldest request past
+    ``latency_target``: the worker keeps a running estimate of evaluation time per request
+    and stops collecting early enough to leave room for it.
+
+    :meth:`update` applies new results with ``arena.tournament``. Updates share the queue
+    with requests and the worker applies each one between batches, so every request is
+    scored against the ratings as of the moment it was submitted, and nothing reads the
+    arena while it changes. Only the worker touches the arena; do not use it elsewhere
+    while the server runs.
+
+    Evaluation runs on the event loop, as a batch is one vectorized call. With a slow
+    arena that scores pair by pair, keep ``max_batch_size`` small so a batch does not hold
+    up the loop.
+
+    Use it as an async context manager, or call :meth:`start` and :meth:`stop`::
+
+        async with ProjectionServer(arena, strategy) as server:
+            p = await server.probability("A", "B")
+
+    :param arena: The arena holding the ratings.
+    :type arena: RatingArena
+    :param strategy: A keeks strategy for :meth:`stake`. Optional if only probabilities are served.
+    :type strategy: Optional[BaseStrategy]
+    :param max_batch_size: The most requests scored in one batch.
+    :type max_batch_size: int
+    :param latency_target: Seconds a request should wait for its answer, at most, while a
+                           batch fills. ``0`` scores whatever is already queued without waiting.
+    :type latency_target: float
+    :param price_bets_at_true_odds: Size stakes using each request's odds, as the backtest does.
+                                    If false, use the strategy's configured payoff and loss.
+    :type price_bets_at_true_odds: bool
+    :param latency_window: How many recent request latencies the metrics' percentiles cover.
+    :type latency_window: int
+    """
+
+    def __init__(
+        self,
+        arena: RatingArena,
+        strategy: Optional["BaseStrategy"] = None,
+        max_batch_size: int = 256,
+        latency_target: float = 0.005,
+        price_bets_at_true_odds: bool = True,
+        latency_window: int = 10000,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, got {max_batch_size}")
+        if latency_target < 0:
+            raise ValueError(f"latency_target must be non-negative, got {latency_target}")
+        self.arena = arena
+        self.strategy = strategy
+        self.max_batch_size = max_batch_size
+        self.latency_target = latency_target
+        self.price_bets_at_true_odds = price_bets_at_true_odds
+        self._queue: Optional["asyncio.Queue[Any]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._cost_per_request = 0.0
+        self._latencies: Deque[float] = collections.deque(maxlen=latency_window)
+        self._requests = self._batches = self._updates = self._errors = self._largest_batch = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker is accepting requests."""
+        return self._queue is not None and self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Starts the worker task on the running event loop."""
+        if self._worker is not None:
+            raise RuntimeError("ProjectionServer is already running")
+        queue: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._queue = queue
+        self._worker = asyncio.get_running_loop().create_task(self._run(queue))
+
+    async def stop(self) -> None:
+        """Answers everything already submitted, then stops the worker."""
+        queue, worker = self._queue, self._worker
+        if queue is None or worker is None:
+            return
+        # Refuse new requests, so nothing is queued behind the stop marker.
+        self._queue = None
+        queue.put_nowait(_STOP)
+        await worker
+
+    async def __aenter__(self) -> "ProjectionServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def probability(self, competitor: Any, opponent: Any) -> float:
+        """The probability that ``competitor`` beats ``opponent`` under the current ratings.
+
+        :param competitor: The first competitor's label.
+        :type competitor: Any
+        :param opponent: The second competitor's label.
+        :type opponent: Any
+        :return: ``arena.expected_score(competitor, opponent)``.
+        :rtype: float
+        """
+        result: float = await self._submit(competitor, opponent, None, None)
+        return result
+
+    async def stake(self, competitor: Any, opponent: Any, american_odds: Any, bankroll: float) -> StakeQuote:
+        """What the strategy would stake on ``competitor`` beating ``opponent`` at ``american_odds``.
+
+        :param competitor: The label of the side to bet on.
+        :type competitor: Any
+        :param opponent: The other side's label.
+        :type opponent: Any
+        :param american_odds: The price offered on ``competitor``.
+        :type american_odds: Union[int, float]
+        :param bankroll: The funds the fraction applies to.
+        :type bankroll: float
+        :raises RuntimeError: If the server has no strategy.
+        :raises TypeError: If the odds are not a real number.
+        :raises ValueError: If the odds are zero or non-finite.
+        :return: The probability, the strategy's fraction and the resulting stake.
+        :rtype: StakeQuote
+        """
+        if self.strategy is None:
+            raise RuntimeError("ProjectionServer needs a strategy to suggest stakes")
+        quote: StakeQuote = await self._submit(competitor, opponent, american_to_decimal(american_odds), bankroll)
+        return quote
+
+    async def update(self, matchups: Sequence[Tuple[Any, ...]]) -> None:
+        """Applies new results with ``arena.tournament`` after every request submitted before it.
+
+        :param matchups: The results, in the arena's matchup format.
+        :type matchups: Sequence[Tuple[Any, ...]]
+        """
+        queue = self._running_queue()
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        queue.put_nowait(_Update(list(matchups), future))
+        await future
+
+    def metrics(self) -> ServerMetrics:
+        """The server's counters and recent latency percentiles."""
+        if self._latencies:
+            p50, p99 = np.percentile(np.fromiter(self._latencies, dtype=np.float64), [50, 99]).tolist()
+            worst = max(self._latencies)
+        else:
+            p50 = p99 = worst = float("nan")
+        return ServerMetrics(
+            requests=self._requests,
+            batches=self._batches,
+            updates=self._updates,
+            errors=self._errors,
+            mean_batch_size=self._requests / self._batches if self._batches else 0.0,
+            largest_batch=self._largest_batch,
+            latency_p50=p50,
+            latency_p99=p99,
+            latency_max=worst,
+        )
+
+    def _running_queue(self) -> "asyncio.Queue[Any]":
+        if self._queue is None or not self.running:
+            raise RuntimeError("ProjectionServer is not running; call start() or use 'async with'")
+        return self._queue
+
+    async def _submit(
+        self, competitor: Any, opponent: Any, decimal_odds: Optional[float], bankroll: Optional[float]
+    ) -> Any:
+        queue = self._running_queue()
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        queue.put_nowait(_Request(competitor, opponent, decimal_odds, bankroll, future, time.perf_counter()))
+        return await future
+
+    async def _run(self, queue: "asyncio.Queue[Any]") -> None:
+        pending: Any = None
+        try:
+            while True:
+                item = pending if pending is not None else await queue.get()
+                pending = None
+                if item is _STOP:
+                    break
+                if isinstance(item, _Update):
+                    self._apply_update(item)
+                    continue
+                batch, pending = await self._collect(queue, item)
+                self._evaluate(batch)
+        finally:
+            # However the worker ends, the server can be started again.
+            self._worker = None
+        logger.debug("ProjectionServer stopped after %d requests in %d batches.", self._requests, self._batches)
+
+    async def _collect(self, queue: "asyncio.Queue[Any]", first: _Request) -> Tuple[List[_Request], Any]:
+        """Gathers requests after ``first`` until the batch is full, due, or an update or stop arrives."""
+        batch = [first]
+        # Stop collecting early enough to score the whole batch within the target.
+        deadline = first.submitted + self.latency_target - self._cost_per_request * self.max_batch_size
+        while len(batch) < self.max_batch_size:
+            if queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = queue.get_nowait()
+            if not isinstance(item, _Request):
+                return batch, item
+            batch.append(item)
+        return batch, None
+
+    def _evaluate(self, batch: List[_Request]) -> None:
+        started = time.perf_counter()
+        try:
+            probabilities = pair_probabilities(self.arena, [(r.competitor, r.opponent) for r in batch]).tolist()
+        except Exception as exc:
+            logger.error("Failed to score a batch of %d requests: %s", len(batch), exc)
+            self._errors += len(batch)
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        for request, probability in zip(batch, probabilities):
+            if request.future.done():
+                # The caller was cancelled.
+                continue
+            if request.decimal_odds is None:
+                request.future.set_result(probability)
+                continue
+            try:
+                request.future.set_result(self._quote(request, probability))
+            except Exception as exc:
+                self._errors += 1
+                request.future.set_exception(exc)
+        finished = time.perf_counter()
+        self._cost_per_request += _COST_SMOOTHING * ((finished - started) / len(batch) - self._cost_per_request)
+        self._latencies.extend(finished - request.submitted for request in batch)
+        self._requests += len(batch)
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(batch))
+
+    def _quote(self, request: _Request, probability: float) -> StakeQuote:
+        assert self.strategy is not None and request.decimal_odds is not None and request.bankroll is not None
+        strategy = strategy_for_bet(self.strategy, request.decimal_odds - 1.0, self.price_bets_at_true_odds)
+        fraction = strategy.evaluate(probability=probability, current_bankroll=request.bankroll)
+        return StakeQuote(probability, fraction, fraction * request.bankroll)
+
+    def _apply_update(self, update: _Update) -> None:
+        try:
+            self.arena.tournament(update.matchups)
+        except Exception as exc:
+            logger.error("Failed to apply %d results: %s", len(update.matchups), exc)
+            self._errors += 1
+            if not update.future.done():
+                update.future.set_exception(exc)
+            return
+        self._updates += 1
+        if not update.future.done():
+            update.future.set_result(None)
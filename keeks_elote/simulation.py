@@ -0,0 +1,301 @@
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from keeks_elote.data_handling import prepare_data
+from keeks_elote.model_evaluation import probability_matrix
+from keeks_elote.rating_arena import RatingArena
+
+logger = logging.getLogger(__name__)
+
+# Probabilities are clipped before taking log-odds so a certain result in the matrix
+# does not turn into an infinite logit when ratings move inside a simulation.
+_LOGIT_EPSILON = 1e-9
+
+
+def _bracket_order(size: int) -> List[int]:
+    """Seed positions for a standard single-elimination bracket (1 v N, 2 v N-1, ...)."""
+    order = [0]
+    while len(order) < size:
+        span = 2 * len(order)
+        order = [seed for top in order for seed in (top, span - 1 - top)]
+    return order
+
+
+def _log_odds(matrix: np.ndarray) -> np.ndarray:
+    clipped = np.clip(matrix, _LOGIT_EPSILON, 1 - _LOGIT_EPSILON)
+    return np.log(clipped) - np.log1p(-clipped)
+
+
+def _schedule_competitors(schedule: Dict[int, List[Dict[str, Any]]], current_wins: Mapping[Any, int]) -> List[Any]:
+    """Everyone with banked wins or a scheduled game, in first-seen order."""
+    seen: Dict[Any, None] = dict.fromkeys(current_wins)
+    for period in sorted(schedule):
+        for game in schedule[period]:
+            seen.setdefault(game["winner"])
+            seen.setdefault(game["loser"])
+    return list(seen)
+
+
+class SimulationResult:
+    """The outcome of a :class:`SeasonSimulator` run.
+
+    Win totals are stored competitor-major, one row of ``n_simulations`` per competitor,
+    so the summaries below are a handful of array reductions.
+
+    :param competitors: The competitors in row order.
+    :type competitors: Sequence[Any]
+    :param wins: Final win totals, shaped ``(n_competitors, n_simulations)``.
+    :type wins: np.ndarray
+    :param matrix: The pairwise probability matrix the simulations were drawn from.
+    :type matrix: np.ndarray
+    :param offsets: Per-simulation log-odds rating offsets at the end of the schedule,
+                    shaped like ``wins``, or ``None`` when ratings were held fixed.
+    :type offsets: Optional[np.ndarray]
+    :param rng: The generator used for tie-breaks and bracket draws.
+    :type rng: np.random.Generator
+    """
+
+    def __init__(
+        self,
+        competitors: Sequence[Any],
+        wins: np.ndarray,
+        matrix: np.ndarray,
+        offsets: Optional[np.ndarray],
+        rng: np.random.Generator,
+    ):
+        self.competitors = tuple(competitors)
+        self._index = {competitor: i for i, competitor in enumerate(self.competitors)}
+        self._wins = wins
+        self._matrix = matrix
+        self._offsets = offsets
+        self._rng = rng
+        self._ranks: Optional[np.ndarray] = None
+
+    @property
+    def n_simulations(self) -> int:
+        return int(self._wins.shape[1])
+
+    @property
+    def wins(self) -> np.ndarray:
+        """Final win totals shaped ``(n_simulations, n_competitors)``."""
+        return self._wins.T
+
+    def expected_wins(self) -> Dict[Any, float]:
+        """Mean final win total for each competitor."""
+        means = self._wins.mean(axis=1)
+        return {competitor: float(means[i]) for i, competitor in enumerate(self.competitors)}
+
+    def win_distribution(self, competitor: Any) -> np.ndarray:
+        """Probability of each final win total for one competitor.
+
+        :return: An array whose entry ``k`` is the probability of finishing with ``k`` wins.
+        :rtype: np.ndarray
+        """
+        row = self._wins[self._index[competitor]]
+        return np.bincount(row, minlength=int(self._wins.max()) + 1) / self.n_simulations
+
+    def win_distributions(self) -> Dict[Any, np.ndarray]:
+        """:meth:`win_distribution` for every competitor, on a shared win-total axis."""
+        size = int(self._wins.max()) + 1
+        return {
+            competitor: np.bincount(self._wins[i], minlength=size) / self.n_simulations
+            for i, competitor in enumerate(self.competitors)
+        }
+
+    def ranks(self) -> np.ndarray:
+        """Finishing position (0 is first) of each competitor in each simulation.
+
+        Competitors are ordered by wins, and equal win totals are broken uniformly at
+        random. The draw is made once and reused by every standings query on this result.
+
+        :return: An int array shaped ``(n_competitors, n_simulations)``.
+        :rtype: np.ndarray
+        """
+        if self._ranks is None:
+            # Wins are integers, so jitter in [0, 1) only ever reorders ties.
+            keys = self._wins + self._rng.random(self._wins.shape)
+            order = np.argsort(-keys, axis=0)
+            ranks = np.empty_like(order)
+            np.put_along_axis(ranks, order, np.arange(len(self.competitors))[:, None], axis=0)
+            self._ranks = ranks
+        return self._ranks
+
+    def standings_probabilities(self) -> np.ndarray:
+        """Probability of each competitor finishing in each position.
+
+        :return: An ``(N, N)`` array whose entry ``[i, r]`` is the probability that
+                 ``competitors[i]`` finishes in position ``r`` (0 is first).
+        :rtype: np.ndarray
+        """
+        n = len(self.competitors)
+        ranks = self.ranks()
+        counts = np.zeros((n, n))
+        for i in range(n):
+            counts[i] = np.bincount(ranks[i], minlength=n)
+        return counts / self.n_simulations
+
+    def playoff_odds(self, spots: int) -> Dict[Any, float]:
+        """Probability of each competitor finishing in the top ``spots`` positions."""
+        made = (self.ranks() < spots).mean(axis=1)
+        return {competitor: float(made[i]) for i, competitor in enumerate(self.competitors)}
+
+    def bracket_odds(
+        self, teams: Optional[int] = None, bracket: Optional[Sequence[Any]] = None
+    ) -> Dict[Any, np.ndarray]:
+        """Plays a single-elimination bracket at the end of every simulated season.
+
+        Either pass ``bracket``, a fixed list of competitors in bracket order (first plays
+        second, third plays fourth, and so on), or ``teams`` to seed the top ``teams``
+        finishers of each simulated season as 1 v N, 2 v N-1, ... Bracket games use the
+        same probabilities as the season, including any in-simulation rating movement.
+
+        :return: For each competitor, an array whose entry ``r`` is the probability of
+                 winning round ``r``; the last entry is the probability of the title.
+        :rtype: Dict[Any, np.ndarray]
+        """
+        if (teams is None) == (bracket is None):
+            raise ValueError("bracket_odds needs exactly one of teams or bracket.")
+        size = len(bracket) if bracket is not None else int(teams)  # type: ignore[arg-type]
+        if size < 2 or size & (size - 1):
+            raise ValueError(f"A single-elimination bracket needs a power-of-two field, got {size}.")
+
+        n_sims = self.n_simulations
+        if bracket is not None:
+            seeded = np.array([self._index[competitor] for competitor in bracket])
+            field = np.broadcast_to(seeded[:, None], (size, n_sims)).copy()
+        else:
+            if size > len(self.competitors):
+                raise ValueError(f"Cannot seed {size} teams from {len(self.competitors)} competitors.")
+            by_position = np.argsort(self.ranks(), axis=0)
+            field = by_position[_bracket_order(size)]
+
+        logits = _log_odds(self._matrix)
+        rounds = size.bit_length() - 1
+        won = np.zeros((len(self.competitors), rounds))
+        sims = np.arange(n_sims)
+        for round_no in range(rounds):
+            a, b = field[0::2], field[1::2]
+            log_odds = logits[a, b]
+            if self._offsets is not None:
+                log_odds = log_odds + self._offsets[a, sims] - self._offsets[b, sims]
+            a_wins = self._rng.random(log_odds.shape) < 1.0 / (1.0 + np.exp(-log_odds))
+            field = np.where(a_wins, a, b)
+            won[:, round_no] = np.bincount(field.ravel(), minlength=len(self.competitors))
+        won /= n_sims
+        return {competitor: won[i] for i, competitor in enumerate(self.competitors)}
+
+
+class SeasonSimulator:
+    """Plays out a remaining schedule many times from the arena's current ratings.
+
+    The pairwise probability matrix is built from ``expected_score`` once per call to
+    :meth:`simulate`, and then every simulation is sampled at once with NumPy, one
+    period at a time. The arena itself is never called inside the sampling loop and is
+    never modified.
+
+    With ``update_ratings`` each simulation also carries its own rating offsets, kept on
+    the log-odds scale: a game is priced at ``logit(P[a, b]) + offset[a] - offset[b]``
+    and after each simulated period both sides move by ``k_factor`` times the surprise,
+    the same form as an Elo update. A team that runs hot in one simulated season is then
+    favoured in that season's later games, which widens the win distributions the way
+    real rating movement does.
+
+    :param arena: The arena holding the current ratings.
+    :type arena: RatingArena
+    :param update_ratings: Move ratings inside each simulation. Defaults to false.
+    :type update_ratings: bool
+    :param k_factor: Log-odds step per unit of surprise when ``update_ratings`` is set.
+    :type k_factor: float
+    :param seed: Seed for the random generator, for reproducible runs.
+    :type seed: Optional[int]
+    """
+
+    def __init__(
+        self,
+        arena: RatingArena,
+        update_ratings: bool = False,
+        k_factor: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        if k_factor < 0:
+            raise ValueError(f"k_factor must be non-negative, got {k_factor!r}")
+        self._arena = arena
+        self.update_ratings = update_ratings
+        self.k_factor = k_factor
+        self._seed_sequence = np.random.SeedSequence(seed)
+
+    def simulate(
+        self,
+        schedule: Dict[int, List[Dict[str, Any]]],
+        n_simulations: int = 10000,
+        current_wins: Optional[Mapping[Any, int]] = None,
+        competitors: Optional[Sequence[Any]] = None,
+    ) -> SimulationResult:
+        """Simulates the remaining schedule.
+
+        The schedule uses the same period-keyed schema as
+        :meth:`~keeks_elote.backtest.Backtest.run_explicit`. The ``winner`` and ``loser``
+        labels only name the two sides; which one wins is what gets simulated.
+
+        :param schedule: Remaining games keyed by period.
+        :type schedule: Dict[int, List[Dict[str, Any]]]
+        :param n_simulations: Number of seasons to simulate.
+        :type n_simulations: int
+        :param current_wins: Wins already banked, added to every simulated total.
+        :type current_wins: Optional[Mapping[Any, int]]
+        :param competitors: The competitors to report on. Defaults to everyone named in
+                            the schedule or in ``current_wins``.
+        :type competitors: Optional[Sequence[Any]]
+        :return: The simulated win totals and the queries built on them.
+        :rtype: SimulationResult
+        :raises ValueError: If ``competitors`` leaves out anyone in the schedule or in
+                            ``current_wins``.
+        """
+        if n_simulations < 1:
+            raise ValueError(f"n_simulations must be at least 1, got {n_simulations!r}")
+        schedule = prepare_data(schedule)
+        current_wins = dict(current_wins or {})
+        required = _schedule_competitors(schedule, current_wins)
+        if competitors is None:
+            competitors = required
+        index = {competitor: i for i, competitor in enumerate(competitors)}
+        missing = [competitor for competitor in required if competitor not in index]
+        if missing:
+            raise ValueError(f"competitors must include everyone in the schedule and current_wins; missing {missing!r}")
+
+        logger.info("Simulating %d seasons for %d competitors.", n_simulations, len(competitors))
+        matrix = probability_matrix(self._arena, competitors)
+        logits = _log_odds(matrix)
+
+        sample_seed, result_seed = self._seed_sequence.spawn(2)
+        rng = np.random.default_rng(sample_seed)
+
+        n = len(competitors)
+        wins = np.zeros((n, n_simulations), dtype=np.int32)
+        for competitor, banked in current_wins.items():
+            wins[index[competitor]] += int(banked)
+        offsets = np.zeros((n, n_simulations)) if self.update_ratings else None
+
+        for period in sorted(schedule):
+            games = schedule[period]
+            if not games:
+                continue
+            a = np.array([index[game["winner"]] for game in games])
+            b = np.array([index[game["loser"]] for game in games])
+            draws = rng.random((len(games), n_simulations))
+            if offsets is None:
+                a_wins = draws < matrix[a, b][:, None]
+            else:
+                p = 1.0 / (1.0 + np.exp(-(logits[a, b][:, None] + offsets[a] - offsets[b])))
+                a_wins = draws < p
+                surprise = self.k_factor * (a_wins - p)
+            # A competitor can appear more than once in a period, and fancy-indexed +=
+            # would drop the repeats; np.add.at accumulates them.
+            sides = np.concatenate((a, b))
+            np.add.at(wins, sides, np.concatenate((a_wins, ~a_wins)))
+            if offsets is not None:
+                np.add.at(offsets, sides, np.concatenate((surprise, -surprise)))
+
+        return SimulationResult(competitors, wins, matrix, offsets, np.random.default_rng(result_seed))
@@ -0,0 +1,128 @@
+import logging
+from typing import TYPE_CHECKING, Mapping, Optional, Protocol, Sequence, Union
+
+from keeks_elote.backtest import PeriodSummary
+
+if TYPE_CHECKING:
+    from keeks.bankroll import BankRoll
+
+logger = logging.getLogger(__name__)
+
+
+class StopRule(Protocol):
+    """Decides after each period whether a betting run should end early.
+
+    Called with the run's :class:`~keeks_elote.backtest.PeriodSummary` list so far (the
+    just-finished period last) and its bankroll. Returns a short reason to stop, or
+    ``None`` to keep going.
+    """
+
+    def __call__(self, summaries: Sequence[PeriodSummary], bankroll: "BankRoll") -> Optional[str]: ...
+
+
+def _starting_funds(bankroll: "BankRoll") -> float:
+    return float(bankroll.history[0]) if bankroll.history else float(bankroll.total_funds)
+
+
+class RuinStop:
+    """Stops once the bankroll is at or below ``min_fraction`` of its starting funds.
+
+    :param min_fraction: The ruin threshold as a fraction of the starting funds.
+    :type min_fraction: float
+    """
+
+    def __init__(self, min_fraction: float = 0.01):
+        if not 0.0 <= min_fraction < 1.0:
+            raise ValueError("min_fraction must be in [0, 1).")
+        self.min_fraction = min_fraction
+
+    def __call__(self, summaries: Sequence[PeriodSummary], bankroll: "BankRoll") -> Optional[str]:
+        floor = self.min_fraction * _starting_funds(bankroll)
+        if bankroll.total_funds <= floor:
+            return f"ruin: bankroll {bankroll.total_funds:.2f} at or below {floor:.2f}"
+        return None
+
+
+class DrawdownStop:
+    """Stops once the bankroll has fallen ``max_drawdown`` or more below its peak.
+
+    The peak is taken over the starting funds and every period's closing bankroll.
+
+    :param max_drawdown: The largest tolerated fall from the peak, as a fraction. Defaults
+                         to the bankroll's own ``max_draw_down``.
+    :type max_drawdown: Optional[float]
+    """
+
+    def __init__(self, max_drawdown: Optional[float] = None):
+        if max_drawdown is not None and not 0.0 < max_drawdown <= 1.0:
+            raise ValueError("max_drawdown must be in (0, 1].")
+        self.max_drawdown = max_drawdown
+
+    def __call__(self, summaries: Sequence[PeriodSummary], bankroll: "BankRoll") -> Optional[str]:
+        limit = self.max_drawdown if self.max_drawdown is not None else bankroll.max_draw_down
+        if limit is None:
+            return None
+        peak = max(_starting_funds(bankroll), max((summary.bankroll for summary in summaries), default=0.0))
+        drawdown = 1.0 - bankroll.total_funds / peak if peak > 0 else 0.0
+        if drawdown >= limit:
+            return f"drawdown: {drawdown:.1%} below the peak of {peak:.2f} (limit {limit:.1%})"
+        return None
+
+
+class MinimumBetsStop:
+    """Stops a run that has placed fewer than ``min_bets`` bets by the end of ``by_period``.
+
+    :param min_bets: The bets the strategy must have placed.
+    :type min_bets: int
+    :param by_period: The period by which they must have been placed.
+    :type by_period: int
+    """
+
+    def __init__(self, min_bets: int, by_period: int):
+        self.min_bets = min_bets
+        self.by_period = by_period
+
+    def __call__(self, summaries: Sequence[PeriodSummary], bankroll: "BankRoll") -> Optional[str]:
+        if not summaries or summaries[-1].period < self.by_period:
+            return None
+        placed = sum(summary.bets_placed for summary in summaries)
+        if placed < self.min_bets:
+            return f"inactive: {placed} bets placed by period {summaries[-1].period}, fewer than {self.min_bets}"
+        return None
+
+
+class BenchmarkStop:
+    """Stops once the bankroll trails a benchmark run's by more than ``tolerance``.
+
+    :param benchmark: The benchmark's closing bankroll by period, or its
+                      :attr:`~keeks_elote.backtest.Backtest.period_summaries`.
+    :type benchmark: Union[Mapping[int, float], Sequence[PeriodSummary]]
+    :param tolerance: How far behind, as a fraction of the benchmark bankroll, a run may fall.
+    :type tolerance: float
+    :param after_period: Only compare periods after this one, giving the run time to warm up.
+    :type after_period: Optional[int]
+    """
+
+    def __init__(
+        self,
+        benchmark: Union[Mapping[int, float], Sequence[PeriodSummary]],
+        tolerance: float = 0.0,
+        after_period: Optional[int] = None,
+    ):
+        if isinstance(benchmark, Mapping):
+            self.benchmark = {period: float(funds) for period, funds in benchmark.items()}
+        else:
+            self.benchmark = {summary.period: summary.bankroll for summary in benchmark}
+        self.tolerance = tolerance
+        self.after_period = after_period
+
+    def __call__(self, summaries: Sequence[PeriodSummary], bankroll: "BankRoll") -> Optional[str]:
+        if not summaries:
+            return None
+        period = summaries[-1].period
+        target = self.benchmark.get(period)
+        if target is None or (self.after_period is not None and period <= self.after_period):
+            return None
+        if bankroll.total_funds < target * (1.0 - self.tolerance):
+            return f"behind benchmark: {bankroll.total_funds:.2f} against {target:.2f} after period {period}"
+        return None
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from keeks_elote.records import CompiledPeriod, GameRecord
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = np.zeros(0, dtype=np.intp)
+_EMPTY.flags.writeable = False
+
+
+class TimelineEntry(NamedTuple):
+    """One of a competitor's games: its ``period``, the ``game`` and whether the competitor ``won`` it."""
+
+    period: int
+    game: GameRecord
+    won: bool
+
+
+class GameTimeline:
+    """Each competitor's games in play order, for as-of lookups without scanning every period.
+
+    Games are numbered by their position in play order (periods ascending, then the order
+    within each period). For every competitor the timeline keeps a sorted array of the
+    positions of its games and a matching array of their periods, built in one pass. A
+    query such as "the games of X before period t" is then one binary search over X's
+    periods plus a slice, O(log n + k) for k games returned.
+
+    Usually reached through :attr:`CompiledDataset.timeline
+    <keeks_elote.dataset.CompiledDataset.timeline>`.
+
+    :param periods: The periods, in increasing order.
+    :type periods: Iterable[CompiledPeriod]
+    """
+
+    def __init__(self, periods: Iterable[CompiledPeriod]):
+        games: List[GameRecord] = []
+        game_periods: List[int] = []
+        positions: Dict[Any, List[int]] = {}
+        for entry in periods:
+            for game in entry.games:
+                position = len(games)
+                games.append(game)
+                game_periods.append(entry.period)
+                positions.setdefault(game.winner, []).append(position)
+                if game.loser != game.winner:
+                    positions.setdefault(game.loser, []).append(position)
+        self._games: Tuple[GameRecord, ...] = tuple(games)
+        self._periods = np.asarray(game_periods, dtype=np.int64)
+        self._periods.flags.writeable = False
+        self._positions: Dict[Any, Tuple[np.ndarray, np.ndarray]] = {}
+        for competitor, indices in positions.items():
+            index_array = np.asarray(indices, dtype=np.intp)
+            period_array = self._periods[index_array]
+            index_array.flags.writeable = False
+            period_array.flags.writeable = False
+            self._positions[competitor] = (index_array, period_array)
+        logger.debug("Indexed %d games for %d competitors.", len(self._games), len(self._positions))
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, competitor: object) -> bool:
+        return competitor in self._positions
+
+    @property
+    def competitors(self) -> List[Any]:
+        """Every competitor with at least one game."""
+        return list(self._positions)
+
+    def positions(self, competitor: Any, start: Optional[int] = None, before: Optional[int] = None) -> np.ndarray:
+        """The play-order positions of ``competitor``'s games in periods ``start <= period < before``.
+
+        :param competitor: The competitor's label.
+        :type competitor: Any
+        :param start: The first period to include. Defaults to the first period.
+        :type start: Optional[int]
+        :param before: The first period to exclude. Defaults to none.
+        :type before: Optional[int]
+        :return: A read-only array of positions, ascending. Empty for unknown competitors.
+        :rtype: np.ndarray
+        """
+        indexed = self._positions.get(competitor)
+        if indexed is None:
+            return _EMPTY
+        positions, periods = indexed
+        low = 0 if start is None else int(np.searchsorted(periods, start, side="left"))
+        high = len(periods) if before is None else int(np.searchsorted(periods, before, side="left"))
+        return positions[low : max(low, high)]
+
+    def count(self, competitor: Any, before: Optional[int] = None) -> int:
+        """How many games ``competitor`` played before period ``before`` (in total without it)."""
+        return len(self.positions(competitor, before=before))
+
+    def games(
+        self,
+        competitor: Any,
+        start: Optional[int] = None,
+        before: Optional[int] = None,
+        last: Optional[int] = None,
+    ) -> List[TimelineEntry]:
+        """``competitor``'s games in periods ``start <= period < before``, oldest first.
+
+        :param competitor: The competitor's label.
+        :type competitor: Any
+        :param start: The first period to include. Defaults to the first period.
+        :type start: Optional[int]
+        :param before: The first period to exclude. Defaults to none.
+        :type before: Optional[int]
+        :param last: Keep only the most recent ``last`` of those games.
+        :type last: Optional[int]
+        :return: The games with their periods and the competitor's result.
+        :rtype: List[TimelineEntry]
+        """
+        positions = self.positions(competitor, start, before)
+        if last is not None:
+            positions = positions[max(len(positions) - last, 0) :]
+        games, periods = self._games, self._periods
+        return [
+            TimelineEntry(int(periods[position]), games[position], games[position].winner == competitor)
+            for position in positions.tolist()
+        ]
+
+    def recent(
+        self, competitors: Iterable[Any], last: int, before: Optional[int] = None
+    ) -> Dict[Any, List[TimelineEntry]]:
+        """Each competitor's ``last`` games before period ``before``, e.g. for everyone on the next slate.
+
+        :param competitors: The competitors' labels.
+        :type competitors: Iterable[Any]
+        :param last: How many of each competitor's most recent games to return.
+        :type last: int
+        :param before: The first period to exclude. Defaults to none.
+        :type before: Optional[int]
+        :return: Each competitor mapped to its games, oldest first.
+        :rtype: Dict[Any, List[TimelineEntry]]
+        """
+        return {competitor: self.games(competitor, before=before, last=last) for competitor in competitors}
@@ -0,0 +1,293 @@
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from keeks_elote.backtest import Backtest
+from keeks_elote.observers import BacktestObserver
+from keeks_elote.rating_arena import RatingArena
+from keeks_elote.records import GameRecord
+
+if TYPE_CHECKING:
+    from keeks.bankroll import BankRoll
+    from keeks.binary_strategies.base import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+# Probabilities are clipped before scoring so one confident miss cannot make the log loss infinite.
+_LOG_LOSS_EPSILON = 1e-15
+
+
+class Fold(NamedTuple):
+    """One walk-forward split: ratings are learned on ``train_periods`` and scored on ``test_periods``."""
+
+    number: int
+    train_periods: Tuple[int, ...]
+    test_periods: Tuple[int, ...]
+
+
+class FoldResult(NamedTuple):
+    """Out-of-sample metrics for one fold.
+
+    Probability metrics cover every test game, priced from the ratings as they stood
+    before the game's period was played. Bankroll metrics come from betting the test
+    periods only.
+    """
+
+    fold: Fold
+    games: int
+    log_loss: float
+    brier: float
+    accuracy: float
+    bets: int
+    staked: float
+    starting_bankroll: float
+    final_bankroll: float
+    max_drawdown: float
+
+    @property
+    def bankroll_return(self) -> float:
+        """Final bankroll relative to the starting bankroll, minus one."""
+        return self.final_bankroll / self.starting_bankroll - 1.0 if self.starting_bankroll else math.nan
+
+
+def walk_forward_folds(
+    periods: Iterable[int],
+    n_test: int = 1,
+    min_train: int = 1,
+    window: Optional[int] = None,
+    step: Optional[int] = None,
+    group_key: Optional[Callable[[int], Hashable]] = None,
+) -> List[Fold]:
+    """Splits ordered periods into walk-forward folds.
+
+    Periods are grouped into units (each period is its own unit unless ``group_key``
+    maps periods to, say, seasons), and every fold tests the ``n_test`` units that follow
+    its training units. Training is expanding (everything before the test units) by
+    default, or rolling over the last ``window`` units. Each fold moves ``step`` units on
+    from the last, ``n_test`` by default, so test units do not overlap.
+
+    :param periods: The period keys.
+    :type periods: Iterable[int]
+    :param n_test: Units tested per fold.
+    :type n_test: int
+    :param min_train: Units trained on before the first fold.
+    :type min_train: int
+    :param window: Train on only the last ``window`` units, or ``None`` for all of them.
+    :type window: Optional[int]
+    :param step: Units between the starts of consecutive folds' test sets.
+    :type step: Optional[int]
+    :param group_key: Maps a period to its unit, such as its season.
+    :type group_key: Optional[Callable[[int], Hashable]]
+    :return: The folds in order.
+    :rtype: List[Fold]
+    :raises ValueError: If a size is not positive, or ``window`` is smaller than ``min_train``.
+    """
+    step = n_test if step is None else step
+    if min(n_test, min_train, step) < 1 or (window is not None and window < min_train):
+        raise ValueError("n_test, min_train and step must be positive and window at least min_train.")
+
+    units: Dict[Hashable, List[int]] = {}
+    for period in sorted(periods):
+        units.setdefault(group_key(period) if group_key else period, []).append(period)
+    ordered = list(units.values())
+
+    folds: List[Fold] = []
+    for test_start in range(min_train, len(ordered) - n_test + 1, step):
+        train_start = 0 if window is None else max(test_start - window, 0)
+        folds.append(
+            Fold(
+                len(folds),
+                tuple(p for unit in ordered[train_start:test_start] for p in unit),
+                tuple(p for unit in ordered[test_start : test_start + n_test] for p in unit),
+            )
+        )
+    return folds
+
+
+def _probability_scores(outcomes: Sequence[Tuple[float, bool]]) -> Tuple[float, float, float]:
+    """Log loss, Brier score and accuracy of ``(probability, happened)`` pairs."""
+    if not outcomes:
+        return math.nan, math.nan, math.nan
+    log_loss = brier = correct = 0.0
+    for probability, happened in outcomes:
+        p = min(max(probability, _LOG_LOSS_EPSILON), 1.0 - _LOG_LOSS_EPSILON)
+        log_loss -= math.log(p if happened else 1.0 - p)
+        brier += (probability - happened) ** 2
+        correct += 0.5 if probability == 0.5 else float((probability > 0.5) == happened)
+    n = len(outcomes)
+    return log_loss / n, brier / n, correct / n
+
+
+class _PregameScores(BacktestObserver):
+    """Scores each test period's games with the ratings they were priced from, as the period starts."""
+
+    def __init__(self, backtest: Backtest, periods: Iterable[int]):
+        self.backtest = backtest
+        self.periods = set(periods)
+        self.outcomes: List[Tuple[float, bool]] = []
+
+    def on_period_start(self, period: int, games: Sequence[GameRecord]) -> None:
+        if period in self.periods:
+            arena = self.backtest.arena
+            self.outcomes.extend((float(arena.expected_score(game.winner, game.loser)), True) for game in games)
+
+
+def run_fold(
+    fold: Fold,
+    data: Dict[int, List[Dict[str, Any]]],
+    arena_factory: Callable[[], RatingArena],
+    strategy: "BaseStrategy",
+    bankroll_factory: Callable[[], "BankRoll"],
+    price_bets_at_true_odds: bool = True,
+) -> FoldResult:
+    """Warms a fresh arena on a fold's training periods and scores its test periods.
+
+    Betting starts with the first test period, priced from the ratings at the end of
+    training, exactly as :meth:`Backtest.run_explicit` would with
+    ``period_to_start_betting`` set to the last training period.
+
+    :param fold: The fold to run.
+    :type fold: Fold
+    :param data: Game data holding at least the fold's periods.
+    :type data: Dict[int, List[Dict[str, Any]]]
+    :param arena_factory: Builds the fresh, unrated arena.
+    :type arena_factory: Callable[[], RatingArena]
+    :param strategy: The betting strategy.
+    :type strategy: BaseStrategy
+    :param bankroll_factory: Builds the fold's starting bankroll.
+    :type bankroll_factory: Callable[[], BankRoll]
+    :param price_bets_at_true_odds: As for :meth:`Backtest.run_explicit`.
+    :type price_bets_at_true_odds: bool
+    :return: The fold's metrics.
+    :rtype: FoldResult
+    """
+    periods = fold.train_periods + fold.test_periods
+    test_periods = set(fold.test_periods)
+    backtest = Backtest(arena_factory(), fast=True)
+    scores = _PregameScores(backtest, test_periods)
+    backtest.add_observer(scores)
+    bankroll = bankroll_factory()
+    start_betting = fold.train_periods[-1] if fold.train_periods else periods[0] - 1
+    starting_funds = peak = bankroll.total_funds
+    backtest.run_explicit(
+        {period: data.get(period, []) for period in periods},
+        strategy,
+        bankroll,
+        period_to_start_betting=start_betting,
+        price_bets_at_true_odds=price_bets_at_true_odds,
+    )
+
+    bets = 0
+    staked = max_drawdown = 0.0
+    for summary in backtest.period_summaries:
+        if summary.period in test_periods:
+            bets += summary.bets_placed
+            staked += summary.staked
+            peak = max(peak, summary.bankroll)
+            max_drawdown = max(max_drawdown, 1.0 - summary.bankroll / peak if peak else 0.0)
+
+    outcomes = scores.outcomes
+    log_loss, brier, accuracy = _probability_scores(outcomes)
+    return FoldResult(
+        fold,
+        len(outcomes),
+        log_loss,
+        brier,
+        accuracy,
+        bets,
+        staked,
+        starting_funds,
+        bankroll.total_funds,
+        max_drawdown,
+    )
+
+
+class CrossValidationResult:
+    """The per-fold results of :func:`cross_validate`, in fold order.
+
+    :param folds: One result per fold.
+    :type folds: Sequence[FoldResult]
+    """
+
+    def __init__(self, folds: Sequence[FoldResult]):
+        self.folds = list(folds)
+
+    def aggregate(self) -> Dict[str, float]:
+        """Metrics across all folds.
+
+        Probability metrics are pooled over every test game (each fold weighted by its
+        game count); bankroll metrics summarize the folds' independent bankrolls.
+
+        :return: ``games``, ``log_loss``, ``brier``, ``accuracy``, ``bets``, ``staked``,
+                 ``mean_return``, ``worst_return`` and ``max_drawdown``.
+        :rtype: Dict[str, float]
+        """
+        scored = [result for result in self.folds if result.games]
+        games = sum(result.games for result in scored)
+
+        def pooled(metric: str) -> float:
+            return sum(getattr(r, metric) * r.games for r in scored) / games if games else math.nan
+
+        returns = [result.bankroll_return for result in self.folds]
+        return {
+            "folds": float(len(self.folds)),
+            "games": float(games),
+            "log_loss": pooled("log_loss"),
+            "brier": pooled("brier"),
+            "accuracy": pooled("accuracy"),
+            "bets": float(sum(result.bets for result in self.folds)),
+            "staked": sum(result.staked for result in self.folds),
+            "mean_return": sum(returns) / len(returns) if returns else math.nan,
+            "worst_return": min(returns) if returns else math.nan,
+            "max_drawdown": max((result.max_drawdown for result in self.folds), default=math.nan),
+        }
+
+
+def cross_validate(
+    data: Dict[int, List[Dict[str, Any]]],
+    arena_factory: Callable[[], RatingArena],
+    strategy: "BaseStrategy",
+    bankroll_factory: Callable[[], "BankRoll"],
+    folds: Sequence[Fold],
+    max_workers: Optional[int] = None,
+    price_bets_at_true_odds: bool = True,
+) -> CrossValidationResult:
+    """Runs :func:`run_fold` for every fold, in parallel processes.
+
+    Each worker receives only its fold's periods. The factories and strategy are sent to
+    the workers, so they must be picklable: module-level functions, classes or
+    :func:`functools.partial` objects rather than lambdas. With ``max_workers=1`` the
+    folds run in this process instead.
+
+    :param data: Game data keyed by period.
+    :type data: Dict[int, List[Dict[str, Any]]]
+    :param arena_factory: Builds a fresh, unrated arena for each fold.
+    :type arena_factory: Callable[[], RatingArena]
+    :param strategy: The betting strategy.
+    :type strategy: BaseStrategy
+    :param bankroll_factory: Builds each fold's starting bankroll.
+    :type bankroll_factory: Callable[[], BankRoll]
+    :param folds: The folds, for example from :func:`walk_forward_folds`.
+    :type folds: Sequence[Fold]
+    :param max_workers: Worker processes. Defaults to the CPU count.
+    :type max_workers: Optional[int]
+    :param price_bets_at_true_odds: As for :meth:`Backtest.run_explicit`.
+    :type price_bets_at_true_odds: bool
+    :return: The per-fold results, in fold order.
+    :rtype: CrossValidationResult
+    """
+    fold_data = [{period: data.get(period, []) for period in fold.train_periods + fold.test_periods} for fold in folds]
+    arguments = (
+        folds,
+        fold_data,
+        [arena_factory] * len(folds),
+        [strategy] * len(folds),
+        [bankroll_factory] * len(folds),
+        [price_bets_at_true_odds] * len(folds),
+    )
+    logger.info("Cross-validating %d folds.", len(folds))
+    if max_workers == 1:
+        return CrossValidationResult(list(map(run_fold, *arguments)))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return CrossValidationResult(list(pool.map(run_fold, *arguments)))
@@ -0,0 +1,450 @@
+import hashlib
+import itertools
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from keeks_elote.backtest import Backtest, PeriodSummary
+from keeks_elote.rating_arena import RatingArena
+from keeks_elote.stopping import StopRule
+
+if TYPE_CHECKING:
+    from keeks.bankroll import BankRoll
+    from keeks.binary_strategies.base import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        payload BLOB NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        worker TEXT,
+        lease_expires REAL,
+        result BLOB,
+        error TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, id)",
+    """CREATE TABLE IF NOT EXISTS data_slices (
+        key TEXT PRIMARY KEY,
+        payload BLOB NOT NULL
+    )""",
+)
+
+
+class _DataRef(NamedTuple):
+    """Stands in for a :class:`SweepJob`'s data in the queue, naming its row in ``data_slices``."""
+
+    key: str
+
+
+class Lease(NamedTuple):
+    """A job handed to a worker: run ``job()``, then complete or fail ``job_id``."""
+
+    job_id: int
+    attempt: int
+    job: Callable[[], Any]
+
+
+class WorkQueue:
+    """A durable job queue in one SQLite file, shared by any number of worker processes.
+
+    Jobs are pickled callables. A worker :meth:`lease`\\ s the oldest pending job for
+    ``lease_seconds``, calls :meth:`heartbeat` while it runs to keep the lease, and then
+    calls :meth:`complete` with the result or :meth:`fail` with the error. A job whose
+    lease runs out, because its worker crashed or lost the filesystem, goes back to
+    pending on the next :meth:`lease` call. After ``max_attempts`` leases it is marked
+    failed instead.
+
+    Every operation opens its own connection and holds the database lock only briefly,
+    so queue objects can be shared between threads and forked processes. For workers on
+    several nodes, put the file on a shared filesystem with working POSIX locks. SQLite's
+    default rollback journal is used because WAL mode does not work over network
+    filesystems.
+
+    A :class:`SweepJob`'s data is stored once per distinct slice rather than in every
+    job's payload. Each queue object keeps the ``max_cached_slices`` slices it leased
+    most recently unpickled, so jobs sharing a slice do not load it again.
+
+    Payloads and results are unpickled, so only open queue files you trust.
+
+    :param path: The SQLite file, created if missing.
+    :type path: Union[str, Path]
+    :param lease_seconds: How long a lease lasts without a heartbeat.
+    :type lease_seconds: float
+    :param max_attempts: Leases a job gets before it is marked failed.
+    :type max_attempts: int
+    :param timeout: Seconds to wait for another process's lock on the database.
+    :type timeout: float
+    :param clock: The time source for leases, ``time.time`` by default.
+    :type clock: Callable[[], float]
+    :param max_cached_slices: How many unpickled data slices to keep in memory.
+    :type max_cached_slices: int
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        timeout: float = 60.0,
+        clock: Callable[[], float] = time.time,
+        max_cached_slices: int = 16,
+    ):
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be positive.")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if max_cached_slices < 1:
+            raise ValueError("max_cached_slices must be at least 1.")
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.clock = clock
+        self.max_cached_slices = max_cached_slices
+        # Insertion order doubles as recency order: a hit is moved to the end.
+        self._data_slices: Dict[str, Any] = {}
+        with self._transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """A connection inside ``BEGIN IMMEDIATE``, committed on success and closed afterwards."""
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def submit(self, job: Callable[[], Any]) -> int:
+        """Adds one job and returns its id."""
+        return self.submit_many([job])[0]
+
+    def submit_many(self, jobs: Iterable[Callable[[], Any]]) -> List[int]:
+        """Adds jobs in one transaction.
+
+        :param jobs: Picklable callables taking no arguments, such as :class:`SweepJob`.
+        :type jobs: Iterable[Callable[[], Any]]
+        :return: The new job ids, in order.
+        :rtype: List[int]
+        """
+        # Jobs built by sweep_jobs share one dict per slice, so each slice is pickled once.
+        slices: Dict[int, Tuple[str, bytes]] = {}
+        payloads = []
+        for job in jobs:
+            stored: Any = job
+            if isinstance(job, SweepJob) and not isinstance(job.data, _DataRef):
+                if id(job.data) not in slices:
+                    data = pickle.dumps(job.data, protocol=pickle.HIGHEST_PROTOCOL)
+                    slices[id(job.data)] = (hashlib.blake2b(data, digest_size=16).hexdigest(), data)
+                stored = job._replace(data=_DataRef(slices[id(job.data)][0]))  # type: ignore[arg-type]
+            payloads.append(pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL))
+        ids = []
+        with self._transaction() as connection:
+            connection.executemany("INSERT OR IGNORE INTO data_slices (key, payload) VALUES (?, ?)", slices.values())
+            for payload in payloads:
+                cursor = connection.execute("INSERT INTO jobs (payload, status) VALUES (?, ?)", (payload, PENDING))
+                ids.append(int(cursor.lastrowid or 0))
+        logger.info("Submitted %d jobs (%d data slices) to %s.", len(ids), len(slices), self.path)
+        return ids
+
+    def _data_slice(self, key: str) -> Any:
+        """A stored data slice, unpickled on first use and kept while it is recently used."""
+        data = self._data_slices.pop(key, None)
+        if data is None:
+            with self._transaction() as connection:
+                row = connection.execute("SELECT payload FROM data_slices WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                raise KeyError(f"Data slice {key} is missing from {self.path}.")
+            data = pickle.loads(row[0])
+            if len(self._data_slices) >= self.max_cached_slices:
+                del self._data_slices[next(iter(self._data_slices))]
+        self._data_slices[key] = data
+        return data
+
+    def _reclaim_expired(self, connection: sqlite3.Connection, now: float) -> None:
+        expired = connection.execute(
+            "SELECT id, attempts, worker FROM jobs WHERE status = ? AND lease_expires < ?", (LEASED, now)
+        ).fetchall()
+        for job_id, attempts, worker in expired:
+            if attempts >= self.max_attempts:
+                status, error = FAILED, f"Lease held by {worker} expired on attempt {attempts}."
+            else:
+                status, error = PENDING, None
+            logger.warning("Lease on job %d held by %s expired; marking it %s.", job_id, worker, status)
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                (status, error, job_id),
+            )
+
+    def lease(self, worker: str) -> Optional[Lease]:
+        """Leases the oldest pending job to ``worker``, first requeueing expired leases.
+
+        :param worker: A name unique to the calling worker.
+        :type worker: str
+        :return: The lease, or ``None`` when no job is pending.
+        :rtype: Optional[Lease]
+        """
+        now = self.clock()
+        with self._transaction() as connection:
+            self._reclaim_expired(connection, now)
+            row = connection.execute(
+                "SELECT id, attempts, payload FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (PENDING,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, attempts, payload = row
+            connection.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, worker = ?, lease_expires = ? WHERE id = ?",
+                (LEASED, attempts + 1, worker, now + self.lease_seconds, job_id),
+            )
+        job = pickle.loads(payload)
+        if isinstance(job, SweepJob) and isinstance(job.data, _DataRef):
+            job = job._replace(data=self._data_slice(job.data.key))
+        return Lease(job_id, attempts + 1, job)
+
+    def _update_held(self, job_id: int, worker: str, assignments: str, values: Tuple[Any, ...]) -> bool:
+        """Applies an update to a job only while ``worker`` still holds its lease."""
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status = ? AND worker = ?",
+                (*values, job_id, LEASED, worker),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extends a lease by ``lease_seconds``; ``False`` means the worker has lost it."""
+        return self._update_held(job_id, worker, "lease_expires = ?", (self.clock() + self.lease_seconds,))
+
+    def complete(self, job_id: int, worker: str, result: Any) -> bool:
+        """Stores a job's result; ``False`` (and nothing stored) if the lease was lost."""
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._update_held(
+            job_id, worker, "status = ?, result = ?, lease_expires = NULL, error = NULL", (DONE, payload)
+        )
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Records a failed attempt, requeueing the job unless it has used every attempt."""
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = ? AND worker = ?", (job_id, LEASED, worker)
+            ).fetchone()
+            if row is None:
+                return False
+            status = FAILED if row[0] >= self.max_attempts else PENDING
+            connection.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ? WHERE id = ?",
+                (status, error, job_id),
+            )
+        return True
+
+    def counts(self) -> Dict[str, int]:
+        """The number of jobs in each status."""
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def results(self) -> Dict[int, Any]:
+        """Every completed job's result, by job id."""
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT id, result FROM jobs WHERE status = ? ORDER BY id", (DONE,)).fetchall()
+        return {job_id: pickle.loads(result) for job_id, result in rows}
+
+    def failures(self) -> Dict[int, str]:
+        """The last error of every job that used all its attempts, by job id."""
+        with self._transaction() as connection:
+            rows = connection.execute("SELECT id, error FROM jobs WHERE status = ? ORDER BY id", (FAILED,)).fetchall()
+        return dict(rows)
+
+
+def _default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _heartbeat_until(queue: WorkQueue, lease: Lease, worker: str, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        if not queue.heartbeat(lease.job_id, worker):
+            logger.warning("Worker %s lost its lease on job %d.", worker, lease.job_id)
+            return
+
+
+def run_worker(
+    queue: WorkQueue,
+    worker: Optional[str] = None,
+    poll_interval: float = 5.0,
+    heartbeat_interval: Optional[float] = None,
+    stop_when_empty: bool = True,
+    max_jobs: Optional[int] = None,
+) -> int:
+    """Leases and runs jobs from ``queue`` until it is drained (or forever).
+
+    Each job runs in this thread while a background thread heartbeats its lease. The
+    result is stored with :meth:`WorkQueue.complete`. An exception is recorded with
+    :meth:`WorkQueue.fail`, and the job is retried until it runs out of attempts. Start
+    one worker per core on each node, all pointed at the same queue file.
+
+    :param queue: The queue to work.
+    :type queue: WorkQueue
+    :param worker: This worker's name. Defaults to ``hostname:pid``.
+    :type worker: Optional[str]
+    :param poll_interval: Seconds to wait before polling again when nothing is pending.
+    :type poll_interval: float
+    :param heartbeat_interval: Seconds between heartbeats. Defaults to a third of the lease.
+    :type heartbeat_interval: Optional[float]
+    :param stop_when_empty: Return once no job is pending or leased instead of polling.
+    :type stop_when_empty: bool
+    :param max_jobs: Return after running this many jobs.
+    :type max_jobs: Optional[int]
+    :return: The number of jobs this worker ran.
+    :rtype: int
+    """
+    worker = worker or _default_worker_name()
+    interval = heartbeat_interval or queue.lease_seconds / 3.0
+    ran = 0
+    while max_jobs is None or ran < max_jobs:
+        lease = queue.lease(worker)
+        if lease is None:
+            counts = queue.counts()
+            if stop_when_empty and counts[PENDING] == counts[LEASED] == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+        logger.info("Worker %s running job %d (attempt %d).", worker, lease.job_id, lease.attempt)
+        stop = threading.Event()
+        beater = threading.Thread(target=_heartbeat_until, args=(queue, lease, worker, interval, stop), daemon=True)
+        beater.start()
+        try:
+            result = lease.job()
+        except Exception:
+            error = traceback.format_exc()
+            logger.error("Job %d failed on %s: %s", lease.job_id, worker, error)
+            queue.fail(lease.job_id, worker, error)
+        else:
+            if not queue.complete(lease.job_id, worker, result):
+                logger.warning("Discarding job %d's result: %s no longer holds its lease.", lease.job_id, worker)
+        finally:
+            stop.set()
+            beater.join()
+        ran += 1
+    return ran
+
+
+class SweepResult(NamedTuple):
+    """The outcome of one :class:`SweepJob`."""
+
+    tags: Dict[str, Any]
+    starting_funds: float
+    final_funds: float
+    period_summaries: List[PeriodSummary]
+    stop_reason: Optional[str] = None
+
+    @property
+    def bankroll_return(self) -> float:
+        """Final funds over starting funds, minus one."""
+        return self.final_funds / self.starting_funds - 1.0 if self.starting_funds else 0.0
+
+
+class SweepJob(NamedTuple):
+    """One backtest in a sweep: an arena, a strategy, a bankroll and a slice of data.
+
+    Calling the job runs :meth:`Backtest.run_explicit <keeks_elote.backtest.Backtest.run_explicit>`
+    on a fresh arena and bankroll. Like :func:`~keeks_elote.validation.cross_validate`'s
+    arguments, the factories, strategy and ``stop_rules`` must be picklable. A run cut
+    short by a stop rule records why in :attr:`SweepResult.stop_reason`.
+    """
+
+    arena_factory: Callable[[], RatingArena]
+    strategy: "BaseStrategy"
+    bankroll_factory: Callable[[], "BankRoll"]
+    data: Dict[int, List[Dict[str, Any]]]
+    period_to_start_betting: int = 3
+    price_bets_at_true_odds: bool = True
+    tags: Optional[Dict[str, Any]] = None
+    stop_rules: Sequence[StopRule] = ()
+
+    def __call__(self) -> SweepResult:
+        bankroll = self.bankroll_factory()
+        starting_funds = bankroll.total_funds
+        backtest = Backtest(self.arena_factory(), fast=True)
+        backtest.run_explicit(
+            self.data,
+            self.strategy,
+            bankroll,
+            self.period_to_start_betting,
+            self.price_bets_at_true_odds,
+            stop_rules=self.stop_rules,
+        )
+        return SweepResult(
+            dict(self.tags or {}), starting_funds, bankroll.total_funds, backtest.period_summaries, backtest.stop_reason
+        )
+
+
+def sweep_jobs(
+    arena_factories: Mapping[str, Callable[[], RatingArena]],
+    strategies: Mapping[str, "BaseStrategy"],
+    bankroll_factories: Mapping[str, Callable[[], "BankRoll"]],
+    data_slices: Mapping[str, Dict[int, List[Dict[str, Any]]]],
+    period_to_start_betting: int = 3,
+    price_bets_at_true_odds: bool = True,
+    stop_rules: Sequence[StopRule] = (),
+) -> List[SweepJob]:
+    """The full grid of arena × strategy × bankroll × data slice, one :class:`SweepJob` each.
+
+    Each job's ``tags`` name its ``arena``, ``strategy``, ``bankroll`` and ``data`` by
+    their keys in the mappings. Every job shares ``stop_rules``, so hopeless
+    combinations end early (see :mod:`keeks_elote.stopping`).
+
+    :return: The jobs, ready for :meth:`WorkQueue.submit_many`.
+    :rtype: List[SweepJob]
+    """
+    return [
+        SweepJob(
+            arena_factories[arena],
+            strategies[strategy],
+            bankroll_factories[bankroll],
+            data_slices[data],
+            period_to_start_betting,
+            price_bets_at_true_odds,
+            {"arena": arena, "strategy": strategy, "bankroll": bankroll, "data": data},
+            stop_rules,
+        )
+        for arena, strategy, bankroll, data in itertools.product(
+            arena_factories, strategies, bankroll_factories, data_slices
+        )
+    ]
@@ -5,6 +5,7 @@ from keeks.bankroll import BankRoll
 from keeks.binary_strategies.base import BaseStrategy
 
 from keeks_elote import Backtest
+from keeks_elote.records import GameRecord
 
 # --- Fixtures ---
 
@@ -65,7 +66,7 @@ def mock_strategy(mocker):
 def mock_prepare_data(mocker):
     """Fixture to mock prepare_data, returning data unchanged."""
     # Patch in the correct location
-    return mocker.patch("keeks_elote.backtest.prepare_data", side_effect=lambda x: x)
+    return mocker.patch("keeks_elote.backtest.prepare_data", side_effect=lambda x, quality=None: x)
 
 
 @pytest.fixture
@@ -150,7 +151,7 @@ class TestBacktest:
         )
 
         assert returned_bankroll == mock_bankroll  # Function now returns bankroll
-        mock_prepare_data.assert_called_once_with(sample_data_american_odds)
+        mock_prepare_data.assert_called_once_with(sample_data_american_odds, quality=bt.data_quality)
 
         # --- Overall Assertions after Full Run ---
 
@@ -224,7 +225,7 @@ class TestBacktest:
             data,
             mock_strategy,
             mock_bankroll,
-            period_to_start_betting=2,
+            period_to_start_betting=1,
         )
 
         probabilities = [call.kwargs["probability"] for call in mock_strategy.evaluate.call_args_list]
@@ -246,7 +247,7 @@ class TestBacktest:
             mocker.call([("C", "B")]),
         ]
         assert mock_calculate_probabilities.call_args_list == [
-            mocker.call(mock_arena, data[3][0]),
+            mocker.call(mock_arena, GameRecord.from_dict(data[3][0])),
         ]
         assert mock_strategy.evaluate.call_count == 2
         assert mock_bankroll.bet.call_count == 2
@@ -262,7 +263,7 @@ class TestBacktest:
 
         bt.run_and_project(sample_data_american_odds)
 
-        mock_prepare_data.assert_called_once_with(sample_data_american_odds)
+        mock_prepare_data.assert_called_once_with(sample_data_american_odds, quality=bt.data_quality)
 
         # Check tournament calls for each period
         assert mock_arena.tournament.call_count == 3
@@ -275,20 +276,25 @@ class TestBacktest:
         # Period 2 projects Period 3: A vs C
         # Period 3 projects Period 4: (none)
         assert mock_calculate_probabilities.call_count == 2
-        mock_calculate_probabilities.assert_any_call(mock_arena, sample_data_american_odds[2][0])  # C vs B
-        mock_calculate_probabilities.assert_any_call(mock_arena, sample_data_american_odds[3][0])  # A vs C
+        mock_calculate_probabilities.assert_any_call(
+            mock_arena, GameRecord.from_dict(sample_data_american_odds[2][0])
+        )  # C vs B
+        mock_calculate_probabilities.assert_any_call(
+            mock_arena, GameRecord.from_dict(sample_data_american_odds[3][0])
+        )  # A vs C
 
         # Check logging output for predictions
         # P(C vs B) = arena(C, B) = 0.5 -> Predict C over B: 0.5000 (or B over C: 0.5000)
         # P(A vs C) = arena(A, C) = 0.6 -> Predict A over C: 0.6000
         # The logger might log either C or B if prob is 0.5, let's check for A vs C
-        mock_logger.info.assert_any_call(f"Predicted A over C: {0.6:.4f}")
+        mock_logger.info.assert_any_call("Predicted %s over %s: %.4f", "A", "C", 0.6)
         # We can be more specific about the 0.5 case if needed
         # Example: check that one of the 0.5 predictions was logged
         found_coin_flip_log = False
         for call in mock_logger.info.call_args_list:
             args, _ = call
-            if "Predicted C over B: 0.5000" in args[0] or "Predicted B over C: 0.5000" in args[0]:
+            message = args[0] % args[1:]
+            if "Predicted C over B: 0.5000" in message or "Predicted B over C: 0.5000" in message:
                 found_coin_flip_log = True
                 break
         assert found_coin_flip_log, "Expected log for 0.5 probability prediction not found"
@@ -297,7 +303,7 @@ class TestBacktest:
         self, mock_arena, mock_prepare_data, mock_calculate_probabilities, mocker
     ):
         """run_and_project must not call calculate_probabilities on games missing winner/loser."""
-        bt = Backtest(mock_arena)
+        bt = Backtest(mock_arena, log_data_issues=True)
         mock_logger = mocker.patch("keeks_elote.backtest.logger")
 
         data = {
@@ -313,9 +319,10 @@ class TestBacktest:
 
         # Only the single valid period-2 game should be projected.
         assert mock_calculate_probabilities.call_count == 1
-        mock_calculate_probabilities.assert_called_once_with(mock_arena, data[2][0])
-        mock_logger.warning.assert_any_call(f"Skipping game due to missing labels: {data[2][1]}")
-        mock_logger.warning.assert_any_call(f"Skipping game due to missing labels: {data[2][2]}")
+        mock_calculate_probabilities.assert_called_once_with(mock_arena, GameRecord.from_dict(data[2][0]))
+        mock_logger.warning.assert_any_call("Skipping game due to missing labels: %s", GameRecord.from_dict(data[2][1]))
+        mock_logger.warning.assert_any_call("Skipping game due to missing labels: %s", GameRecord.from_dict(data[2][2]))
+        assert bt.data_quality.counts == {"missing_labels": 2}
 
     def test_run_and_project_orders_sparse_periods(
         self, mock_arena, mock_prepare_data, mock_calculate_probabilities, mocker
@@ -333,5 +340,5 @@ class TestBacktest:
             mocker.call([("C", "B")]),
         ]
         assert mock_calculate_probabilities.call_args_list == [
-            mocker.call(mock_arena, data[3][0]),
+            mocker.call(mock_arena, GameRecord.from_dict(data[3][0])),
         ]
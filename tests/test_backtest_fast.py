@@ -0,0 +1,113 @@
+import logging
+
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.backtest import PeriodSummary
+from keeks_elote.model_evaluation import calculate_probabilities
+
+
+class FavoriteStrategy:
+    def __init__(self, fraction=0.1):
+        self.fraction = fraction
+
+    def evaluate(self, probability, current_bankroll):
+        return self.fraction if probability > 0.5 else 0.0
+
+
+def make_data():
+    teams = ["A", "B", "C", "D"]
+    data = {}
+    for week in range(1, 6):
+        games = []
+        for i in range(0, len(teams), 2):
+            winner, loser = teams[(i + week) % 4], teams[(i + week + 1) % 4]
+            games.append({"winner": winner, "loser": loser, "winner_odds": 110 + week, "loser_odds": -130})
+        data[week] = games
+    return data
+
+
+def run(fast, data=None):
+    backtest = Backtest(LambdaArena(lambda a, b: True, base_competitor=EloCompetitor), fast=fast)
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+    backtest.run_explicit(data or make_data(), FavoriteStrategy(), bankroll, 2)
+    return backtest, bankroll
+
+
+def test_fast_mode_matches_the_logged_run():
+    fast, fast_bankroll = run(fast=True)
+    logged, logged_bankroll = run(fast=False)
+
+    assert fast_bankroll.history == logged_bankroll.history
+    assert fast.period_summaries == logged.period_summaries
+
+
+def test_fast_mode_builds_no_per_game_messages_at_debug_level(caplog):
+    with caplog.at_level(logging.DEBUG, logger="keeks_elote"):
+        run(fast=True)
+    per_game = [
+        record
+        for record in caplog.records
+        if record.levelno == logging.DEBUG
+        and record.name in ("keeks_elote.backtest", "keeks_elote.model_evaluation")
+        and ("Evaluating game" in record.msg or "Strategy suggests" in record.msg or "Expected score" in record.msg)
+    ]
+    assert per_game == []
+
+
+def test_period_summaries_aggregate_each_period():
+    backtest, bankroll = run(fast=True)
+    summaries = backtest.period_summaries
+
+    assert [summary.period for summary in summaries] == [1, 2, 3, 4, 5]
+    assert all(isinstance(summary, PeriodSummary) for summary in summaries)
+    assert all(summary.games == 2 for summary in summaries)
+    # Periods up to period_to_start_betting are dry runs.
+    assert [summary.bets_placed for summary in summaries[:2]] == [0, 0]
+    assert summaries[-1].bets_priced == 0
+    assert summaries[-1].bankroll == bankroll.total_funds
+    for previous, summary in zip(summaries, summaries[1:]):
+        assert summary.bankroll == previous.bankroll - summary.staked + summary.returned
+
+
+def test_warm_up_periods_only_update_ratings(mocker):
+    backtest = Backtest(LambdaArena(lambda a, b: True, base_competitor=EloCompetitor))
+    probabilities = mocker.patch("keeks_elote.backtest.calculate_probabilities", wraps=calculate_probabilities)
+    strategy = mocker.Mock(wraps=FavoriteStrategy())
+    data = make_data()
+    data[5].append({"winner": "A", "loser": "B", "winner_odds": "off", "loser_odds": None})
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+
+    backtest.run_explicit(data, strategy, bankroll, period_to_start_betting=3, price_first_period=True)
+
+    # Only periods 4 and 5 are bet, and the unpriceable game in period 5 is never scored.
+    assert probabilities.call_count == 4
+    assert strategy.evaluate.call_count == 8
+    assert [summary.bets_priced for summary in backtest.period_summaries[:2]] == [0, 0]
+
+
+def test_incremental_summaries_cover_reused_periods():
+    data = make_data()
+    reference, _ = run(fast=False, data=data)
+    backtest = Backtest(LambdaArena(lambda a, b: True, base_competitor=EloCompetitor))
+    strategy = FavoriteStrategy()
+
+    backtest.run_incremental(data, strategy, BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 2)
+    data[5][0]["winner_odds"] = 200
+    backtest.run_incremental(data, strategy, BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 2)
+
+    assert backtest.resumed_from == 4
+    assert [summary.period for summary in backtest.period_summaries] == [1, 2, 3, 4, 5]
+    assert backtest.period_summaries[:3] == reference.period_summaries[:3]
+
+
+def test_calculate_probabilities_skips_formatting_when_debug_is_off(mocker):
+    mock_logger = mocker.patch("keeks_elote.model_evaluation.logger")
+    mock_logger.isEnabledFor.return_value = False
+    arena = mocker.MagicMock()
+    arena.expected_score.return_value = 0.25
+
+    assert calculate_probabilities(arena, {"winner": "X", "loser": "Y"}) == 0.25
+    mock_logger.debug.assert_not_called()
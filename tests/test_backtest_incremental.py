@@ -0,0 +1,138 @@
+import copy
+
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+
+
+class FavoriteStrategy:
+    def __init__(self, fraction=0.1):
+        self.fraction = fraction
+
+    def evaluate(self, probability, current_bankroll):
+        return self.fraction if probability > 0.5 else 0.0
+
+
+def make_data():
+    teams = ["A", "B", "C", "D"]
+    data = {}
+    for week in range(1, 7):
+        games = []
+        for i in range(0, len(teams), 2):
+            winner, loser = teams[(i + week) % 4], teams[(i + week + 1) % 4]
+            games.append({"winner": winner, "loser": loser, "winner_odds": 110 + week, "loser_odds": -130})
+        data[week] = games
+    return data
+
+
+def make_bankroll():
+    return BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+
+
+def make_backtest():
+    return Backtest(LambdaArena(lambda a, b: True, base_competitor=EloCompetitor))
+
+
+def full_run(data):
+    backtest = make_backtest()
+    bankroll = backtest.run_explicit(data, FavoriteStrategy(), make_bankroll(), 2)
+    return backtest, bankroll
+
+
+def assert_same_result(incremental, incremental_bankroll, reference, reference_bankroll):
+    assert incremental_bankroll.history == reference_bankroll.history
+    for a, b in [("A", "B"), ("C", "D"), ("B", "C")]:
+        assert incremental._arena.expected_score(a, b) == reference._arena.expected_score(a, b)
+
+
+def test_first_incremental_run_matches_run_explicit():
+    data = make_data()
+    backtest = make_backtest()
+
+    bankroll = backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+
+    assert backtest.resumed_from == 1
+    assert_same_result(backtest, bankroll, *full_run(data))
+
+
+def test_corrected_recent_period_resumes_just_before_it():
+    data = make_data()
+    backtest = make_backtest()
+    backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+
+    corrected = copy.deepcopy(data)
+    corrected[5][0]["winner_odds"] = 250
+    corrected[6][1]["winner"], corrected[6][1]["loser"] = corrected[6][1]["loser"], corrected[6][1]["winner"]
+    bankroll = backtest.run_incremental(corrected, FavoriteStrategy(), make_bankroll(), 2)
+
+    assert backtest.resumed_from == 4
+    assert_same_result(backtest, bankroll, *full_run(corrected))
+
+
+def test_unchanged_data_restores_the_final_state():
+    data = make_data()
+    backtest = make_backtest()
+    first = backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+    first_history = list(first.history)
+
+    again = backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+
+    assert backtest.resumed_from is None
+    assert again.history == first_history
+
+
+def test_appended_periods_and_new_settings():
+    data = make_data()
+    backtest = make_backtest()
+    partial = {week: games for week, games in data.items() if week <= 4}
+    backtest.run_incremental(partial, FavoriteStrategy(), make_bankroll(), 2)
+
+    bankroll = backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+    assert backtest.resumed_from == 4
+    assert_same_result(backtest, bankroll, *full_run(data))
+
+    backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 3)
+    assert backtest.resumed_from == 1
+    backtest.run_incremental(data, FavoriteStrategy(fraction=0.2), make_bankroll(), 3)
+    assert backtest.resumed_from == 1
+
+
+def test_new_strategy_reruns_from_the_initial_ratings():
+    data = make_data()
+    backtest = make_backtest()
+    backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+
+    bankroll = backtest.run_incremental(data, FavoriteStrategy(fraction=0.2), make_bankroll(), 2)
+
+    assert backtest.resumed_from == 1
+    reference = make_backtest()
+    reference_bankroll = reference.run_explicit(data, FavoriteStrategy(fraction=0.2), make_bankroll(), 2)
+    assert_same_result(backtest, bankroll, reference, reference_bankroll)
+
+
+def test_reused_periods_keep_their_data_issues():
+    data = make_data()
+    for week, games in data.items():
+        games[0]["date"] = f"2017-09-0{week}"
+        games[1]["loser_odds"] = "bad"
+    data[2][0].update(winner_score="x", loser_score=7)
+    data[4].append({"winner": None, "loser": "A"})
+    backtest = make_backtest()
+    partial = {week: games for week, games in data.items() if week <= 4}
+    backtest.run_incremental(partial, FavoriteStrategy(), make_bankroll(), 2)
+
+    backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+    assert backtest.resumed_from == 4
+    assert backtest.data_quality.counts == full_run(data)[0].data_quality.counts
+
+    backtest.run_incremental(data, FavoriteStrategy(), make_bankroll(), 2)
+    assert backtest.resumed_from is None
+    assert backtest.data_quality.counts == full_run(data)[0].data_quality.counts
+
+    corrected = copy.deepcopy(data)
+    corrected[6][0]["winner_odds"] = "worse"
+    backtest.run_incremental(corrected, FavoriteStrategy(), make_bankroll(), 2)
+    assert backtest.resumed_from == 5
+    assert backtest.data_quality.counts == full_run(corrected)[0].data_quality.counts
@@ -221,8 +221,9 @@ def test_invalid_odds_skip_only_that_side(caplog):
     arena = RecordingArena()
     bankroll = RecordingBankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
 
+    backtest = Backtest(arena, log_data_issues=True)
     with caplog.at_level(logging.WARNING):
-        Backtest(arena).run_explicit(
+        backtest.run_explicit(
             data,
             FixedFractionForAllBetsStrategy(),
             bankroll,
@@ -238,11 +239,12 @@ def test_invalid_odds_skip_only_that_side(caplog):
     invalid_odds_warnings = [
         record.message
         for record in caplog.records
-        if record.levelno == logging.WARNING and "invalid odds" in record.message
+        if record.levelno == logging.WARNING and "Skipping wager" in record.message
     ]
     assert len(invalid_odds_warnings) == 1
     assert "on B" in invalid_odds_warnings[0]
     assert "nan" in invalid_odds_warnings[0]
+    assert backtest.data_quality.counts == {"invalid_odds": 1}
 
 
 def test_period_exposure_never_exceeds_the_bettable_budget():
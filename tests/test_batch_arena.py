@@ -0,0 +1,143 @@
+import random
+
+import numpy as np
+import pytest
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.batch_arena import BradleyTerryArena, MasseyArena
+from keeks_elote.league import LeagueMatrix
+from keeks_elote.persistence import save_ratings
+from keeks_elote.projections import ColumnarSink
+from keeks_elote.rating_arena import RatingArena
+
+
+class FavoriteStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1 if probability > 0.5 else 0.0
+
+
+def season(weeks=8, teams=10, seed=5):
+    rng = random.Random(seed)
+    strength = {team: rng.gauss(0, 7) for team in range(teams)}
+    periods = []
+    for _ in range(weeks):
+        order = rng.sample(range(teams), teams)
+        games = []
+        for a, b in zip(order[::2], order[1::2]):
+            margin = round(strength[a] - strength[b] + rng.gauss(0, 10))
+            if margin == 0:
+                margin = 1
+            winner, loser = (a, b) if margin > 0 else (b, a)
+            games.append((winner, loser, None, None, 1.0, (20.0 + abs(margin), 20.0)))
+        periods.append(games)
+    return periods
+
+
+@pytest.mark.parametrize("arena_type", [BradleyTerryArena, MasseyArena])
+def test_incremental_solves_match_one_solve_over_the_whole_season(arena_type):
+    incremental, batch = arena_type(), arena_type()
+    periods = season()
+    for games in periods:
+        incremental.tournament(games)
+    batch.tournament([game for games in periods for game in games])
+
+    assert isinstance(incremental, RatingArena)
+    for team in range(10):
+        assert incremental.ratings()[team] == pytest.approx(batch.ratings()[team], abs=1e-6)
+    assert incremental.expected_score(3, 4) == pytest.approx(1.0 - incremental.expected_score(4, 3))
+    assert incremental.expected_score("new", "also new") == 0.5
+
+
+def test_bradley_terry_matches_the_regularized_likelihood():
+    arena = BradleyTerryArena(prior_games=2.0)
+    arena.tournament([("A", "B"), ("A", "B"), ("B", "A"), ("B", "C"), ("C", "A"), ("A", "C")])
+
+    strength = {label: np.exp(rating) for label, rating in arena.ratings().items()}
+    # At the fixed point each competitor's wins (plus half its virtual games) equal its expected wins.
+    games = {("A", "B"): 3, ("B", "C"): 1, ("A", "C"): 2}
+    wins = {"A": 3 + 1.0, "B": 2 + 1.0, "C": 1 + 1.0}
+    for label in "ABC":
+        expected = 2.0 * strength[label] / (strength[label] + 1.0)
+        for (x, y), n in games.items():
+            if label in (x, y):
+                other = y if label == x else x
+                expected += n * strength[label] / (strength[label] + strength[other])
+        assert expected == pytest.approx(wins[label], rel=1e-6)
+    assert arena.expected_score("A", "C") > 0.5
+
+
+def test_bradley_terry_keeps_unbeaten_competitors_finite():
+    arena = BradleyTerryArena()
+    arena.tournament([("A", "B")] * 5)
+    assert 0.5 < arena.expected_score("A", "B") < 1.0
+
+
+def test_massey_recovers_consistent_margins():
+    arena = MasseyArena(ridge=1e-9)
+    arena.tournament(
+        [
+            ("A", "B", None, None, 1.0, (10, 7)),
+            ("B", "C", None, None, 1.0, (14, 10)),
+            ("A", "C", None, None, 1.0, (27, 20)),
+        ]
+    )
+    ratings = arena.ratings()
+    assert ratings["A"] - ratings["B"] == pytest.approx(3.0, abs=1e-6)
+    assert ratings["B"] - ratings["C"] == pytest.approx(4.0, abs=1e-6)
+    assert arena.expected_score("A", "C") > arena.expected_score("A", "B") > 0.5
+
+
+def test_massey_warm_start_needs_few_iterations():
+    arena = MasseyArena()
+    periods = season(weeks=20, teams=40)
+    for games in periods[:-1]:
+        arena.tournament(games)
+    cold = MasseyArena()
+    cold.tournament([game for games in periods for game in games])
+
+    arena.tournament(periods[-1])
+    assert arena.last_iterations < cold.last_iterations
+
+
+def test_batch_arenas_drive_a_backtest():
+    data = {
+        week: [
+            {"winner": "A", "loser": "B", "winner_score": 21, "loser_score": 14, "winner_odds": 110, "loser_odds": -130}
+        ]
+        for week in range(1, 5)
+    }
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+    arena = MasseyArena()
+
+    Backtest(arena).run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=1)
+
+    assert bankroll.total_funds > 1000.0
+    assert LeagueMatrix(arena).top_k(1)[0][0] == "A"
+
+
+def season_data(weeks=4):
+    return {
+        week: [
+            {"winner": "A", "loser": "B", "winner_score": 21, "loser_score": 14},
+            {"winner": "C", "loser": "A", "winner_score": 17, "loser_score": 10},
+        ]
+        for week in range(1, weeks + 1)
+    }
+
+
+@pytest.mark.parametrize("arena_type", [BradleyTerryArena, MasseyArena])
+def test_batch_arenas_project_sequentially_when_asked_for_a_thread(arena_type):
+    sequential = Backtest(arena_type()).run_and_project(season_data(), sink=ColumnarSink())
+    threaded = Backtest(arena_type()).run_and_project(season_data(), sink=ColumnarSink(), evaluate_in_thread=True)
+
+    expected, actual = sequential.to_arrays(), threaded.to_arrays()
+    np.testing.assert_array_equal(actual["probability"], expected["probability"])
+
+
+@pytest.mark.parametrize("arena_type", [BradleyTerryArena, MasseyArena])
+def test_batch_arenas_cannot_be_saved_as_competitors(arena_type, tmp_path):
+    arena = arena_type()
+    arena.tournament([("A", "B")])
+    with pytest.raises(TypeError, match="no competitors dict"):
+        save_ratings(arena, tmp_path / "ratings.json")
@@ -0,0 +1,119 @@
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+
+from keeks_elote import Backtest
+from keeks_elote.branching import branch_arena
+from keeks_elote.rating_arena import RatingArena
+
+
+def make_arena():
+    arena = LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+    arena.tournament([("A", "B"), ("C", "D"), ("A", "C")])
+    return arena
+
+
+def test_branch_changes_do_not_touch_the_base():
+    arena = make_arena()
+    before = arena.expected_score("B", "A")
+    base_bouts = len(arena.history.bouts)
+
+    what_if = branch_arena(arena)
+    what_if.tournament([("B", "A"), ("B", "A")])
+
+    assert what_if.expected_score("B", "A") > before
+    assert arena.expected_score("B", "A") == before
+    assert len(arena.history.bouts) == base_bouts
+    assert what_if.changed_competitors == {"A", "B"}
+    assert isinstance(what_if, RatingArena)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda branch: branch.matchup("B", "A", outcome=1.0),
+        lambda branch: branch.rating_period([("B", "A", 1.0, None), ("D", "C", 1.0, None)]),
+        lambda branch: branch.process_history([("B", "A", 1.0)], progress_bar=False),
+    ],
+)
+def test_elote_mutators_copy_before_writing(mutate):
+    arena = make_arena()
+    before = arena.expected_score("A", "B")
+    what_if = branch_arena(arena)
+
+    mutate(what_if)
+    mutate(what_if)
+
+    assert arena.expected_score("A", "B") == before
+    assert what_if.expected_score("A", "B") < before
+    assert {"A", "B"} <= what_if.changed_competitors
+
+
+def test_branches_only_expose_read_only_helpers():
+    what_if = branch_arena(make_arena())
+    assert [row["competitor"] for row in what_if.leaderboard()][0] == "A"
+    with pytest.raises(AttributeError, match="copy-on-write"):
+        what_if.set_competitor_class_var("_k_factor", 64)
+
+
+def test_rollback_restores_the_shared_state():
+    arena = make_arena()
+    before = arena.expected_score("B", "A")
+    what_if = branch_arena(arena)
+    what_if.tournament([("B", "A")])
+
+    what_if.rollback()
+
+    assert what_if.changed_competitors == set()
+    assert what_if.expected_score("B", "A") == before
+
+
+def test_new_competitors_live_only_in_the_branch():
+    arena = make_arena()
+    what_if = branch_arena(arena)
+    what_if.tournament([("E", "A")])
+
+    assert "E" in what_if.competitors
+    assert "E" not in arena.competitors
+
+
+def test_nested_branches_and_commit():
+    arena = make_arena()
+    before = arena.expected_score("D", "C")
+    week_one = branch_arena(arena)
+    week_one.tournament([("D", "C")])
+    after_week_one = week_one.expected_score("D", "C")
+
+    week_two = week_one.branch()
+    week_two.tournament([("D", "C")])
+    assert week_two.expected_score("D", "C") > after_week_one
+    assert week_one.expected_score("D", "C") == after_week_one
+
+    week_two.rollback()
+    week_one.commit()
+    assert arena.expected_score("D", "C") == pytest.approx(after_week_one)
+    assert arena.expected_score("D", "C") != before
+    assert week_one.changed_competitors == set()
+
+
+def test_branches_run_through_backtest():
+    arena = make_arena()
+    before = arena.expected_score("B", "A")
+    what_if = branch_arena(arena)
+
+    Backtest(what_if).run_and_project({1: [{"winner": "B", "loser": "A"}]})
+
+    assert what_if.expected_score("B", "A") > before
+    assert arena.expected_score("B", "A") == before
+
+
+def test_arenas_without_a_competitor_store_are_rejected():
+    class OpaqueArena:
+        def tournament(self, matchups):
+            pass
+
+        def expected_score(self, a, b):
+            return 0.5
+
+    with pytest.raises(TypeError, match="competitors mapping"):
+        branch_arena(OpaqueArena())
@@ -0,0 +1,155 @@
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+from keeks_elote.cli import main, sweep_specs, validate
+from keeks_elote.work_queue import WorkQueue
+
+
+def write_games(path, weeks=6):
+    with open(path, "w", encoding="utf-8") as handle:
+        for week in range(weeks):
+            for winner, loser in (("A", "B"), ("C", "D")):
+                game = {"week": week, "winner": winner, "loser": loser, "winner_odds": 120, "loser_odds": -140}
+                handle.write(json.dumps(game) + "\n")
+
+
+@pytest.fixture
+def config(tmp_path):
+    write_games(tmp_path / "games.ndjson")
+    return {
+        "data": "games.ndjson",
+        "period_key": "week",
+        "arena": {"competitor": "elo", "kwargs": {"k_factor": 32}},
+        "strategy": {"class": "fixed-fraction", "kwargs": {"fraction": 0.05, "payoff": 1.0, "loss": 1.0}},
+        "bankroll": {"initial_funds": 1000.0, "percent_bettable": 0.5, "max_draw_down": 1.0},
+        "period_to_start_betting": 2,
+    }
+
+
+def write_config(tmp_path, config, name="config.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+
+def sweep_config(config):
+    sweep = {key: value for key, value in config.items() if key not in ("arena", "strategy")}
+    sweep["arenas"] = {"elo": config["arena"], "massey": {"class": "massey"}}
+    sweep["strategies"] = {"small": config["strategy"], "none": {"class": "fixed-fraction", "kwargs": {}}}
+    sweep["strategies"]["none"]["kwargs"] = dict(config["strategy"]["kwargs"], fraction=0.0)
+    return sweep
+
+
+def test_importing_the_package_and_cli_loads_no_rating_or_betting_libraries():
+    code = (
+        "import sys, keeks_elote, keeks_elote.cli;"
+        "print(sorted(m for m in ('keeks', 'elote', 'numpy', 'matplotlib') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_package_attributes_are_imported_on_access():
+    import keeks_elote
+    from keeks_elote.backtest import Backtest
+
+    assert keeks_elote.Backtest is Backtest
+    assert "SeasonSimulator" in dir(keeks_elote)
+    with pytest.raises(AttributeError):
+        keeks_elote.NotAThing
+
+
+def test_help_lists_the_commands(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--help"])
+    assert exit_info.value.code == 0
+    out = capsys.readouterr().out
+    for command in ("backtest", "project", "sweep", "worker"):
+        assert command in out
+
+
+def test_check_accepts_a_valid_config(tmp_path, config, capsys):
+    assert main(["sweep", write_config(tmp_path, sweep_config(config)), "--check"]) == 0
+    assert "OK (4 jobs)" in capsys.readouterr().err
+
+
+def test_check_reports_every_problem(tmp_path, config, capsys):
+    config["data"] = "missing.ndjson"
+    config["strategy"] = {"kwargs": {}}
+    config["bankroll"]["initial_fund"] = 10
+    assert main(["backtest", write_config(tmp_path, config), "--check"]) == 2
+
+    err = capsys.readouterr().err
+    assert "missing.ndjson does not exist" in err
+    assert "strategy 'default' must be an object with 'class'" in err
+    assert "bankroll 'default' may only set" in err
+    assert validate("project", {"data": "games.ndjson", "arena": {"class": "massey"}}, tmp_path) == []
+
+
+def test_unknown_classes_are_config_errors(tmp_path, config, capsys):
+    config["arena"] = {"class": "no.such.module:Arena"}
+    assert main(["backtest", write_config(tmp_path, config)]) == 2
+    assert "Cannot import" in capsys.readouterr().err
+
+
+def test_backtest_writes_a_json_report(tmp_path, config):
+    output = tmp_path / "report.json"
+    assert main(["backtest", write_config(tmp_path, config), "-o", str(output)]) == 0
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["starting_funds"] == 1000.0
+    assert [period["period"] for period in report["periods"]] == list(range(6))
+    assert sum(period["bets_placed"] for period in report["periods"]) > 0
+
+
+def test_project_writes_by_suffix(tmp_path, config):
+    output = tmp_path / "projections.csv"
+    assert main(["project", write_config(tmp_path, config), "-o", str(output)]) == 0
+
+    with open(output, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 10
+    assert main(["project", write_config(tmp_path, config), "-o", str(tmp_path / "out.xlsx")]) == 2
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_sweep_writes_one_line_per_job(tmp_path, config, jobs):
+    output = tmp_path / "sweep.ndjson"
+    assert main(["sweep", write_config(tmp_path, sweep_config(config)), "-j", str(jobs), "-o", str(output)]) == 0
+
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted((r["tags"]["arena"], r["tags"]["strategy"]) for r in results) == [
+        ("elo", "none"),
+        ("elo", "small"),
+        ("massey", "none"),
+        ("massey", "small"),
+    ]
+    for result in results:
+        assert (result["bets"] == 0) == (result["tags"]["strategy"] == "none")
+
+
+@pytest.mark.parametrize("jobs", ["0", "-2", "many"])
+def test_sweep_rejects_invalid_job_counts(tmp_path, config, jobs, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["sweep", write_config(tmp_path, sweep_config(config)), "-j", jobs])
+    assert exit_info.value.code == 2
+    assert "--jobs" in capsys.readouterr().err
+
+
+def test_queued_sweeps_are_run_by_workers(tmp_path, config):
+    queue_file = str(tmp_path / "queue.db")
+    config_path = write_config(tmp_path, sweep_config(config))
+    assert main(["sweep", config_path, "--queue", queue_file]) == 0
+    assert WorkQueue(queue_file).counts()["pending"] == 4
+
+    assert main(["worker", queue_file, "--poll-interval", "0"]) == 0
+
+    queue = WorkQueue(queue_file)
+    assert queue.counts()["done"] == 4
+    specs = sweep_specs(sweep_config(config), tmp_path)
+    arenas = sorted(result["tags"]["arena"] for result in queue.results().values())
+    assert arenas == sorted(spec["tags"]["arena"] for spec in specs)
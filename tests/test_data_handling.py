@@ -1,6 +1,7 @@
 import pytest
 
 from keeks_elote.data_handling import prepare_data
+from keeks_elote.data_quality import MISSING_LABELS, DataQualityReport
 
 
 def test_prepare_data_passthrough():
@@ -34,7 +35,7 @@ def test_prepare_data_non_list_period_raises(games, type_name):
 
 
 def test_prepare_data_drops_games_missing_labels(mocker):
-    """Games missing winner/loser are dropped with a warning; valid ones remain."""
+    """Games missing winner/loser are dropped with one summary warning; valid ones remain."""
     mock_logger = mocker.patch("keeks_elote.data_handling.logger")
     test_data = {
         1: [
@@ -51,7 +52,18 @@ def test_prepare_data_drops_games_missing_labels(mocker):
         2: [{"winner": "G", "loser": "H"}],
     }
     assert id(prepared) != id(test_data)  # A cleaned copy was built.
-    assert mock_logger.warning.call_count == 3
+    mock_logger.warning.assert_called_once()
+    assert "3 games missing winner/loser labels" in mock_logger.warning.call_args.args[2]
+
+
+def test_prepare_data_counts_dropped_games_in_a_report(mocker):
+    """A caller's report collects the dropped games and the caller owns the summary."""
+    mock_logger = mocker.patch("keeks_elote.data_handling.logger")
+    report = DataQualityReport()
+    prepare_data({1: [{"winner": "A"}, {"loser": "B"}, {"winner": "C", "loser": "D"}]}, quality=report)
+    assert report.counts == {MISSING_LABELS: 2}
+    assert report.examples[MISSING_LABELS] == [{"winner": "A"}, {"loser": "B"}]
+    mock_logger.warning.assert_not_called()
 
 
 def test_prepare_data_drops_non_dict_games():
@@ -0,0 +1,90 @@
+import logging
+
+from keeks_elote.backtest import Backtest
+from keeks_elote.data_quality import (
+    INVALID_ODDS,
+    MISSING_LABELS,
+    NON_WINNING_SCORES,
+    UNPARSEABLE_SCORES,
+    DataQualityReport,
+)
+
+
+class RecordingArena:
+    def __init__(self):
+        self.matchups = []
+
+    def tournament(self, matchups):
+        self.matchups.extend(matchups)
+
+    def expected_score(self, a, b):
+        return 0.5
+
+
+def test_record_counts_and_bounds_examples():
+    report = DataQualityReport(max_examples=2)
+    for i in range(5):
+        report.record(INVALID_ODDS, i)
+    report.record(MISSING_LABELS)
+
+    assert report.counts == {INVALID_ODDS: 5, MISSING_LABELS: 1}
+    assert report.examples == {INVALID_ODDS: [0, 1]}
+    assert report.total == 6
+
+
+def test_merge_adds_counts_within_the_example_bound():
+    left = DataQualityReport(max_examples=3)
+    left.record(INVALID_ODDS, "a")
+    left.record(INVALID_ODDS, "b")
+    right = DataQualityReport()
+    right.record(INVALID_ODDS, "c")
+    right.record(INVALID_ODDS, "d")
+    right.record(UNPARSEABLE_SCORES, "e")
+
+    left.merge(right)
+
+    assert left.counts == {INVALID_ODDS: 4, UNPARSEABLE_SCORES: 1}
+    assert left.examples == {INVALID_ODDS: ["a", "b", "c"], UNPARSEABLE_SCORES: ["e"]}
+
+
+def test_log_summary_is_one_line_and_silent_when_clean(caplog):
+    report = DataQualityReport()
+    with caplog.at_level(logging.WARNING):
+        report.log_summary(context="clean run")
+    assert caplog.records == []
+
+    report.record(NON_WINNING_SCORES)
+    report.record(NON_WINNING_SCORES)
+    with caplog.at_level(logging.WARNING):
+        report.log_summary(context="week 3")
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().startswith("Data quality issues in week 3: 2 games whose scores")
+
+
+def test_backtest_summarizes_a_dirty_feed_in_one_warning(caplog):
+    games = [{"winner": f"T{i}", "loser": f"U{i}", "winner_score": "n/a", "loser_score": 3} for i in range(50)]
+    backtest = Backtest(RecordingArena())
+
+    with caplog.at_level(logging.WARNING, logger="keeks_elote"):
+        backtest.run_and_project({1: games, 2: [{"winner": "A"}]})
+
+    assert backtest.data_quality.counts == {UNPARSEABLE_SCORES: 50, MISSING_LABELS: 1}
+    assert len(backtest.data_quality.examples[UNPARSEABLE_SCORES]) == 5
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "50 games with unparseable scores" in warnings[0].getMessage()
+
+
+def test_backtest_resets_the_report_between_runs():
+    backtest = Backtest(RecordingArena())
+    backtest.run_and_project({1: [{"winner": "A"}]})
+    backtest.run_and_project({1: [{"winner": "A", "loser": "B"}]})
+    assert backtest.data_quality.counts == {}
+
+
+def test_per_event_logging_is_opt_in(caplog):
+    data = {1: [{"winner": "A", "loser": "B", "winner_score": 0, "loser_score": 0}] * 3}
+    with caplog.at_level(logging.WARNING, logger="keeks_elote"):
+        Backtest(RecordingArena(), log_data_issues=True).run_and_project(data)
+    per_event = [record for record in caplog.records if "do not show A beating B" in record.getMessage()]
+    assert len(per_event) == 3
@@ -0,0 +1,126 @@
+import math
+import pickle
+
+import numpy as np
+import pytest
+from elote import EloCompetitor, LambdaArena
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies.simple import FixedFractionStrategy
+
+from keeks_elote import Backtest
+from keeks_elote.dataset import CompiledDataset
+from keeks_elote.projections import ColumnarSink
+from keeks_elote.records import GameRecord
+
+
+def season():
+    data = {}
+    for week in range(8, 0, -1):
+        data[week] = [
+            {"winner": "A", "loser": "B", "winner_odds": 120, "loser_odds": -140, "winner_score": 21, "loser_score": 7},
+            {"winner": "C", "loser": "D", "winner_odds": -110, "loser_odds": "bad"},
+            {
+                "winner": "D",
+                "loser": "A",
+                "winner_odds": 150,
+                "loser_odds": -170,
+                "winner_score": "?",
+                "loser_score": 3,
+            },
+        ]
+    data[3].append({"winner": "B"})
+    return data
+
+
+def make_backtest():
+    return Backtest(LambdaArena(lambda a, b, attributes=None: True, base_competitor=EloCompetitor))
+
+
+def run(data):
+    backtest = make_backtest()
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+    strategy = FixedFractionStrategy(fraction=0.05, payoff=1.0, loss=1.0, min_probability=0.0)
+    backtest.run_explicit(data, strategy, bankroll, period_to_start_betting=2)
+    return backtest, bankroll
+
+
+def test_compiled_runs_match_runs_from_dicts():
+    dataset = CompiledDataset(season())
+    expected, expected_bankroll = run(season())
+
+    for _ in range(2):
+        backtest, bankroll = run(dataset)
+        assert bankroll.history == expected_bankroll.history
+        assert backtest.period_summaries == expected.period_summaries
+        assert backtest.data_quality.counts == expected.data_quality.counts
+
+
+def test_compiled_projections_match_projections_from_dicts():
+    from_dicts = make_backtest().run_and_project(season(), sink=ColumnarSink())
+    compiled = make_backtest().run_and_project(CompiledDataset(season()), sink=ColumnarSink(), evaluate_in_thread=True)
+    for column in ("period", "competitor", "opponent", "probability"):
+        assert list(compiled.columns[column]) == list(from_dicts.columns[column])
+
+
+def test_incremental_and_streaming_runs_accept_a_dataset():
+    expected, expected_bankroll = run(season())
+    dataset = CompiledDataset(season())
+    strategy = FixedFractionStrategy(fraction=0.05, payoff=1.0, loss=1.0, min_probability=0.0)
+
+    for method, data in (("run_incremental", dataset), ("run_streaming", dataset), ("run_streaming", iter(dataset))):
+        backtest = make_backtest()
+        bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+        getattr(backtest, method)(data, strategy, bankroll, period_to_start_betting=2)
+        assert bankroll.history == expected_bankroll.history
+        assert backtest.period_summaries == expected.period_summaries
+        if data is dataset:
+            assert backtest.data_quality.counts == expected.data_quality.counts
+
+
+def test_repeated_runs_skip_preprocessing(mocker):
+    dataset = CompiledDataset(season())
+    prepare = mocker.patch("keeks_elote.backtest.prepare_data")
+    matchup = mocker.patch("keeks_elote.backtest.matchup_tuple")
+    run(dataset)
+    run(dataset)
+    prepare.assert_not_called()
+    matchup.assert_not_called()
+
+
+def test_periods_are_sorted_and_indexed():
+    dataset = CompiledDataset(season())
+
+    assert dataset.periods == tuple(range(1, 9))
+    assert len(dataset) == 8 and 3 in dataset and 9 not in dataset
+    assert dataset.next_period(3) == 4 and dataset.next_period(8) is None
+    week = dataset[3]
+    assert week.period == 3 and len(week.games) == 3
+    assert week.games[0] == GameRecord("A", "B", 120, -140, 21, 7)
+    assert week.matchups[0] == ("A", "B", None, None, 1.0, (21.0, 7.0))
+    assert week.matchups[2] == ("D", "A")
+    assert week.decimal_odds.shape == (3, 2)
+    assert week.decimal_odds[0].tolist() == pytest.approx([2.2, 1.0 + 100 / 140])
+    assert math.isnan(week.decimal_odds[1, 1])
+    assert dataset.data_quality.counts == {"missing_labels": 1, "unparseable_scores": 8}
+    assert dataset.to_dict()[1][1] == {"winner": "C", "loser": "D", "winner_odds": -110, "loser_odds": "bad"}
+
+
+def test_datasets_are_immutable_and_picklable():
+    dataset = CompiledDataset(season())
+    with pytest.raises(AttributeError):
+        dataset._periods = ()
+    with pytest.raises(ValueError):
+        dataset[1].decimal_odds[0, 0] = 5.0
+    dataset.data_quality.record("invalid_odds")
+    assert "invalid_odds" not in dataset.data_quality.counts
+
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert restored.periods == dataset.periods
+    assert restored[2].matchups == dataset[2].matchups
+    assert np.array_equal(restored[2].decimal_odds, dataset[2].decimal_odds, equal_nan=True)
+    assert not restored[2].decimal_odds.flags.writeable
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(TypeError):
+        CompiledDataset([])
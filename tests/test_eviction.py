@@ -0,0 +1,138 @@
+import pytest
+from elote import EloCompetitor, GlickoCompetitor, LambdaArena
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies.simple import FixedFractionStrategy
+
+from keeks_elote import Backtest
+from keeks_elote.branching import branch_arena
+from keeks_elote.eviction import ArrayColdStore, EvictingArena, SqliteColdStore
+from keeks_elote.model_evaluation import probability_matrix
+from keeks_elote.projections import ColumnarSink
+
+
+def make_arena(competitor=EloCompetitor):
+    return LambdaArena(lambda a, b, attributes=None: True, base_competitor=competitor)
+
+
+def season():
+    # A core of regulars plus one-off entrants who play a single week and vanish,
+    # and a returner who comes back after a long absence.
+    data = {}
+    for week in range(1, 13):
+        games = [
+            {"winner": "A", "loser": "B", "winner_odds": 120, "loser_odds": -140},
+            {"winner": f"new{week}", "loser": "C", "winner_odds": 200, "loser_odds": -240},
+        ]
+        if week in (2, 11):
+            games.append({"winner": "R", "loser": "A", "winner_odds": 150, "loser_odds": -170})
+        data[week] = games
+    return data
+
+
+def run(arena):
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+    strategy = FixedFractionStrategy(fraction=0.05, payoff=1.0, loss=1.0, min_probability=0.0)
+    Backtest(arena, fast=True).run_explicit(season(), strategy, bankroll, period_to_start_betting=2)
+    return bankroll
+
+
+@pytest.mark.parametrize("store", [ArrayColdStore, lambda: SqliteColdStore(":memory:")])
+def test_evicting_runs_match_the_bare_arena(store):
+    bare = make_arena()
+    expected = run(bare)
+    evicting = EvictingArena(make_arena(), idle_periods=2, cold_store=store())
+
+    assert run(evicting).history == expected.history
+    # Only the regulars and the last weeks' entrants stay live.
+    assert evicting.hot_count < len(bare.competitors)
+    assert evicting.hot_count + evicting.cold_count == len(bare.competitors)
+    assert evicting.rehydrations >= 1 and evicting.evictions >= evicting.cold_count
+
+    cold = evicting.cold_count
+    assert evicting.restore_all() == cold and evicting.cold_count == 0
+    for label, competitor in bare.competitors.items():
+        assert evicting.arena.competitors[label].rating == pytest.approx(competitor.rating)
+
+
+def test_cold_competitors_are_rehydrated_for_scoring():
+    evicting = EvictingArena(make_arena(GlickoCompetitor), idle_periods=1)
+    evicting.tournament([("A", "B")])
+    rating = evicting.arena.competitors["A"].rating
+    evicting.tournament([("C", "D")])
+    evicting.tournament([("C", "D")])
+    assert "A" not in evicting.arena.competitors and "A" in evicting.cold_store
+
+    assert evicting.expected_score("A", "B") > 0.5
+    assert evicting.arena.competitors["A"].rating == rating
+    assert "A" not in evicting.cold_store
+
+    evicting.tournament([("C", "D")])
+    evicting.tournament([("C", "D")])
+    matrix = probability_matrix(evicting, ["A", "B", "C"])
+    assert matrix[0, 1] == pytest.approx(evicting.expected_score("A", "B"))
+    assert evicting.cold_count == 0
+
+
+def test_threaded_projection_keeps_evicting_and_matches_the_bare_arena():
+    expected = Backtest(make_arena()).run_and_project(season(), sink=ColumnarSink()).to_arrays()
+    evicting = EvictingArena(make_arena(), idle_periods=2)
+
+    actual = Backtest(evicting).run_and_project(season(), sink=ColumnarSink(), evaluate_in_thread=True).to_arrays()
+
+    assert evicting.evictions > 0
+    assert actual["probability"].tolist() == pytest.approx(expected["probability"].tolist())
+    with pytest.raises(TypeError):
+        branch_arena(evicting)
+
+
+def test_elote_mutators_rehydrate_cold_competitors():
+    evicting = EvictingArena(make_arena(), idle_periods=1)
+    evicting.tournament([("A", "B")])
+    evicting.tournament([("C", "D")])
+    evicting.tournament([("C", "D")])
+    bare = make_arena()
+    bare.tournament([("A", "B")])
+    assert "A" in evicting.cold_store
+
+    evicting.matchup("A", "B")
+    bare.matchup("A", "B")
+    assert "A" not in evicting.cold_store
+    assert evicting.arena.competitors["A"].rating == pytest.approx(bare.competitors["A"].rating)
+
+    evicting.tournament([("C", "D")])
+    evicting.tournament([("C", "D")])
+    evicting.rating_period([("A", "B", 1.0, None)])
+    bare.rating_period([("A", "B", 1.0, None)])
+    assert evicting.arena.competitors["A"].rating == pytest.approx(bare.competitors["A"].rating)
+    assert not hasattr(evicting, "competitors")
+
+
+class Plain:
+    def __init__(self, **state):
+        self.__dict__.update(state)
+
+
+def test_array_store_rebuilds_competitors_exactly():
+    store = ArrayColdStore()
+    glicko = GlickoCompetitor(initial_rating=1500, initial_rd=80)
+    odd = Plain(rating=2**60, note="text")
+    store.put_many(
+        [("g", glicko), ("p", Plain(rating=7, rd=None, k=0.5)), ("odd", odd), (("x", 1), Plain(rating=-0.0))]
+    )
+    store.put_many([("p", Plain(rating=8, rd=None, k=0.25))])
+
+    assert len(store) == 4 and ("x", 1) in store
+    assert vars(store.pop("g")) == vars(glicko)
+    restored = store.pop("p")
+    assert type(restored) is Plain and vars(restored) == {"rating": 8, "rd": None, "k": 0.25}
+    assert type(restored.rating) is int
+    assert vars(store.pop("odd")) == vars(odd)
+    assert store.pop("g") is None
+    assert [label for label, _ in store.pop_all()] == [("x", 1)] and len(store) == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(TypeError):
+        EvictingArena(object(), idle_periods=2)
+    with pytest.raises(ValueError):
+        EvictingArena(make_arena(), idle_periods=0)
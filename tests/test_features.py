@@ -0,0 +1,127 @@
+import csv
+import math
+
+import numpy as np
+import pytest
+from elote import EloCompetitor, GlickoCompetitor, LambdaArena
+
+from keeks_elote import Backtest
+from keeks_elote.features import FeatureExporter, load_features
+
+
+def make_arena(competitor=EloCompetitor):
+    return LambdaArena(lambda a, b, attributes=None: True, base_competitor=competitor)
+
+
+def season():
+    teams = ["A", "B", "C", "D", "E"]
+    data = {}
+    for week in range(1, 9):
+        data[week] = [
+            {
+                "winner": teams[(week + i) % 5],
+                "loser": teams[(week + 2 * i + 1) % 5],
+                "winner_odds": 120,
+                "loser_odds": -140,
+            }
+            for i in range(2)
+        ]
+    data[3].append({"winner": "F", "loser": "A"})
+    return data
+
+
+def replayed(competitor, data, before):
+    """An arena rated on every period before ``before``: the point-in-time reference.
+
+    Glicko deviations grow with wall-clock time between games, so replays agree only to about 1e-8.
+    """
+    arena = make_arena(competitor)
+    for week in sorted(data):
+        if week < before:
+            arena.tournament([(g["winner"], g["loser"], None, None, 1.0) for g in data[week]])
+    return arena
+
+
+def rating(arena, label):
+    competitor = arena.competitors.get(label) or arena.base_competitor(**arena.base_competitor_kwargs)
+    return competitor.rating
+
+
+@pytest.mark.parametrize("competitor", [EloCompetitor, GlickoCompetitor])
+@pytest.mark.parametrize("threaded", [False, True])
+def test_features_use_only_earlier_periods(competitor, threaded):
+    data = season()
+    arena = make_arena(competitor)
+    exporter = FeatureExporter(arena, delta_periods=(1, 3))
+    Backtest(arena, observers=[exporter]).run_and_project(data, evaluate_in_thread=threaded)
+    features = exporter.to_arrays()
+
+    assert len(exporter) == sum(len(games) for games in data.values())
+    for row in range(len(exporter)):
+        period = int(features["period"][row])
+        a, b = features["competitor"][row], features["opponent"][row]
+        reference = replayed(competitor, data, period)
+        assert features["competitor_rating"][row] == pytest.approx(rating(reference, a))
+        assert features["opponent_rating"][row] == pytest.approx(rating(reference, b))
+        assert features["expected_score"][row] == pytest.approx(reference.expected_score(a, b))
+        for k in (1, 3):
+            earlier = replayed(competitor, data, period - k)
+            assert features[f"competitor_delta_{k}"][row] == pytest.approx(
+                rating(reference, a) - rating(earlier, a), abs=1e-6
+            )
+            assert features[f"opponent_delta_{k}"][row] == pytest.approx(
+                rating(reference, b) - rating(earlier, b), abs=1e-6
+            )
+    if competitor is GlickoCompetitor:
+        assert not np.isnan(features["competitor_rd"]).any()
+    else:
+        assert np.isnan(features["competitor_rd"]).all()
+
+
+def test_rows_are_ordered_by_label_not_result():
+    data = {1: [{"winner": "B", "loser": "A", "winner_odds": 150, "loser_odds": -150}]}
+    exporter = FeatureExporter(make_arena())
+    Backtest(exporter.arena, observers=[exporter]).run_and_project(data)
+    features = exporter.to_arrays()
+
+    assert features["competitor"].tolist() == ["A"] and features["won"].tolist() == [0]
+    # A is the -150 favourite: 0.6 against 0.4 before the overround is removed.
+    assert features["implied_probability"][0] == pytest.approx(0.6 / (0.6 + 0.4))
+    assert features["expected_score"][0] == pytest.approx(0.5)
+
+
+def test_npz_and_csv_output(tmp_path):
+    data = season()
+    exporter = FeatureExporter(make_arena())
+    Backtest(exporter.arena, observers=[exporter]).run_and_project(data)
+
+    exporter.write_npz(tmp_path / "features.npz")
+    loaded = load_features(tmp_path / "features.npz")
+    for field, column in exporter.to_arrays().items():
+        np.testing.assert_array_equal(loaded[field], column)
+
+    exporter.write_csv(tmp_path / "features.csv")
+    with open(tmp_path / "features.csv", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(rows[0]) == exporter.fields and len(rows) == len(exporter)
+    assert float(rows[0]["implied_probability"]) == pytest.approx(loaded["implied_probability"][0])
+    assert math.isnan(
+        float(next(row for row in rows if row["competitor"] == "A" and row["opponent"] == "F")["implied_probability"])
+    )
+
+
+def test_other_arenas_get_scores_without_ratings():
+    class FixedArena:
+        def tournament(self, matchups):
+            pass
+
+        def expected_score(self, a, b):
+            return 0.7
+
+    exporter = FeatureExporter(FixedArena())
+    Backtest(exporter.arena, observers=[exporter]).run_and_project(season())
+    features = exporter.to_arrays()
+    assert (features["expected_score"] == 0.7).all()
+    assert np.isnan(features["competitor_rating"]).all() and np.isnan(features["competitor_delta_1"]).all()
+    with pytest.raises(ValueError):
+        FeatureExporter(FixedArena(), delta_periods=(0,))
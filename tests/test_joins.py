@@ -0,0 +1,84 @@
+import datetime
+import itertools
+import random
+
+from keeks_elote.dataset import CompiledDataset
+from keeks_elote.joins import join_feeds, normalize_team
+from keeks_elote.loaders import weekly_periods
+
+
+def test_team_names_are_normalized():
+    assert normalize_team("St. John's") == normalize_team("  ST  JOHNS ") == "st johns"
+
+
+def test_lines_attach_to_results_regardless_of_home_side():
+    results = [
+        {"date": "20170902", "winner": "Alabama", "loser": "Florida St.", "score": "24-7"},
+        {"date": "20170902", "winner": "Ole Miss", "loser": "South Alabama", "score": "47-27"},
+        {"date": "20170909", "winner": "Alabama", "loser": "Fresno State", "score": "41-10"},
+    ]
+    odds = [
+        {"date": "20170902", "home_team": "florida st", "away_team": "ALABAMA", "home_ml": "+250", "away_ml": "-300"},
+        {"date": "20170902", "home_team": "Mississippi", "away_team": "South Alabama", "home_ml": -900, "away_ml": 600},
+        {"date": "20170916", "home_team": "Alabama", "away_team": "Colorado St", "home_ml": -5000, "away_ml": 2000},
+    ]
+
+    joined = join_feeds(results, odds, aliases={"Ole Miss": "Mississippi"})
+
+    assert joined.games[0] == {
+        "date": "20170902",
+        "winner": "Alabama",
+        "loser": "Florida St.",
+        "score": "24-7",
+        "winner_score": 24,
+        "loser_score": 7,
+        "winner_odds": -300,
+        "loser_odds": 250,
+    }
+    assert (joined.games[1]["winner_odds"], joined.games[1]["loser_odds"]) == (-900, 600)
+    assert joined.unmatched_results == [joined.games[2]]
+    assert joined.unmatched_odds == [odds[2]]
+    assert "winner" not in odds[0] and "winner_odds" not in results[0]
+
+
+def test_duplicates_across_feeds_keep_the_first_row():
+    primary = [{"date": "d1", "winner": "A", "loser": "B"}]
+    secondary = [
+        {"date": "d1", "winner": "a", "loser": "b"},
+        {"date": "d1", "winner": "B", "loser": "A"},
+        {"date": "d2", "winner": "C", "loser": "D"},
+    ]
+    lines = [
+        {"date": "d1", "home_team": "A", "away_team": "B", "home_ml": "n/a", "away_ml": 100},
+        {"date": "d1", "home_team": "B", "away_team": "A", "home_ml": 110, "away_ml": -130},
+        {"date": "d1", "home_team": "A", "away_team": "B", "home_ml": -200, "away_ml": 170},
+    ]
+
+    joined = join_feeds(itertools.chain(primary, secondary), lines)
+
+    assert [(game["winner"], game["loser"]) for game in joined.games] == [("A", "B"), ("C", "D")]
+    assert (joined.games[0]["winner_odds"], joined.games[0]["loser_odds"]) == (-130, 110)
+    assert joined.duplicate_results == 1
+    assert joined.conflicting_results == [(secondary[1], joined.games[0])]
+    assert (joined.duplicate_odds, joined.invalid_odds) == (1, 1)
+
+
+def test_joined_games_feed_a_backtest_dataset():
+    rng = random.Random(0)
+    teams = [f"Team {n}" for n in range(20)]
+    results, odds = [], []
+    for day in range(1, 29):
+        a, b = rng.sample(teams, 2)
+        date = f"201709{day:02d}"
+        results.append({"date": date, "winner": a, "loser": b})
+        odds.append({"date": date, "home_team": b.upper(), "away_team": a, "home_ml": 120, "away_ml": -140})
+    rng.shuffle(odds)
+
+    joined = join_feeds(results, odds)
+    periods = joined.periods(weekly_periods(datetime.date(2017, 8, 31)))
+
+    assert sorted(periods) == [1, 2, 3, 4]
+    assert sum(len(games) for games in periods.values()) == 28
+    dataset = CompiledDataset(periods)
+    assert all(game.winner_odds == -140 and game.loser_odds == 120 for entry in dataset for game in entry.games)
+    assert not joined.unmatched_results and not joined.unmatched_odds
@@ -0,0 +1,118 @@
+import random
+
+import numpy as np
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from elote.competitors.glicko import GlickoCompetitor
+
+from keeks_elote import Backtest
+from keeks_elote.branching import branch_arena
+from keeks_elote.league import LeagueMatrix
+from keeks_elote.model_evaluation import probability_matrix
+
+
+class ScalarArena:
+    """Forces the pair-by-pair path over another arena's ratings."""
+
+    def __init__(self, arena):
+        self.arena = arena
+
+    def expected_score(self, a, b):
+        return self.arena.expected_score(a, b)
+
+    def tournament(self, matchups):
+        self.arena.tournament(matchups)
+
+
+class CountingArena:
+    def __init__(self, strengths):
+        self.strengths = strengths
+        self.competitors = dict.fromkeys(strengths)
+        self.calls = 0
+
+    def expected_score(self, a, b):
+        self.calls += 1
+        return self.strengths[a] / (self.strengths[a] + self.strengths[b])
+
+    def tournament(self, matchups):
+        pass
+
+
+def played_arena(competitor):
+    arena = LambdaArena(lambda a, b: a > b, base_competitor=competitor)
+    rng = random.Random(3)
+    arena.tournament([tuple(rng.sample(range(20), 2)) for _ in range(200)])
+    return arena
+
+
+@pytest.mark.parametrize("competitor", [EloCompetitor, GlickoCompetitor])
+def test_bulk_matrix_matches_scalar_scores(competitor):
+    arena = played_arena(competitor)
+    labels = list(range(20)) + ["unseen"]
+
+    bulk = probability_matrix(arena, labels)
+
+    np.testing.assert_allclose(bulk, probability_matrix(ScalarArena(arena), labels), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(probability_matrix(branch_arena(arena), labels), bulk)
+    assert bulk[3, 7] == pytest.approx(arena.expected_score(3, 7))
+
+
+def test_matrix_is_cached_until_the_next_tournament():
+    arena = CountingArena({"A": 3.0, "B": 1.0, "C": 1.0})
+    league = LeagueMatrix(arena)
+
+    first = league.matrix()
+    assert league.matrix() is first
+    assert arena.calls == 3
+
+    league.tournament([("B", "A")])
+    assert league.matrix() is not first
+    assert arena.calls == 6
+
+
+def test_cache_keeps_only_the_most_recent_orderings():
+    arena = CountingArena({"A": 3.0, "B": 1.0, "C": 1.0})
+    league = LeagueMatrix(arena, max_cached=2)
+
+    first = league.matrix(["A", "B"])
+    league.matrix(["B", "C"])
+    assert league.matrix(["A", "B"]) is first
+    league.matrix(["A", "C"])
+
+    assert len(league._cache) == 2
+    assert league.matrix(["A", "B"]) is first
+    assert arena.calls == 3
+    league.matrix(["B", "C"])
+    assert arena.calls == 4
+
+
+def test_tournaments_on_the_wrapped_arena_are_noticed():
+    arena = played_arena(EloCompetitor)
+    league = LeagueMatrix(arena)
+    before = league.probability(19, 0)
+
+    arena.tournament([(0, 19)] * 5)
+
+    assert league.probability(19, 0) != before
+    assert league.probability(19, 0) == pytest.approx(arena.expected_score(19, 0))
+
+
+def test_top_k_and_strongest_opponents():
+    league = LeagueMatrix(CountingArena({"A": 4.0, "B": 2.0, "C": 1.0, "D": 1.0}))
+
+    top = league.top_k(2)
+    assert [label for label, _ in top] == ["A", "B"]
+    assert top[0][1] == pytest.approx((4 / 6 + 4 / 5 + 4 / 5) / 3)
+
+    opponents = league.strongest_opponents("C", 2)
+    assert opponents == [("A", pytest.approx(0.8)), ("B", pytest.approx(2 / 3))]
+    assert len(league.strongest_opponents("C", 10)) == 3
+
+
+def test_league_matrix_drives_a_backtest():
+    arena = LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+    league = LeagueMatrix(arena)
+    Backtest(league).run_and_project({1: [{"winner": "A", "loser": "B"}], 2: [{"winner": "A", "loser": "B"}]})
+    assert league.probability("A", "B") == pytest.approx(arena.expected_score("A", "B"))
+    assert league.probability("A", "B") > 0.5
@@ -0,0 +1,143 @@
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.loaders import (
+    iter_csv_games,
+    iter_ndjson_games,
+    iter_periods,
+    normalize_game,
+    parse_score,
+    stream_periods,
+    weekly_periods,
+)
+
+GAMES = [
+    {"period": 1, "winner": "A", "loser": "B", "score": "28-14", "winner_ml": "+121", "loser_ml": "-149"},
+    {"period": 1, "winner": "C", "loser": "D", "score": "n/a"},
+    {"period": 2, "winner": "A", "loser": "C", "score": "10-7", "winner_ml": "-", "loser_ml": "+100"},
+    {"period": 3, "winner": "B", "loser": "D", "winner_ml": "150", "loser_ml": "-170"},
+]
+
+
+class StubArena:
+    def __init__(self):
+        self.matchups = []
+
+    def expected_score(self, winner, loser):
+        return 0.75
+
+    def tournament(self, matchups):
+        self.matchups.extend(matchups)
+
+
+class AlwaysBet:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1 if probability > 0.5 else 0.0
+
+
+def write_ndjson(path):
+    path.write_text("\n".join(json.dumps(game) for game in GAMES) + "\n\n")
+    return path
+
+
+def test_normalize_game_parses_moneylines_and_scores():
+    game = normalize_game(dict(GAMES[0]))
+
+    assert game["winner_odds"] == 121
+    assert game["loser_odds"] == -149
+    assert (game["winner_score"], game["loser_score"]) == (28, 14)
+
+
+def test_normalize_game_drops_both_odds_when_one_moneyline_is_invalid():
+    game = normalize_game({"winner_ml": "-", "loser_ml": "+100", "winner_odds": 2.0, "loser_odds": 1.9})
+
+    assert "winner_odds" not in game
+    assert "loser_odds" not in game
+
+
+@pytest.mark.parametrize(("value", "expected"), [("28-14", (28, 14)), (" 7 - 3 ", (7, 3)), ("n/a", None), (None, None)])
+def test_parse_score(value, expected):
+    assert parse_score(value) == expected
+
+
+def test_ndjson_games_stream_and_normalize(tmp_path):
+    games = list(iter_ndjson_games(write_ndjson(tmp_path / "games.ndjson")))
+
+    assert len(games) == 4
+    assert games[0]["winner_score"] == 28
+    assert "winner_score" not in games[1]
+    assert "winner_odds" not in games[2]
+
+
+def test_ndjson_reports_the_bad_line():
+    with pytest.raises(ValueError, match="Line 2"):
+        list(iter_ndjson_games(io.StringIO('{"winner": "A", "loser": "B"}\n[1, 2]\n')))
+
+
+def test_csv_games_convert_cells(tmp_path):
+    path = tmp_path / "games.csv.gz"
+    with gzip.open(path, "wt", newline="") as handle:
+        handle.write("period,winner,loser,winner_odds,loser_odds,winner_score,loser_score\n")
+        handle.write("1,A,B,150,-170,21,20\n")
+        handle.write("2,C,D,,,,\n")
+
+    games = list(iter_csv_games(path))
+
+    assert games[0] == {
+        "period": "1",
+        "winner": "A",
+        "loser": "B",
+        "winner_odds": 150,
+        "loser_odds": -170,
+        "winner_score": 21,
+        "loser_score": 20,
+    }
+    assert games[1] == {"period": "2", "winner": "C", "loser": "D"}
+
+
+def test_iter_periods_groups_in_order_and_rejects_disorder():
+    periods = list(iter_periods(GAMES))
+    assert [(period, len(games)) for period, games in periods] == [(1, 2), (2, 1), (3, 1)]
+
+    with pytest.raises(ValueError, match="not in period order"):
+        list(iter_periods([GAMES[2], GAMES[0]]))
+
+
+def test_weekly_periods_match_the_cfb_batching():
+    period_of = weekly_periods(datetime.date(2017, 8, 21))
+
+    assert period_of({"date": "20170822"}) == 1
+    assert period_of({"date": "20170828"}) == 1
+    assert period_of({"date": "20170829"}) == 2
+    assert period_of({"date": "20170821"}) == 0
+
+
+def test_streaming_backtest_matches_run_explicit(tmp_path):
+    path = write_ndjson(tmp_path / "games.jsonl")
+    data = {}
+    for game in iter_ndjson_games(path):
+        data.setdefault(game["period"], []).append(game)
+
+    explicit_arena, streaming_arena = StubArena(), StubArena()
+    explicit = Backtest(explicit_arena).run_explicit(
+        data, AlwaysBet(), BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 1
+    )
+    streamed = Backtest(streaming_arena).run_streaming(
+        stream_periods(path), AlwaysBet(), BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 1
+    )
+
+    assert streamed.history == explicit.history
+    assert len(streamed.history) > 1
+    assert streaming_arena.matchups == explicit_arena.matchups
+
+
+def test_streaming_backtest_rejects_out_of_order_periods():
+    periods = iter([(2, []), (1, [])])
+    with pytest.raises(ValueError, match="strictly increasing"):
+        Backtest(StubArena()).run_streaming(periods, AlwaysBet(), BankRoll(initial_funds=10.0))
@@ -0,0 +1,123 @@
+import pytest
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.observers import BacktestObserver
+from keeks_elote.stopping import RuinStop
+
+
+class FixedArena:
+    def __init__(self):
+        self.tournaments = 0
+
+    def tournament(self, matchups):
+        self.tournaments += 1
+
+    def expected_score(self, a, b):
+        return 0.6 if a == "A" else 0.4
+
+
+class FavoriteStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1 if probability > 0.5 else 0.0
+
+
+class Recorder(BacktestObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_period_start(self, period, games):
+        self.events.append(("start", period, len(games)))
+
+    def on_bets_settled(self, period, settlements, bankroll):
+        self.events.append(("settled", period, [(s.bet.label, s.stake, s.returned) for s in settlements], bankroll))
+
+    def on_ratings_updated(self, period, arena, matchups):
+        self.events.append(("rated", period, arena.tournaments, list(matchups)))
+
+    def on_bets_evaluated(self, period, bets):
+        self.events.append(("evaluated", period, [bet.label for bet in bets]))
+
+    def on_run_end(self, period_summaries, stop_reason):
+        self.events.append(("end", len(period_summaries), stop_reason))
+
+
+def season(periods=3):
+    return {
+        week: [
+            {
+                "winner": "A" if week % 2 else "B",
+                "loser": "B" if week % 2 else "A",
+                "winner_odds": 100,
+                "loser_odds": 100,
+            }
+        ]
+        for week in range(1, periods + 1)
+    }
+
+
+def make_bankroll():
+    return BankRoll(initial_funds=1000.0, percent_bettable=1.0, max_draw_down=1.0)
+
+
+def test_hooks_receive_each_period_in_order():
+    recorder = Recorder()
+    backtest = Backtest(FixedArena(), observers=[recorder])
+
+    backtest.run_explicit(season(), FavoriteStrategy(), make_bankroll(), period_to_start_betting=1)
+
+    assert recorder.events == [
+        ("start", 1, 1),
+        ("rated", 1, 1, [("A", "B")]),
+        ("evaluated", 2, ["A"]),
+        ("start", 2, 1),
+        ("settled", 2, [("A", 100.0, 0.0)], 900.0),
+        ("rated", 2, 2, [("B", "A")]),
+        ("evaluated", 3, ["A"]),
+        ("start", 3, 1),
+        ("settled", 3, [("A", 90.0, 180.0)], 990.0),
+        ("rated", 3, 3, [("A", "B")]),
+        ("end", 3, None),
+    ]
+
+
+def test_partial_observers_and_stop_reasons():
+    class Ends:
+        def on_run_end(self, period_summaries, stop_reason):
+            self.stop_reason = stop_reason
+
+    class HalfOnFavorite:
+        def evaluate(self, probability, current_bankroll):
+            return 0.5 if probability > 0.5 else 0.0
+
+    # A is always the favorite and always loses.
+    losses = {week: [{"winner": "B", "loser": "A", "winner_odds": -110, "loser_odds": 100}] for week in range(10)}
+    ends = Ends()
+    backtest = Backtest(FixedArena(), fast=True)
+    backtest.add_observer(ends)
+    backtest.run_streaming(
+        losses.items(), HalfOnFavorite(), make_bankroll(), period_to_start_betting=0, stop_rules=[RuinStop(0.2)]
+    )
+    assert ends.stop_reason.startswith("ruin")
+
+
+def test_projection_runs_report_periods_and_ratings():
+    recorder = Recorder()
+    Backtest(FixedArena(), observers=[recorder]).run_and_project(season())
+    assert [event[:2] for event in recorder.events] == [
+        ("start", 1),
+        ("rated", 1),
+        ("start", 2),
+        ("rated", 2),
+        ("start", 3),
+        ("rated", 3),
+        ("end", 0),
+    ]
+
+
+def test_unobserved_runs_build_no_event_data(mocker):
+    settlement = mocker.patch("keeks_elote.backtest.Settlement")
+    backtest = Backtest(FixedArena())
+    bankroll = backtest.run_explicit(season(), FavoriteStrategy(), make_bankroll(), period_to_start_betting=1)
+    settlement.assert_not_called()
+    assert bankroll.total_funds == pytest.approx(990.0)
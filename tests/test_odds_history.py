@@ -0,0 +1,114 @@
+import pytest
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.odds_history import LineQuote, OddsHistory
+
+
+class FixedArena:
+    def tournament(self, matchups):
+        pass
+
+    def expected_score(self, a, b):
+        return 0.6 if a == "A" else 0.4
+
+
+class FavoriteStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1 if probability > 0.5 else 0.0
+
+
+def make_history():
+    history = OddsHistory()
+    history.add(2, "A", "B", "north", 10, 100, -120)
+    history.add(2, "A", "B", "south", 20, 120, -140)
+    history.add(2, "A", "B", "north", 30, -110, -105)
+    history.add(2, "A", "B", "south", 5, -105)
+    return history
+
+
+def test_best_line_as_of_takes_each_books_latest_quote():
+    history = make_history()
+
+    assert history.best_line(2, "A", "B", as_of=4) is None
+    assert history.best_line(2, "A", "B", as_of=5) == LineQuote(-105, "south", 5)
+    assert history.best_line(2, "A", "B", as_of=15) == LineQuote(100, "north", 10)
+    assert history.best_line(2, "A", "B", as_of=25) == LineQuote(120, "south", 20)
+    # North moved against A, but south's +120 is still on offer.
+    assert history.best_line(2, "A", "B", as_of=35) == LineQuote(120, "south", 20)
+    assert history.best_line(2, "B", "A", as_of=35) == LineQuote(-105, "north", 30)
+    assert history.best_line(2, "B", "A") == LineQuote(-105, "north", 30)
+    assert history.best_line(3, "A", "B") is None
+    assert len(history) == 4
+
+
+def test_adding_a_quote_after_a_lookup_rebuilds_the_index():
+    history = make_history()
+    assert history.best_line(2, "A", "B").odds == 120
+    history.add(2, "A", "B", "east", 25, 150)
+    assert history.best_line(2, "A", "B", as_of=24).odds == 120
+    assert history.best_line(2, "A", "B", as_of=25) == LineQuote(150, "east", 25)
+
+
+def test_invalid_quotes_are_rejected():
+    with pytest.raises(ValueError):
+        OddsHistory().add(1, "A", "B", "north", 0, 0)
+
+
+def test_from_rows():
+    history = OddsHistory.from_rows(
+        [
+            {"period": 1, "competitor": "A", "opponent": "B", "book": "x", "timestamp": 2, "competitor_odds": 110},
+            {
+                "period": 1,
+                "competitor": "B",
+                "opponent": "A",
+                "book": "y",
+                "timestamp": 1,
+                "competitor_odds": -130,
+                "opponent_odds": 105,
+            },
+        ]
+    )
+    assert history.best_line(1, "A", "B", as_of=1) == LineQuote(105, "y", 1)
+    assert history.best_line(1, "A", "B") == LineQuote(110, "x", 2)
+    assert history.best_line(1, "B", "A").odds == -130
+
+
+@pytest.mark.parametrize(("as_of", "payoff"), [(15, 1.0), (25, 1.2), (None, 1.2)])
+def test_backtest_sizes_and_settles_at_the_as_of_line(as_of, payoff):
+    data = {
+        1: [{"winner": "C", "loser": "D"}],
+        2: [{"winner": "A", "loser": "B", "winner_odds": -200, "loser_odds": 170}],
+    }
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=1.0, max_draw_down=1.0)
+    backtest = Backtest(FixedArena(), odds_history=make_history(), decision_time=lambda period: as_of)
+
+    backtest.run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=0)
+
+    assert backtest.period_summaries[1].bets_placed == 1
+    assert bankroll.total_funds == pytest.approx(1000.0 + 100.0 * payoff)
+
+
+def test_backtest_falls_back_to_the_games_own_odds():
+    data = {
+        1: [{"winner": "C", "loser": "D"}],
+        2: [{"winner": "A", "loser": "B", "winner_odds": 150, "loser_odds": -170}],
+    }
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=1.0, max_draw_down=1.0)
+    backtest = Backtest(FixedArena(), odds_history=make_history(), decision_time=lambda period: 1)
+
+    backtest.run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=0)
+
+    assert bankroll.total_funds == pytest.approx(1000.0 + 100.0 * 1.5)
+
+
+def test_games_without_their_own_odds_are_priced_from_the_history():
+    data = {1: [{"winner": "C", "loser": "D"}], 2: [{"winner": "B", "loser": "A"}]}
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=1.0, max_draw_down=1.0)
+    backtest = Backtest(FixedArena(), odds_history=make_history())
+
+    backtest.run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=0)
+
+    assert backtest.period_summaries[1].bets_placed == 1
+    assert bankroll.total_funds == pytest.approx(1000.0 - 100.0)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from keeks_elote.parallel import (
+    MonteCarloExecutor,
+    SharedArrays,
+    attach_shared,
+    bet_arrays,
+    bootstrap_period_paths,
+    simulate_outcome_paths,
+)
+from keeks_elote.records import Bet
+
+
+@pytest.fixture
+def arrays():
+    return bet_arrays(
+        {
+            3: [Bet("A", "C", 0.2, 0.8, 1.0, True, 0.7)],
+            1: [Bet("A", "B", 0.1, 1.0, 1.0, True, 0.6), Bet("C", "D", 0.05, 1.5, 1.0, False, 0.45)],
+            2: [],
+        }
+    )
+
+
+def test_bet_arrays_flattens_periods_in_order(arrays):
+    np.testing.assert_array_equal(arrays["period_start"], [0, 2, 2, 3])
+    np.testing.assert_allclose(arrays["fraction"], [0.1, 0.05, 0.2])
+    np.testing.assert_array_equal(arrays["outcome"], [True, False, True])
+    np.testing.assert_allclose(arrays["probability"], [0.6, 0.45, 0.7])
+
+
+def test_shared_arrays_round_trip_read_only(arrays):
+    with SharedArrays(arrays) as shared:
+        block, views = attach_shared(shared.spec)
+        try:
+            for key, array in arrays.items():
+                np.testing.assert_array_equal(views[key], array)
+            assert not views["fraction"].flags.writeable
+        finally:
+            del views
+            block.close()
+
+
+def test_bootstrap_of_one_period_is_that_period(arrays):
+    single = bet_arrays({1: [Bet("A", "B", 0.1, 1.0, 1.0, True, 0.6), Bet("C", "D", 0.05, 1.5, 1.0, False, 0.45)]})
+    with MonteCarloExecutor(single, max_workers=1, seed=0) as executor:
+        paths = executor.run(bootstrap_period_paths, 10)
+    np.testing.assert_allclose(paths, 1.0 + 0.1 - 0.05)
+
+
+def test_results_do_not_depend_on_worker_count(arrays):
+    with MonteCarloExecutor(arrays, max_workers=1, chunk_size=250, seed=7) as executor:
+        serial = executor.run(simulate_outcome_paths, 1000)
+    with MonteCarloExecutor(arrays, max_workers=2, chunk_size=250, seed=7) as executor:
+        pooled = executor.run(simulate_outcome_paths, 1000)
+        pooled_chunks = executor.map(simulate_outcome_paths, 1000)
+
+    assert serial.shape == (1000,)
+    np.testing.assert_array_equal(serial, pooled)
+    assert [len(chunk) for chunk in pooled_chunks] == [250, 250, 250, 250]
+    np.testing.assert_array_equal(np.concatenate(pooled_chunks), serial)
+
+
+def test_outcome_paths_center_on_the_expected_return(arrays):
+    with MonteCarloExecutor(arrays, max_workers=1, chunk_size=20000, seed=1) as executor:
+        paths = executor.run(simulate_outcome_paths, 40000)
+    first = 1.0 + 0.6 * 0.1 - 0.4 * 0.1 + 0.45 * 0.05 * 1.5 - 0.55 * 0.05
+    last = 1.0 + 0.7 * 0.2 * 0.8 - 0.3 * 0.2
+    assert paths.mean() == pytest.approx(first * last, abs=0.005)
+
+
+def test_chunk_size_must_be_positive(arrays):
+    with pytest.raises(ValueError):
+        MonteCarloExecutor(arrays, chunk_size=0)
@@ -0,0 +1,107 @@
+import json
+import math
+
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from elote.competitors.glicko import GlickoCompetitor
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.persistence import RatingSnapshot, export_ratings, load_ratings, save_ratings, warm_start
+
+
+class FavoriteStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1 if probability > 0.5 else 0.0
+
+
+def played_arena(competitor=GlickoCompetitor):
+    arena = LambdaArena(lambda a, b: True, base_competitor=competitor)
+    arena.tournament([(1, 2), (1, 3), (2, 3), (1, 2)])
+    return arena
+
+
+@pytest.mark.parametrize("name", ["ratings.json", "ratings.json.gz"])
+def test_saved_ratings_round_trip(tmp_path, name):
+    arena = played_arena()
+    saved = save_ratings(arena, tmp_path / name)
+    loaded = load_ratings(tmp_path / name)
+
+    assert loaded == saved
+    assert loaded.competitor_type == "GlickoCompetitor"
+    assert set(loaded.ratings) == {1, 2, 3}  # Integer labels survive JSON.
+    assert loaded.ratings[1] == (arena.competitors[1].rating, arena.competitors[1].rd)
+
+
+def test_tuple_labels_round_trip(tmp_path):
+    arena = LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+    arena.tournament([(("A", 2017), ("B", 2017)), (("A", 2017), ("C", ("x", 1)))])
+    saved = save_ratings(arena, tmp_path / "ratings.json")
+
+    loaded = load_ratings(tmp_path / "ratings.json")
+
+    assert loaded == saved
+    assert set(loaded.ratings) == {("A", 2017), ("B", 2017), ("C", ("x", 1))}
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other.json"
+    path.write_text(json.dumps({"format": "something-else"}))
+    with pytest.raises(ValueError):
+        load_ratings(path)
+
+
+def test_warm_start_regresses_and_inflates():
+    snapshot = RatingSnapshot("GlickoCompetitor", {"A": (1700.0, 50.0), "B": (1300.0, 300.0)})
+    arena = LambdaArena(lambda a, b: True, base_competitor=GlickoCompetitor)
+
+    seeded = warm_start(arena, snapshot, regression=0.25, rd_inflation=40.0, max_rd=200.0)
+
+    assert seeded == ["A", "B"]
+    assert arena.competitors["A"].rating == pytest.approx(1650.0)
+    assert arena.competitors["B"].rating == pytest.approx(1350.0)
+    assert arena.competitors["A"].rd == pytest.approx(math.hypot(50.0, 40.0))
+    assert arena.competitors["B"].rd == 200.0
+
+
+def test_warm_start_without_rating_deviation_carries_ratings_over():
+    source = played_arena(EloCompetitor)
+    arena = LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+
+    warm_start(arena, export_ratings(source), rd_inflation=50.0)
+
+    for label in (1, 2, 3):
+        assert arena.competitors[label].rating == pytest.approx(source.competitors[label].rating)
+    assert arena.expected_score(1, 3) == pytest.approx(source.expected_score(1, 3))
+
+
+def test_warm_start_validates_its_arguments():
+    snapshot = RatingSnapshot("", {})
+    with pytest.raises(ValueError):
+        warm_start(played_arena(), snapshot, regression=1.5)
+    with pytest.raises(TypeError):
+        warm_start(object(), snapshot)
+
+
+def test_warm_started_backtest_bets_the_first_period():
+    prior = played_arena(EloCompetitor)
+    arena = LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+    warm_start(arena, export_ratings(prior))
+    data = {1: [{"winner": 1, "loser": 3, "winner_odds": 150, "loser_odds": -170}]}
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+
+    backtest = Backtest(arena)
+    backtest.run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=0, price_first_period=True)
+
+    assert backtest.period_summaries[0].bets_placed == 1
+    assert bankroll.total_funds == pytest.approx(1000.0 + 100.0 * 1.5)
+    assert backtest.arena is arena
+
+
+def test_first_period_is_not_priced_by_default():
+    data = {1: [{"winner": 1, "loser": 3, "winner_odds": 150, "loser_odds": -170}]}
+    backtest = Backtest(played_arena(EloCompetitor))
+    bankroll = BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+    backtest.run_explicit(data, FavoriteStrategy(), bankroll, period_to_start_betting=0)
+    assert backtest.period_summaries[0].bets_placed == 0
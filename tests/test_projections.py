@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+
+from keeks_elote import Backtest
+from keeks_elote.projections import (
+    ColumnarSink,
+    CsvSink,
+    NdjsonSink,
+    NpzSink,
+    Projection,
+    load_projections,
+    write_batched,
+)
+
+ROWS = [Projection(2, "A", "B", 0.625), Projection(2, "C", "D", 0.25)]
+
+
+class RecordingSink(ColumnarSink):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.closed = False
+
+    def write(self, projections):
+        self.batches.append(len(projections))
+        super().write(projections)
+
+    def close(self):
+        self.closed = True
+
+
+class PlainArena:
+    def __init__(self):
+        self.matchups = []
+
+    def tournament(self, matchups):
+        self.matchups.extend(matchups)
+
+    def expected_score(self, a, b):
+        return 0.75
+
+
+def make_arena():
+    return LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+
+
+def make_data():
+    teams = ["A", "B", "C", "D", "E", "F"]
+    return {
+        week: [{"winner": teams[(i + week) % 6], "loser": teams[(i + week + 1) % 6]} for i in range(0, 6, 2)]
+        for week in range(1, 6)
+    }
+
+
+def test_projection_favorite():
+    assert ROWS[0].favorite == "A"
+    assert ROWS[1].favorite == "D"
+
+
+def test_columnar_sink_collects_columns():
+    sink = ColumnarSink()
+    sink.write(ROWS)
+    arrays = sink.to_arrays()
+    assert len(sink) == 2
+    np.testing.assert_array_equal(arrays["competitor"], ["A", "C"])
+    np.testing.assert_allclose(arrays["probability"], [0.625, 0.25])
+
+
+def test_csv_and_ndjson_sinks_write_every_row():
+    csv_buffer, ndjson_buffer = io.StringIO(), io.StringIO()
+    for sink in (CsvSink(csv_buffer), NdjsonSink(ndjson_buffer)):
+        sink.write(ROWS[:1])
+        sink.write(ROWS[1:])
+        sink.close()
+
+    rows = list(csv.DictReader(io.StringIO(csv_buffer.getvalue())))
+    assert [row["competitor"] for row in rows] == ["A", "C"]
+    assert float(rows[1]["probability"]) == 0.25
+    records = [json.loads(line) for line in ndjson_buffer.getvalue().splitlines()]
+    assert records[0] == {"period": 2, "competitor": "A", "opponent": "B", "probability": 0.625}
+
+
+def test_npz_sink_round_trips(tmp_path):
+    sink = NpzSink(tmp_path / "projections.npz")
+    sink.write(ROWS)
+    sink.close()
+    loaded = load_projections(tmp_path / "projections.npz")
+    np.testing.assert_array_equal(loaded["period"], [2, 2])
+    np.testing.assert_array_equal(loaded["opponent"], ["B", "D"])
+    np.testing.assert_allclose(loaded["probability"], [0.625, 0.25])
+
+
+def test_write_batched_splits_by_batch_size():
+    sink = RecordingSink()
+    write_batched(sink, ROWS * 3, 4)
+    write_batched(sink, ROWS, None)
+    assert sink.batches == [4, 2, 2]
+
+
+def test_run_and_project_streams_each_slate_to_the_sink():
+    sink = RecordingSink()
+    returned = Backtest(make_arena()).run_and_project(make_data(), sink=sink, batch_size=2)
+
+    assert returned is sink
+    assert sink.closed
+    assert sink.batches == [2, 1] * 4
+    assert sink.columns["period"] == [2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5]
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_threaded_projection_matches_sequential(fast):
+    sequential, threaded = Backtest(make_arena(), fast=fast), Backtest(make_arena(), fast=fast)
+
+    expected = sequential.run_and_project(make_data(), sink=ColumnarSink())
+    actual = threaded.run_and_project(make_data(), sink=ColumnarSink(), evaluate_in_thread=True)
+
+    assert actual.columns == expected.columns
+    for a, b in [("A", "B"), ("C", "F"), ("E", "D")]:
+        assert threaded.arena.expected_score(a, b) == sequential.arena.expected_score(a, b)
+    assert len(threaded.arena.history.bouts) == len(sequential.arena.history.bouts) == 15
+
+
+def test_threaded_projection_falls_back_for_unbranchable_arenas():
+    arena = PlainArena()
+    sink = Backtest(arena).run_and_project(make_data(), sink=ColumnarSink(), evaluate_in_thread=True)
+    assert len(sink) == 12
+    assert len(arena.matchups) == 15
@@ -0,0 +1,100 @@
+import sys
+
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.data_handling import prepare_data
+from keeks_elote.data_quality import INVALID_ODDS
+from keeks_elote.records import Bet, GameRecord, to_records
+
+
+class StubArena:
+    def expected_score(self, winner, loser):
+        return 0.75
+
+    def tournament(self, matchups):
+        pass
+
+
+class FavoriteStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.2 if probability > 0.5 else 0.0
+
+
+class AnySideStrategy:
+    def evaluate(self, probability, current_bankroll):
+        return 0.1
+
+
+def test_from_dict_keeps_the_schema_fields():
+    game = {"winner": "A", "loser": "B", "winner_odds": 150, "loser_odds": -170, "date": "20170901"}
+
+    record = GameRecord.from_dict(game)
+
+    assert record == GameRecord("A", "B", 150, -170)
+    assert record.has_odds and not GameRecord("A", "B", None, -170).has_odds
+    assert not GameRecord("A", "B").has_odds
+    assert record.to_dict() == {"winner": "A", "loser": "B", "winner_odds": 150, "loser_odds": -170}
+    assert GameRecord.from_dict(record) is record
+
+
+def test_records_answer_dict_style_lookups():
+    record = GameRecord("A", "B", winner_score=21)
+    bet = Bet("A", "B", 0.1, 1.5, 1.0, True)
+
+    assert record.get("winner") == "A"
+    assert record.get("loser_score", 0) == 0
+    assert record.get("date", "unknown") == "unknown"
+    assert record["winner_score"] == 21
+    assert record[0] == "A"
+    assert "winner_score" in record and "A" not in record
+    assert "winner_odds" not in record and "date" not in record
+    assert record.keys() == ["winner", "loser", "winner_score"]
+    assert dict(record) == {"winner": "A", "loser": "B", "winner_score": 21}
+    assert bet["fraction"] == 0.1
+    assert bet[2] == 0.1
+
+
+def test_records_are_smaller_than_game_dicts():
+    game = {"winner": "A", "loser": "B", "winner_odds": 150, "loser_odds": -170, "winner_score": 21, "loser_score": 7}
+
+    assert sys.getsizeof(GameRecord.from_dict(game)) < sys.getsizeof(game)
+
+
+def test_prepare_data_accepts_records():
+    data = {1: [GameRecord("A", "B"), GameRecord(None, "B")]}
+
+    assert prepare_data(data) == {1: [GameRecord("A", "B")]}
+
+
+def test_record_and_dict_inputs_backtest_identically():
+    games = {
+        1: [{"winner": "A", "loser": "B"}],
+        2: [{"winner": "A", "loser": "B", "winner_odds": 150, "loser_odds": -200}],
+    }
+    records = {period: to_records(period_games) for period, period_games in games.items()}
+
+    from_dicts = Backtest(StubArena()).run_explicit(
+        games, FavoriteStrategy(), BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 1
+    )
+    from_records = Backtest(StubArena()).run_explicit(
+        records, FavoriteStrategy(), BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 1
+    )
+
+    assert from_dicts.total_funds == from_records.total_funds == 1300.0
+
+
+def test_games_priced_on_one_side_only_are_not_bet():
+    games = {
+        1: [{"winner": "A", "loser": "B"}],
+        2: [{"winner": "A", "loser": "B", "winner_odds": None, "loser_odds": -200}],
+        3: [{"winner": "B", "loser": "A", "winner_odds": 150, "loser_odds": None}],
+    }
+    backtest = Backtest(StubArena())
+
+    backtest.run_explicit(
+        games, AnySideStrategy(), BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0), 1
+    )
+
+    assert [summary.bets_placed for summary in backtest.period_summaries] == [0, 0, 0]
+    assert INVALID_ODDS not in backtest.data_quality.counts
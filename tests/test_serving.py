@@ -0,0 +1,135 @@
+import asyncio
+import math
+
+import pytest
+from elote import EloCompetitor, GlickoCompetitor, LambdaArena
+from keeks.binary_strategies.simple import FixedFractionStrategy
+
+from keeks_elote.model_evaluation import pair_probabilities
+from keeks_elote.serving import ProjectionServer, StakeQuote
+
+
+def make_arena(competitor=EloCompetitor):
+    arena = LambdaArena(lambda a, b, attributes=None: True, base_competitor=competitor)
+    arena.tournament([("A", "B"), ("A", "C"), ("B", "C"), ("D", "A")])
+    return arena
+
+
+class CountingArena:
+    def __init__(self):
+        self.ratings = {"A": 0.6, "B": 0.4}
+        self.calls = 0
+
+    def tournament(self, matchups):
+        for winner, loser in matchups:
+            self.ratings[winner], self.ratings[loser] = 0.9, 0.1
+
+    def expected_score(self, a, b):
+        self.calls += 1
+        return self.ratings[a]
+
+
+@pytest.mark.parametrize("competitor", [EloCompetitor, GlickoCompetitor])
+def test_pair_probabilities_match_expected_score(competitor):
+    arena = make_arena(competitor)
+    pairs = [("A", "B"), ("B", "A"), ("C", "D"), ("A", "A"), ("D", "B")]
+    expected = [arena.expected_score(a, b) for a, b in pairs]
+    assert pair_probabilities(arena, pairs) == pytest.approx(expected)
+    assert pair_probabilities(arena, []).shape == (0,)
+
+
+def test_concurrent_requests_are_batched():
+    arena = make_arena()
+
+    async def main():
+        async with ProjectionServer(arena, latency_target=0.05) as server:
+            pairs = [("A", "B"), ("C", "D"), ("B", "A")] * 20
+            results = await asyncio.gather(*(server.probability(a, b) for a, b in pairs))
+            return pairs, results, server.metrics()
+
+    pairs, results, metrics = asyncio.run(main())
+    assert results == pytest.approx([arena.expected_score(a, b) for a, b in pairs])
+    assert metrics.requests == 60 and metrics.batches == 1 and metrics.largest_batch == 60
+    assert metrics.mean_batch_size == 60.0
+    assert 0 <= metrics.latency_p50 <= metrics.latency_p99 <= metrics.latency_max
+
+
+def test_batches_are_capped_and_flushed_without_waiting():
+    async def main():
+        async with ProjectionServer(make_arena(), max_batch_size=8, latency_target=0) as server:
+            await asyncio.gather(*(server.probability("A", "B") for _ in range(20)))
+            return server.metrics()
+
+    metrics = asyncio.run(main())
+    assert metrics.requests == 20 and metrics.batches == 3 and metrics.largest_batch == 8
+
+
+def test_updates_apply_between_batches_in_submission_order():
+    arena = CountingArena()
+
+    async def main():
+        async with ProjectionServer(arena, latency_target=1.0) as server:
+            return await asyncio.gather(
+                server.probability("A", "B"),
+                server.update([("B", "A")]),
+                server.probability("A", "B"),
+            ), server.metrics()
+
+    (before, _, after), metrics = asyncio.run(main())
+    assert (before, after) == (0.6, 0.1)
+    assert metrics.batches == 2 and metrics.updates == 1
+
+
+def test_stake_quotes_use_the_offered_price():
+    strategy = FixedFractionStrategy(fraction=0.1, payoff=1.0, loss=1.0, min_probability=0.5)
+
+    async def main():
+        async with ProjectionServer(CountingArena(), strategy) as server:
+            return await asyncio.gather(server.stake("A", "B", 150, 1000.0), server.stake("B", "A", -150, 1000.0))
+
+    favorite, underdog = asyncio.run(main())
+    assert favorite == StakeQuote(0.6, pytest.approx(0.1), pytest.approx(100.0))
+    assert underdog.probability == 0.4 and underdog.stake == 0.0
+
+
+def test_errors_reach_their_callers():
+    async def main():
+        async with ProjectionServer(CountingArena()) as server:
+            with pytest.raises(RuntimeError, match="strategy"):
+                await server.stake("A", "B", 100, 10.0)
+            with pytest.raises(KeyError):
+                await server.probability("X", "B")
+            with pytest.raises(ValueError):
+                await server.update([("A", "B", "C")])
+            # The worker survives failed requests.
+            probability = await server.probability("A", "B")
+        with pytest.raises(RuntimeError, match="not running"):
+            await server.probability("A", "B")
+        return probability, server.metrics()
+
+    probability, metrics = asyncio.run(main())
+    assert probability == 0.6
+    assert metrics.errors == 2 and metrics.requests == 1 and metrics.updates == 0
+
+
+def test_metrics_before_any_request():
+    metrics = ProjectionServer(CountingArena()).metrics()
+    assert metrics.requests == 0 and metrics.mean_batch_size == 0.0
+    assert math.isnan(metrics.latency_p99)
+    with pytest.raises(ValueError):
+        ProjectionServer(CountingArena(), max_batch_size=0)
+
+
+def test_an_empty_context_starts_and_stops_cleanly():
+    server = ProjectionServer(CountingArena())
+
+    async def main():
+        async with server:
+            pass
+        assert not server.running
+        # A stopped server can be started again.
+        async with server:
+            return await server.probability("A", "B")
+
+    assert asyncio.run(main()) == 0.6
+    assert not server.running
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from keeks_elote.model_evaluation import probability_matrix
+from keeks_elote.simulation import SeasonSimulator
+
+
+class TableArena:
+    """Arena whose expected scores come from a fixed strength table."""
+
+    def __init__(self, strengths):
+        self.strengths = strengths
+        self.calls = 0
+
+    def expected_score(self, a, b):
+        self.calls += 1
+        return self.strengths[a] / (self.strengths[a] + self.strengths[b])
+
+    def tournament(self, matchups):
+        raise AssertionError("the simulator must not update the arena")
+
+
+def round_robin(teams, periods=1):
+    schedule = {}
+    for period in range(1, periods + 1):
+        schedule[period] = [{"winner": a, "loser": b} for i, a in enumerate(teams) for b in teams[i + 1 :]]
+    return schedule
+
+
+def test_probability_matrix_asks_each_pair_once():
+    arena = TableArena({"A": 3.0, "B": 1.0, "C": 1.0})
+
+    matrix = probability_matrix(arena, ["A", "B", "C"])
+
+    assert arena.calls == 3
+    assert matrix[0, 1] == pytest.approx(0.75)
+    assert matrix[1, 0] == pytest.approx(0.25)
+    assert np.allclose(np.diag(matrix), 0.5)
+
+
+def test_expected_wins_match_the_matrix():
+    arena = TableArena({"A": 3.0, "B": 1.0})
+    result = SeasonSimulator(arena, seed=7).simulate(round_robin(["A", "B"], periods=4), n_simulations=20000)
+
+    expected = result.expected_wins()
+    assert expected["A"] == pytest.approx(3.0, abs=0.05)
+    assert expected["B"] == pytest.approx(1.0, abs=0.05)
+    assert result.wins.shape == (20000, 2)
+    assert result.win_distribution("A").sum() == pytest.approx(1.0)
+
+
+def test_results_are_reproducible_from_the_seed():
+    arena = TableArena({"A": 2.0, "B": 1.0, "C": 1.5})
+    schedule = round_robin(["A", "B", "C"], periods=3)
+
+    first = SeasonSimulator(arena, seed=3).simulate(schedule, n_simulations=500)
+    second = SeasonSimulator(arena, seed=3).simulate(schedule, n_simulations=500)
+
+    assert np.array_equal(first.wins, second.wins)
+    assert np.array_equal(first.ranks(), second.ranks())
+
+
+def test_banked_wins_are_added_to_every_simulation():
+    arena = TableArena({"A": 1.0, "B": 1.0})
+    result = SeasonSimulator(arena, seed=0).simulate(round_robin(["A", "B"]), 100, current_wins={"A": 5})
+
+    assert result.wins[:, 0].min() >= 5
+    assert (result.wins.sum(axis=1) == 6).all()
+
+
+def test_repeat_games_in_a_period_all_count():
+    arena = TableArena({"A": 1.0, "B": 1.0, "C": 1.0})
+    schedule = {1: [{"winner": "A", "loser": "B"}, {"winner": "A", "loser": "C"}, {"winner": "B", "loser": "A"}]}
+
+    result = SeasonSimulator(arena, update_ratings=True, seed=0).simulate(schedule, 200)
+
+    assert (result.wins.sum(axis=1) == 3).all()
+    assert result.wins[:, 0].max() <= 3
+
+
+def test_competitors_must_cover_the_schedule():
+    simulator = SeasonSimulator(TableArena({"A": 1.0, "B": 1.0, "C": 1.0}), seed=0)
+
+    with pytest.raises(ValueError, match="'D', 'B'"):
+        simulator.simulate(round_robin(["A", "B"]), 10, current_wins={"D": 1}, competitors=["A", "C"])
+
+
+def test_standings_and_playoff_odds_are_consistent():
+    arena = TableArena({"A": 10.0, "B": 1.0, "C": 1.0, "D": 1.0})
+    result = SeasonSimulator(arena, seed=1).simulate(round_robin(list("ABCD"), periods=3), 5000)
+
+    standings = result.standings_probabilities()
+    assert np.allclose(standings.sum(axis=0), 1.0)
+    assert np.allclose(standings.sum(axis=1), 1.0)
+    odds = result.playoff_odds(2)
+    assert sum(odds.values()) == pytest.approx(2.0)
+    assert odds["A"] > 0.95
+
+
+def test_bracket_odds_for_a_fixed_bracket():
+    arena = TableArena({"A": 3.0, "B": 1.0, "C": 1.0, "D": 1.0})
+    result = SeasonSimulator(arena, seed=2).simulate({1: []}, 40000, competitors=list("ABCD"))
+
+    odds = result.bracket_odds(bracket=["A", "B", "C", "D"])
+
+    assert odds["A"][0] == pytest.approx(0.75, abs=0.01)
+    assert odds["A"][1] == pytest.approx(0.75 * 0.75, abs=0.01)
+    assert sum(v[-1] for v in odds.values()) == pytest.approx(1.0)
+
+
+def test_bracket_seeded_from_standings():
+    arena = TableArena({"A": 5.0, "B": 1.0, "C": 1.0, "D": 1.0})
+    result = SeasonSimulator(arena, seed=4).simulate(round_robin(list("ABCD"), periods=2), 2000)
+
+    odds = result.bracket_odds(teams=2)
+
+    assert sum(v[-1] for v in odds.values()) == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        result.bracket_odds(teams=3)
+
+
+def test_in_simulation_rating_updates_widen_the_distribution():
+    arena = TableArena({"A": 1.0, "B": 1.0})
+    schedule = round_robin(["A", "B"], periods=30)
+
+    fixed = SeasonSimulator(arena, seed=5).simulate(schedule, 4000)
+    moving = SeasonSimulator(arena, update_ratings=True, k_factor=0.3, seed=5).simulate(schedule, 4000)
+
+    assert fixed.expected_wins()["A"] == pytest.approx(15.0, abs=0.3)
+    assert moving.wins[:, 0].std() > fixed.wins[:, 0].std()
@@ -0,0 +1,103 @@
+import pytest
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.backtest import PeriodSummary
+from keeks_elote.stopping import BenchmarkStop, DrawdownStop, MinimumBetsStop, RuinStop
+
+
+class FixedArena:
+    def __init__(self):
+        self.tournaments = 0
+
+    def tournament(self, matchups):
+        self.tournaments += 1
+
+    def expected_score(self, a, b):
+        return 0.6 if a == "A" else 0.4
+
+
+class FractionStrategy:
+    def __init__(self, fraction):
+        self.fraction = fraction
+
+    def evaluate(self, probability, current_bankroll):
+        return self.fraction if probability > 0.5 else 0.0
+
+
+def losing_season(periods=10):
+    # A is always the favorite and always loses.
+    return {week: [{"winner": "B", "loser": "A", "winner_odds": -110, "loser_odds": 100}] for week in range(periods)}
+
+
+def make_bankroll(max_draw_down=1.0):
+    return BankRoll(initial_funds=1000.0, percent_bettable=1.0, max_draw_down=max_draw_down)
+
+
+def run(stop_rules, strategy=None, data=None, bankroll=None):
+    backtest = Backtest(FixedArena())
+    bankroll = bankroll or make_bankroll()
+    backtest.run_explicit(
+        data or losing_season(),
+        strategy or FractionStrategy(0.5),
+        bankroll,
+        period_to_start_betting=0,
+        stop_rules=stop_rules,
+    )
+    return backtest, bankroll
+
+
+def test_runs_without_rules_play_every_period():
+    backtest, _ = run(())
+    assert len(backtest.period_summaries) == 10
+    assert backtest.stop_reason is None
+
+
+def test_ruin_stops_betting_but_keeps_rating_the_remaining_periods():
+    backtest, bankroll = run([RuinStop(min_fraction=0.1)])
+
+    # 1000 halves each betting period: 500, 250, 125, 62.50 -> ruined after period 4.
+    assert [summary.period for summary in backtest.period_summaries] == [0, 1, 2, 3, 4]
+    assert backtest.arena.tournaments == 10
+    assert bankroll.total_funds == pytest.approx(62.5)
+    assert backtest.stop_reason.startswith("ruin")
+
+
+def test_drawdown_defaults_to_the_bankrolls_limit():
+    backtest, _ = run([DrawdownStop()], bankroll=make_bankroll(max_draw_down=0.7))
+    assert len(backtest.period_summaries) == 3
+    assert backtest.stop_reason.startswith("drawdown: 75.0%")
+
+    backtest, _ = run([DrawdownStop(0.4)])
+    assert len(backtest.period_summaries) == 2
+
+
+def test_inactive_strategies_are_stopped():
+    backtest, _ = run([MinimumBetsStop(min_bets=1, by_period=3)], strategy=FractionStrategy(0.0))
+    assert backtest.period_summaries[-1].period == 3
+    assert backtest.stop_reason.startswith("inactive")
+
+
+def test_first_rule_to_fire_gives_the_reason():
+    backtest, _ = run([MinimumBetsStop(min_bets=100, by_period=6), DrawdownStop(0.9)])
+    assert backtest.period_summaries[-1].period == 4
+    assert backtest.stop_reason.startswith("drawdown")
+
+
+def test_falling_behind_a_benchmark():
+    benchmark, _ = run((), strategy=FractionStrategy(0.1))
+    rule = BenchmarkStop(benchmark.period_summaries, tolerance=0.2, after_period=1)
+
+    backtest, _ = run([rule])
+
+    # Period 1 is the warm-up; by period 2 the run holds 250 against the benchmark's 810.
+    assert backtest.period_summaries[-1].period == 2
+    assert "behind benchmark" in backtest.stop_reason
+    assert BenchmarkStop({5: 100.0})([PeriodSummary(5, 1, 0, 0.0, 0.0, 0, 0.0)], make_bankroll()) is None
+
+
+def test_stop_rules_validate_their_arguments():
+    with pytest.raises(ValueError):
+        RuinStop(1.0)
+    with pytest.raises(ValueError):
+        DrawdownStop(0.0)
@@ -0,0 +1,67 @@
+import pickle
+import random
+
+import pytest
+
+from keeks_elote.dataset import CompiledDataset
+from keeks_elote.timeline import TimelineEntry
+
+
+def league(weeks=12, teams=8, seed=3):
+    rng = random.Random(seed)
+    data = {}
+    for week in range(1, weeks + 1):
+        if week == 5:
+            continue  # a bye week
+        order = rng.sample(range(teams), teams)
+        data[week] = [{"winner": a, "loser": b} for a, b in zip(order[::2], order[1::2])]
+    return data
+
+
+def scan(data, team, start=None, before=None):
+    return [
+        (week, game["winner"] == team)
+        for week in sorted(data)
+        for game in data[week]
+        if team in (game["winner"], game["loser"])
+        and (start is None or week >= start)
+        and (before is None or week < before)
+    ]
+
+
+@pytest.mark.parametrize("start, before", [(None, None), (None, 6), (3, 9), (5, 6), (9, 3), (None, 1)])
+def test_as_of_queries_match_a_full_scan(start, before):
+    data = league()
+    timeline = CompiledDataset(data).timeline
+    for team in range(8):
+        games = timeline.games(team, start=start, before=before)
+        assert [(entry.period, entry.won) for entry in games] == scan(data, team, start, before)
+        assert all(team in (entry.game.winner, entry.game.loser) for entry in games)
+        if start is None:
+            assert timeline.count(team, before=before) == len(games)
+
+
+def test_recent_results_for_a_slate():
+    data = league()
+    dataset = CompiledDataset(data)
+    slate = dataset[10].games
+    teams = [label for game in slate for label in (game.winner, game.loser)]
+
+    recent = dataset.timeline.recent(teams, last=3, before=10)
+
+    assert set(recent) == set(teams)
+    for team, games in recent.items():
+        assert [(entry.period, entry.won) for entry in games] == scan(data, team, before=10)[-3:]
+
+
+def test_positions_are_read_only_and_unknown_competitors_are_empty():
+    dataset = CompiledDataset({1: [{"winner": "A", "loser": "B"}], 2: [{"winner": "B", "loser": "C"}]})
+    timeline = dataset.timeline
+
+    assert timeline is dataset.timeline
+    assert len(timeline) == 2 and "C" in timeline and "Z" not in timeline
+    assert timeline.positions("B").tolist() == [0, 1]
+    assert not timeline.positions("B").flags.writeable
+    assert timeline.games("Z") == [] and timeline.count("Z") == 0
+    assert timeline.games("B", last=1) == [TimelineEntry(2, dataset[2].games[0], True)]
+    assert pickle.loads(pickle.dumps(dataset)).timeline.games("A") == timeline.games("A")
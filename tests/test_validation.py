@@ -0,0 +1,110 @@
+import math
+
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from keeks.bankroll import BankRoll
+
+from keeks_elote import Backtest
+from keeks_elote.validation import (
+    CrossValidationResult,
+    Fold,
+    cross_validate,
+    run_fold,
+    walk_forward_folds,
+)
+
+
+class FavoriteStrategy:
+    def __init__(self, fraction=0.1):
+        self.fraction = fraction
+
+    def evaluate(self, probability, current_bankroll):
+        return self.fraction if probability > 0.5 else 0.0
+
+
+def make_arena():
+    return LambdaArena(lambda a, b: True, base_competitor=EloCompetitor)
+
+
+def make_bankroll():
+    return BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+
+
+def make_data():
+    data = {}
+    for season in (1, 2, 3):
+        for week in range(1, 4):
+            data[season * 100 + week] = [
+                {"winner": "A", "loser": "B", "winner_odds": 120, "loser_odds": -140},
+                {"winner": "C", "loser": "D", "winner_odds": -110, "loser_odds": -110},
+            ]
+    return data
+
+
+def test_expanding_folds_test_each_following_period():
+    folds = walk_forward_folds([4, 1, 3, 2, 5], n_test=2, min_train=2, step=1)
+    assert folds == [
+        Fold(0, (1, 2), (3, 4)),
+        Fold(1, (1, 2, 3), (4, 5)),
+    ]
+
+
+def test_rolling_folds_keep_a_fixed_window():
+    folds = walk_forward_folds(range(1, 6), min_train=2, window=2)
+    assert [fold.train_periods for fold in folds] == [(1, 2), (2, 3), (3, 4)]
+    assert [fold.test_periods for fold in folds] == [(3,), (4,), (5,)]
+
+
+def test_folds_can_split_by_season():
+    folds = walk_forward_folds(make_data(), group_key=lambda period: period // 100)
+    assert folds == [
+        Fold(0, (101, 102, 103), (201, 202, 203)),
+        Fold(1, (101, 102, 103, 201, 202, 203), (301, 302, 303)),
+    ]
+
+
+def test_invalid_fold_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        walk_forward_folds(range(5), n_test=0)
+    with pytest.raises(ValueError):
+        walk_forward_folds(range(5), min_train=3, window=2)
+
+
+def test_fold_bankroll_matches_run_explicit():
+    data = make_data()
+    fold = Fold(0, (101, 102, 103), (201, 202))
+
+    result = run_fold(fold, data, make_arena, FavoriteStrategy(), make_bankroll)
+
+    subset = {period: data[period] for period in fold.train_periods + fold.test_periods}
+    reference = Backtest(make_arena()).run_explicit(subset, FavoriteStrategy(), make_bankroll(), 103)
+    assert result.final_bankroll == reference.total_funds
+    assert result.starting_bankroll == 1000.0
+    assert result.bets > 0
+    assert result.games == 4
+    assert 0.0 <= result.brier <= 1.0
+    assert result.log_loss > 0.0
+    assert result.bankroll_return == pytest.approx(result.final_bankroll / 1000.0 - 1.0)
+
+
+def test_parallel_cross_validation_matches_in_process():
+    data = make_data()
+    folds = walk_forward_folds(data, group_key=lambda period: period // 100)
+
+    serial = cross_validate(data, make_arena, FavoriteStrategy(), make_bankroll, folds, max_workers=1)
+    parallel = cross_validate(data, make_arena, FavoriteStrategy(), make_bankroll, folds, max_workers=2)
+
+    assert parallel.folds == serial.folds
+    assert [result.fold for result in parallel.folds] == folds
+    aggregate = parallel.aggregate()
+    assert aggregate["folds"] == 2
+    assert aggregate["games"] == 12
+    assert aggregate["log_loss"] == pytest.approx(sum(r.log_loss for r in parallel.folds) / 2)
+
+
+def test_aggregate_of_no_folds_is_empty():
+    aggregate = CrossValidationResult([]).aggregate()
+    assert aggregate["games"] == 0
+    assert math.isnan(aggregate["log_loss"])
+    assert math.isnan(aggregate["mean_return"])
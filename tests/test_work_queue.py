@@ -0,0 +1,194 @@
+import multiprocessing
+import sqlite3
+from functools import partial
+
+import pytest
+from elote.arenas.lambda_arena import LambdaArena
+from elote.competitors.elo import EloCompetitor
+from keeks.bankroll import BankRoll
+
+from keeks_elote.work_queue import (
+    DONE,
+    FAILED,
+    LEASED,
+    PENDING,
+    SweepJob,
+    SweepResult,
+    WorkQueue,
+    run_worker,
+    sweep_jobs,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FavoriteStrategy:
+    def __init__(self, fraction=0.1):
+        self.fraction = fraction
+
+    def evaluate(self, probability, current_bankroll):
+        return self.fraction if probability > 0.5 else 0.0
+
+
+def always_wins(a, b):
+    return True
+
+
+def make_arena():
+    return LambdaArena(always_wins, base_competitor=EloCompetitor)
+
+
+def make_bankroll():
+    return BankRoll(initial_funds=1000.0, percent_bettable=0.5, max_draw_down=1.0)
+
+
+def square(x):
+    return x * x
+
+
+def broken():
+    raise RuntimeError("boom")
+
+
+def make_data():
+    return {week: [{"winner": "A", "loser": "B", "winner_odds": 120, "loser_odds": -140}] for week in range(1, 6)}
+
+
+def make_queue(tmp_path, **kwargs):
+    return WorkQueue(tmp_path / "queue.sqlite", clock=kwargs.pop("clock", Clock()), **kwargs)
+
+
+def test_jobs_are_leased_in_order_and_completed(tmp_path):
+    queue = make_queue(tmp_path)
+    ids = queue.submit_many([partial(square, 3), partial(square, 4)])
+
+    first = queue.lease("w1")
+    second = queue.lease("w2")
+    assert (first.job_id, second.job_id) == tuple(ids)
+    assert queue.lease("w3") is None
+    assert queue.counts()[LEASED] == 2
+
+    assert queue.complete(first.job_id, "w1", first.job())
+    assert not queue.complete(second.job_id, "w1", 0)  # w1 does not hold job 2.
+    assert queue.counts() == {PENDING: 0, LEASED: 1, DONE: 1, FAILED: 0}
+    assert queue.results() == {ids[0]: 9}
+
+
+def test_expired_leases_are_retried_then_failed(tmp_path):
+    clock = Clock()
+    queue = make_queue(tmp_path, clock=clock, lease_seconds=10.0, max_attempts=2)
+    job_id = queue.submit(square)
+
+    assert queue.lease("crashed").attempt == 1
+    clock.now += 5
+    assert queue.heartbeat(job_id, "crashed")
+    clock.now += 8
+    assert queue.lease("other") is None  # The heartbeat kept the lease alive.
+
+    clock.now += 10
+    retry = queue.lease("other")
+    assert (retry.job_id, retry.attempt) == (job_id, 2)
+    assert not queue.heartbeat(job_id, "crashed")
+    assert not queue.complete(job_id, "crashed", 1)
+
+    clock.now += 11
+    assert queue.lease("third") is None
+    assert queue.counts()[FAILED] == 1
+    assert "expired" in queue.failures()[job_id]
+
+
+def test_failed_attempts_are_requeued_until_exhausted(tmp_path):
+    queue = make_queue(tmp_path, max_attempts=2)
+    job_id = queue.submit(broken)
+
+    assert run_worker(queue, worker="w", poll_interval=0.0) == 2
+    assert queue.counts()[FAILED] == 1
+    assert "RuntimeError: boom" in queue.failures()[job_id]
+
+
+def test_sweep_grid_runs_through_the_queue(tmp_path):
+    jobs = sweep_jobs(
+        {"elo": make_arena},
+        {"small": FavoriteStrategy(0.05), "large": FavoriteStrategy(0.2)},
+        {"default": make_bankroll},
+        {"season": make_data()},
+        period_to_start_betting=1,
+    )
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.submit_many(jobs)
+
+    assert run_worker(queue, poll_interval=0.0) == 2
+    results = list(queue.results().values())
+    assert [result.tags["strategy"] for result in results] == ["small", "large"]
+    assert all(isinstance(result, SweepResult) for result in results)
+    assert results[0].final_funds == pytest.approx(jobs[0]().final_funds)
+    assert 0 < results[0].bankroll_return < results[1].bankroll_return
+    assert len(results[1].period_summaries) == 5
+
+
+def test_sweep_data_slices_are_stored_once(tmp_path):
+    big = {week: make_data()[1] * 200 for week in range(1, 6)}
+    jobs = sweep_jobs(
+        {"elo": make_arena},
+        {f"s{i}": FavoriteStrategy(0.01 * i) for i in range(1, 5)},
+        {"default": make_bankroll},
+        {"big": big, "small": make_data()},
+        period_to_start_betting=1,
+    )
+    jobs.append(SweepJob(make_arena, FavoriteStrategy(), make_bankroll, make_data(), 1))
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    queue.submit_many(jobs)
+
+    with sqlite3.connect(queue.path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM data_slices").fetchone()[0] == 2
+        largest_job = connection.execute("SELECT MAX(LENGTH(payload)) FROM jobs").fetchone()[0]
+        largest_slice = connection.execute("SELECT MAX(LENGTH(payload)) FROM data_slices").fetchone()[0]
+    assert largest_job < largest_slice
+
+    assert run_worker(queue, poll_interval=0.0) == 9
+    results = list(queue.results().values())
+    assert [result.final_funds for result in results] == pytest.approx([job().final_funds for job in jobs])
+    assert results[-1].tags == {}
+
+
+def test_only_recent_data_slices_stay_loaded(tmp_path):
+    slices = {f"d{i}": {1: [{"winner": "A", "loser": f"T{i}"}]} for i in range(3)}
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_cached_slices=2)
+    queue.submit_many(sweep_jobs({"elo": make_arena}, {"s": FavoriteStrategy()}, {"b": make_bankroll}, slices))
+
+    assert run_worker(queue, poll_interval=0.0) == 3
+    assert len(queue._data_slices) == 2
+    assert len(queue.results()) == 3
+
+
+def work(path):
+    run_worker(WorkQueue(path), poll_interval=0.01)
+
+
+def test_workers_in_separate_processes_share_the_queue(tmp_path):
+    path = tmp_path / "queue.sqlite"
+    queue = WorkQueue(path)
+    ids = queue.submit_many([partial(square, n) for n in range(20)])
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=work, args=(path,)) for _ in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    assert queue.results() == {job_id: n * n for n, job_id in enumerate(ids)}
+
+
+def test_invalid_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        WorkQueue(tmp_path / "q.sqlite", lease_seconds=0)
+    with pytest.raises(ValueError):
+        WorkQueue(tmp_path / "q.sqlite", max_attempts=0)